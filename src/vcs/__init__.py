@@ -9,7 +9,45 @@ __author__ = "Harsh Dubey"
 __email__ = "chulwoo.pack@sdstate.edu"
 
 # Main scoring function
-from .scorer import compute_vcs_score
+from .scorer import compute_vcs_score, compute_vcs_score_from_embeddings, compute_vcs_from_similarity, Scorer
+
+# Corpus scoring
+from ._corpus import (
+    compute_vcs_corpus,
+    load_checkpoint_results,
+    ProgressCallback,
+    ProgressEvent,
+    ConsoleProgress,
+    JsonLinesProgress,
+)
+
+# Result caching
+from ._caching import ResultCache
+
+# Compact and columnar results
+from ._results import VCSScores, results_to_array, ColumnarResultWriter, write_results_columnar
+from ._results import JsonLinesResultWriter, write_results_jsonl
+
+# Internals archiving
+from ._results import save_internals, load_internals
+
+# Pipeline stage hooks (tracing)
+from ._instrumentation import (
+    StageHook,
+    OpenTelemetryStageHook,
+    register_stage_hook,
+    unregister_stage_hook,
+    stage_hooks,
+    summarize_memory_profiles,
+)
+
+# Prometheus metrics
+from ._instrumentation import (
+    MetricsRegistry,
+    enable_metrics,
+    disable_metrics,
+    start_metrics_server,
+)
 
 # Visualization functions
 from ._visualize_vcs import (
@@ -39,12 +77,42 @@ from ._config import (
 __all__ = [
     # Main function
     "compute_vcs_score", 
+    "compute_vcs_score_from_embeddings",
+    "compute_vcs_from_similarity",
+    "Scorer",
+    "compute_vcs_corpus",
+    "load_checkpoint_results",
+    "ProgressCallback",
+    "ProgressEvent",
+    "ConsoleProgress",
+    "JsonLinesProgress",
+    "ResultCache",
+    "VCSScores",
+    "results_to_array",
+    "ColumnarResultWriter",
+    "write_results_columnar",
+    "JsonLinesResultWriter",
+    "write_results_jsonl",
+    "save_internals",
+    "load_internals",
     
     # Version and metadata
     "__version__",
     "__author__",
     "__email__",
     
+    # Pipeline stage hooks
+    "StageHook",
+    "OpenTelemetryStageHook",
+    "register_stage_hook",
+    "unregister_stage_hook",
+    "stage_hooks",
+    "summarize_memory_profiles",
+    "MetricsRegistry",
+    "enable_metrics",
+    "disable_metrics",
+    "start_metrics_server",
+    
     # Visualization functions
     "visualize_config",
     "visualize_text_chunks",
@@ -0,0 +1,25 @@
+"""
+Benchmark harness for the VCS pipeline (``vcs-bench`` command).
+"""
+
+from ._synthetic import SyntheticPair, make_synthetic_pair, synthetic_segmenter
+from ._stages import STAGES, DEFAULT_SIZES, run_stage_benchmarks, fit_complexity
+from ._plot import plot_scaling
+from ._compare import compare_reports, format_comparison
+from ._startup import run_startup_benchmarks, import_breakdown, scoring_path_heavy_modules
+
+__all__ = [
+    "SyntheticPair",
+    "make_synthetic_pair",
+    "synthetic_segmenter",
+    "STAGES",
+    "DEFAULT_SIZES",
+    "run_stage_benchmarks",
+    "fit_complexity",
+    "plot_scaling",
+    "compare_reports",
+    "format_comparison",
+    "run_startup_benchmarks",
+    "import_breakdown",
+    "scoring_path_heavy_modules",
+]
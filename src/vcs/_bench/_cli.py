@@ -0,0 +1,175 @@
+"""Command-line entry point for ``vcs-bench``.
+
+Examples
+--------
+Time every stage from 10 to 10,000 segments and save a scaling plot::
+
+    vcs-bench run --output stages.json --plot stages.png
+
+Quick run on small sizes only::
+
+    vcs-bench run --sizes 10,100,1000 --repeats 3 --output quick.json
+
+Measure import time and first-call latency in fresh interpreters::
+
+    vcs-bench startup --output startup.json
+
+Gate a candidate run against a stored baseline (exit status 1 on regression)::
+
+    vcs-bench compare baseline.json candidate.json --threshold 0.10
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from ._compare import compare_reports, format_comparison
+from ._stages import DEFAULT_SIZES, STAGES, run_stage_benchmarks
+from ._startup import run_startup_benchmarks
+from ._plot import plot_scaling
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def _str_list(value: str) -> List[str]:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def _write_report(report, output: Optional[str]) -> None:
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+
+def _log(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    report = run_stage_benchmarks(
+        sizes=args.sizes,
+        repeats=args.repeats,
+        length_ratio=args.length_ratio,
+        dim=args.dim,
+        diagonal_strength=args.diagonal_strength,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+        lct=args.lct,
+        stages=args.stages,
+        max_seconds=args.max_seconds,
+        log=None if args.quiet else _log,
+    )
+    _write_report(report, args.output)
+    if args.plot:
+        plot_scaling(report, args.plot)
+    return 0
+
+
+def _cmd_startup(args: argparse.Namespace) -> int:
+    report = run_startup_benchmarks(
+        repeats=args.repeats,
+        call_size=args.call_size,
+        log=None if args.quiet else _log,
+    )
+    _write_report(report, args.output)
+    if not args.quiet:
+        breakdown = report["import_breakdown"]
+        _log(f"scoring import path loads: {', '.join(report['heavy_modules']) or 'no heavy packages'}")
+        for package, micros in list(breakdown["packages_us"].items())[:10]:
+            _log(f"  {package:<24} {micros / 1e3:9.1f} ms")
+    return 0
+
+
+def _read_report(path: str):
+    with open(path, "r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _cmd_compare(args: argparse.Namespace) -> int:
+    comparison = compare_reports(
+        _read_report(args.baseline),
+        _read_report(args.candidate),
+        threshold=args.threshold,
+        alpha=args.alpha,
+        confidence=args.confidence,
+        min_seconds=args.min_seconds,
+        resamples=args.resamples,
+    )
+    print(format_comparison(comparison))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(comparison, fh, indent=2)
+    return 1 if comparison["regressions"] else 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="vcs-bench", description="Benchmarks for the VCS scoring pipeline."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Time each pipeline stage on synthetic inputs.")
+    run.add_argument("--sizes", type=_int_list, default=list(DEFAULT_SIZES),
+                     help="Comma-separated segment counts per side.")
+    run.add_argument("--repeats", type=int, default=5)
+    run.add_argument("--stages", type=_str_list, default=list(STAGES),
+                     help=f"Comma-separated subset of: {', '.join(STAGES)}.")
+    run.add_argument("--length-ratio", type=float, default=1.0,
+                     help="Generated segments per reference segment.")
+    run.add_argument("--dim", type=int, default=64, help="Embedding dimension.")
+    run.add_argument("--diagonal-strength", type=float, default=0.8,
+                     help="0 = unrelated texts, 1 = generated text copies the reference.")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--chunk-size", type=int, default=1)
+    run.add_argument("--lct", type=int, default=0)
+    run.add_argument("--max-seconds", type=float, default=30.0,
+                     help="Per stage and size time budget; larger sizes are "
+                          "skipped once a full pipeline pass exceeds it.")
+    run.add_argument("--output", "-o", help="JSON report path (default: stdout).")
+    run.add_argument("--plot", help="Save a log-log scaling plot to this path.")
+    run.add_argument("--quiet", "-q", action="store_true")
+    run.set_defaults(func=_cmd_run)
+
+    startup = commands.add_parser(
+        "startup", help="Measure import time and first-call latency in fresh interpreters."
+    )
+    startup.add_argument("--repeats", type=int, default=5)
+    startup.add_argument("--call-size", type=int, default=50,
+                         help="Segments per side for the first-call measurement.")
+    startup.add_argument("--output", "-o", help="JSON report path (default: stdout).")
+    startup.add_argument("--quiet", "-q", action="store_true")
+    startup.set_defaults(func=_cmd_startup)
+
+    compare = commands.add_parser(
+        "compare", help="Compare two reports; exit 1 if any stage regressed."
+    )
+    compare.add_argument("baseline", help="Stored baseline report (JSON).")
+    compare.add_argument("candidate", help="New report to check (JSON).")
+    compare.add_argument("--threshold", type=float, default=0.10,
+                         help="Relative slowdown that counts as a regression (0.10 = 10%%).")
+    compare.add_argument("--alpha", type=float, default=0.05,
+                         help="Significance level for the Mann-Whitney U test.")
+    compare.add_argument("--confidence", type=float, default=0.95,
+                         help="Confidence level of the bootstrap ratio interval.")
+    compare.add_argument("--min-seconds", type=float, default=1e-4,
+                         help="Ignore rows whose medians are both faster than this.")
+    compare.add_argument("--resamples", type=int, default=2000)
+    compare.add_argument("--output", "-o", help="Also write the comparison as JSON.")
+    compare.set_defaults(func=_cmd_compare)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
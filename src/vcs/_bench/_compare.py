@@ -0,0 +1,189 @@
+"""Statistical comparison of two ``vcs-bench`` reports."""
+
+import math
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+_CONFIG_KEYS_THAT_CHANGE_TIMINGS = (
+    "length_ratio", "dim", "diagonal_strength", "seed",
+    "chunk_size", "context_cutoff_value", "context_window_control", "lct",
+)
+
+
+def _mann_whitney_p(a: Sequence[float], b: Sequence[float]) -> float:
+    """Two-sided Mann-Whitney U p-value (normal approximation with tie correction)."""
+    n1, n2 = len(a), len(b)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+    combined = np.concatenate([np.asarray(a, dtype=float), np.asarray(b, dtype=float)])
+    order = combined.argsort(kind="mergesort")
+    ranks = np.empty(len(combined), dtype=float)
+    sorted_values = combined[order]
+    i = 0
+    tie_term = 0.0
+    while i < len(sorted_values):
+        j = i
+        while j + 1 < len(sorted_values) and sorted_values[j + 1] == sorted_values[i]:
+            j += 1
+        ranks[order[i:j + 1]] = (i + j) / 2.0 + 1.0
+        count = j - i + 1
+        tie_term += count ** 3 - count
+        i = j + 1
+
+    u1 = ranks[:n1].sum() - n1 * (n1 + 1) / 2.0
+    mean_u = n1 * n2 / 2.0
+    n = n1 + n2
+    var_u = n1 * n2 / 12.0 * ((n + 1) - tie_term / (n * (n - 1))) if n > 1 else 0.0
+    if var_u <= 0:
+        return 1.0
+    z = (abs(u1 - mean_u) - 0.5) / math.sqrt(var_u)
+    return float(min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2.0))))
+
+
+def _bootstrap_ratio_ci(
+    baseline: Sequence[float],
+    candidate: Sequence[float],
+    confidence: float,
+    resamples: int,
+    seed: int,
+) -> Tuple[float, float]:
+    """Percentile bootstrap interval for ``median(candidate) / median(baseline)``."""
+    rng = np.random.default_rng(seed)
+    base = np.asarray(baseline, dtype=float)
+    cand = np.asarray(candidate, dtype=float)
+    base_medians = np.median(rng.choice(base, (resamples, base.size)), axis=1)
+    cand_medians = np.median(rng.choice(cand, (resamples, cand.size)), axis=1)
+    ratios = cand_medians / np.maximum(base_medians, 1e-12)
+    alpha = (1.0 - confidence) / 2.0
+    low, high = np.quantile(ratios, [alpha, 1.0 - alpha])
+    return float(low), float(high)
+
+
+def _index(report: Dict[str, Any]) -> Dict[Tuple[str, int], Dict[str, Any]]:
+    return {(r["stage"], r["size"]): r for r in report.get("results", [])}
+
+
+def config_differences(baseline: Dict[str, Any], candidate: Dict[str, Any]) -> List[str]:
+    """Describe benchmark settings that differ between two reports."""
+    base_config = baseline.get("config", {})
+    cand_config = candidate.get("config", {})
+    diffs = []
+    for key in _CONFIG_KEYS_THAT_CHANGE_TIMINGS:
+        if base_config.get(key) != cand_config.get(key):
+            diffs.append(f"{key}: {base_config.get(key)!r} -> {cand_config.get(key)!r}")
+    return diffs
+
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    candidate: Dict[str, Any],
+    threshold: float = 0.10,
+    alpha: float = 0.05,
+    confidence: float = 0.95,
+    min_seconds: float = 1e-4,
+    resamples: int = 2000,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Compare per-stage, per-size timings of two benchmark reports.
+
+    For every (stage, size) present in both reports the comparison gives the
+    ratio of candidate to baseline median time, a bootstrap confidence
+    interval for that ratio and a Mann-Whitney U p-value over the raw samples.
+    A row is a ``"regression"`` when the ratio exceeds ``1 + threshold`` and
+    the difference is significant at ``alpha``; an ``"improvement"`` is the
+    mirror case below ``1 / (1 + threshold)``. Rows whose medians are both
+    below ``min_seconds`` are reported as ``"too_fast"`` and never gate.
+
+    For startup reports, a heavy package that the candidate loads on the
+    scoring import path but the baseline did not is always a regression.
+    """
+    base_index = _index(baseline)
+    cand_index = _index(candidate)
+    rows: List[Dict[str, Any]] = []
+
+    for key in sorted(set(base_index) | set(cand_index)):
+        stage, size = key
+        base, cand = base_index.get(key), cand_index.get(key)
+        if base is None or cand is None:
+            rows.append({
+                "stage": stage, "size": size,
+                "status": "missing_in_baseline" if base is None else "missing_in_candidate",
+            })
+            continue
+
+        base_median = float(np.median(base["samples"]))
+        cand_median = float(np.median(cand["samples"]))
+        ratio = cand_median / base_median if base_median > 0 else math.inf
+        low, high = _bootstrap_ratio_ci(
+            base["samples"], cand["samples"], confidence, resamples, seed
+        )
+        p_value = _mann_whitney_p(base["samples"], cand["samples"])
+
+        if max(base_median, cand_median) < min_seconds:
+            status = "too_fast"
+        elif ratio > 1.0 + threshold and p_value < alpha:
+            status = "regression"
+        elif ratio < 1.0 / (1.0 + threshold) and p_value < alpha:
+            status = "improvement"
+        else:
+            status = "unchanged"
+
+        rows.append({
+            "stage": stage,
+            "size": size,
+            "baseline_median": base_median,
+            "candidate_median": cand_median,
+            "ratio": ratio,
+            "speedup": (1.0 / ratio) if ratio else math.inf,
+            "ci_low": low,
+            "ci_high": high,
+            "p_value": p_value,
+            "status": status,
+        })
+
+    base_heavy = set(baseline.get("heavy_modules", []))
+    for module in candidate.get("heavy_modules", []):
+        if "heavy_modules" in baseline and module not in base_heavy:
+            rows.append({"stage": f"import:{module}", "size": 0, "status": "regression"})
+
+    return {
+        "threshold": threshold,
+        "alpha": alpha,
+        "confidence": confidence,
+        "min_seconds": min_seconds,
+        "config_differences": config_differences(baseline, candidate),
+        "baseline_environment": baseline.get("environment", {}),
+        "candidate_environment": candidate.get("environment", {}),
+        "rows": rows,
+        "regressions": sum(1 for r in rows if r["status"] == "regression"),
+        "improvements": sum(1 for r in rows if r["status"] == "improvement"),
+    }
+
+
+def format_comparison(comparison: Dict[str, Any]) -> str:
+    """Render a comparison as a fixed-width text table."""
+    pct = int(round(comparison["confidence"] * 100))
+    header = (
+        f"{'stage':<24} {'size':>6} {'baseline':>11} {'candidate':>11} "
+        f"{'ratio':>7} {f'{pct}% CI':>17} {'p':>7}  status"
+    )
+    lines = [header, "-" * len(header)]
+    for row in comparison["rows"]:
+        if "ratio" not in row:
+            lines.append(f"{row['stage']:<24} {row['size']:>6} {'':>66}  {row['status']}")
+            continue
+        lines.append(
+            f"{row['stage']:<24} {row['size']:>6} "
+            f"{row['baseline_median'] * 1e3:>9.3f}ms {row['candidate_median'] * 1e3:>9.3f}ms "
+            f"{row['ratio']:>7.3f} [{row['ci_low']:>6.3f}, {row['ci_high']:>6.3f}] "
+            f"{row['p_value']:>7.4f}  {row['status']}"
+        )
+    lines.append("")
+    lines.append(
+        f"{comparison['regressions']} regression(s), {comparison['improvements']} "
+        f"improvement(s) at threshold {comparison['threshold']:.0%}, alpha {comparison['alpha']}"
+    )
+    for diff in comparison["config_differences"]:
+        lines.append(f"warning: benchmark settings differ ({diff})")
+    return "\n".join(lines)
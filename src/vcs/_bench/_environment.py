@@ -0,0 +1,31 @@
+import datetime
+import os
+import platform
+import sys
+from typing import Any, Dict
+
+
+def _package_version(module_name: str) -> str:
+    module = sys.modules.get(module_name)
+    if module is None:
+        try:
+            module = __import__(module_name)
+        except ImportError:
+            return "not installed"
+    return str(getattr(module, "__version__", "unknown"))
+
+
+def _environment_info() -> Dict[str, Any]:
+    from .. import __version__
+
+    return {
+        "vcs": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": _package_version("numpy"),
+        "torch": _package_version("torch"),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    }
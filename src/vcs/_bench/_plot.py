@@ -0,0 +1,42 @@
+from typing import Any, Dict
+
+
+def _format_exponent(fit) -> str:
+    return "n/a" if fit is None else f"~n^{fit['exponent']:.2f}"
+
+
+def plot_scaling(report: Dict[str, Any], output_file: str) -> None:
+    """Save a log-log plot of median stage time against size.
+
+    Each stage is labelled with the empirical exponent from the report's
+    ``complexity`` section, so quadratic stages stand out at a glance.
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(9, 6))
+    ax = fig.add_subplot(1, 1, 1)
+    complexity = report.get("complexity", {})
+    stages = []
+    for result in report["results"]:
+        if result["stage"] not in stages:
+            stages.append(result["stage"])
+
+    for stage in stages:
+        rows = sorted(
+            (r for r in report["results"] if r["stage"] == stage),
+            key=lambda r: r["size"],
+        )
+        sizes = [r["size"] for r in rows]
+        medians = [max(r["median"], 1e-9) for r in rows]
+        ax.plot(sizes, medians, marker="o",
+                label=f"{stage} ({_format_exponent(complexity.get(stage))})")
+
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.set_xlabel("Segments per side")
+    ax.set_ylabel("Median time (s)")
+    ax.set_title("VCS stage scaling")
+    ax.grid(True, which="both", alpha=0.3)
+    ax.legend(fontsize=8)
+    fig.tight_layout()
+    fig.savefig(output_file, dpi=150)
@@ -0,0 +1,263 @@
+"""Per-stage timing of the ``compute_vcs_score`` pipeline on synthetic inputs."""
+
+import gc
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .._config import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_CONTEXT_CUTOFF_VALUE,
+    DEFAULT_CONTEXT_WINDOW_CONTROL,
+    DEFAULT_LCT,
+)
+from .._segmenting import _segment_and_chunk_texts, _build_similarity_matrix
+from .._mapping_windows import _get_mapping_windows
+from .._matching import _calculate_row_col_matches_context
+from .._metrics import _compute_las_metrics
+from .._metrics._nas._nas_components import (
+    _calculate_distance_based_nas,
+    _calculate_line_based_nas,
+    _calculate_window_regularizer,
+)
+from ._environment import _environment_info
+from ._synthetic import make_synthetic_pair
+
+STAGES = (
+    "segmentation",
+    "similarity",
+    "mapping_windows",
+    "best_match",
+    "las",
+    "distance_nas",
+    "line_nas",
+    "regularizer",
+)
+
+DEFAULT_SIZES = (10, 30, 100, 300, 1000, 3000, 10000)
+
+RESULT_SCHEMA_VERSION = 1
+
+
+def _aligned_points(matches, ref_chunks, gen_chunks):
+    return [
+        (g_idx + 1, r_idx + 1, gen_chunks[g_idx], ref_chunks[r_idx])
+        for g_idx, r_idx in matches
+    ]
+
+
+def _build_stage_runners(
+    pair,
+    chunk_size: int,
+    context_cutoff_value: float,
+    context_window_control: float,
+    lct: int,
+) -> Dict[str, Callable[[], Any]]:
+    """Run the pipeline once and return a zero-argument callable per stage.
+
+    Each callable re-runs exactly one stage on the inputs the previous stages
+    produced, so stages can be timed in isolation.
+    """
+    runners: Dict[str, Callable[[], Any]] = {}
+
+    def segmentation():
+        return _segment_and_chunk_texts(
+            pair.reference_text, pair.generated_text, chunk_size, pair.segmenter_fn
+        )
+    ref_chunks, gen_chunks = segmentation()
+    runners["segmentation"] = segmentation
+
+    def similarity():
+        return _build_similarity_matrix(ref_chunks, gen_chunks, pair.embedding_fn)
+    sim_matrix, ref_len, gen_len = similarity()
+    runners["similarity"] = similarity
+
+    def mapping_windows():
+        return _get_mapping_windows(ref_len, gen_len)
+    prec_windows, rec_windows = mapping_windows()
+    runners["mapping_windows"] = mapping_windows
+
+    def best_match():
+        return (
+            _calculate_row_col_matches_context(
+                sim_matrix, prec_windows, "precision",
+                context_cutoff_value, context_window_control
+            ),
+            _calculate_row_col_matches_context(
+                sim_matrix, rec_windows, "recall",
+                context_cutoff_value, context_window_control
+            ),
+        )
+    precision, recall = best_match()
+    prec_matches, prec_indices, prec_values, _ = precision
+    rec_matches, rec_indices, rec_values, _ = recall
+    runners["best_match"] = best_match
+
+    runners["las"] = lambda: _compute_las_metrics(prec_values, rec_values)
+
+    runners["distance_nas"] = lambda: (
+        _calculate_distance_based_nas(
+            prec_indices, prec_windows, ref_len, "precision",
+            ref_len=ref_len, gen_len=gen_len, lct=lct
+        ),
+        _calculate_distance_based_nas(
+            rec_indices, rec_windows, gen_len, "recall",
+            ref_len=ref_len, gen_len=gen_len, lct=lct
+        ),
+    )
+
+    aligned_col = _aligned_points(prec_matches, ref_chunks, gen_chunks)
+    aligned_row = _aligned_points(rec_matches, ref_chunks, gen_chunks)
+    runners["line_nas"] = lambda: (
+        _calculate_line_based_nas(aligned_col, prec_windows, ref_len, gen_len, lct=lct),
+        _calculate_line_based_nas(
+            aligned_row, rec_windows, ref_len, gen_len, swap=True, lct=lct
+        ),
+    )
+
+    runners["regularizer"] = lambda: _calculate_window_regularizer(
+        ref_len, gen_len, prec_windows, rec_windows
+    )
+
+    return runners
+
+
+def _time_call(fn: Callable[[], Any]) -> float:
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        fn()
+        return time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _summarize(samples: Sequence[float]) -> Dict[str, float]:
+    arr = np.asarray(samples, dtype=float)
+    return {
+        "min": float(arr.min()),
+        "median": float(np.median(arr)),
+        "mean": float(arr.mean()),
+        "stdev": float(arr.std(ddof=1)) if arr.size > 1 else 0.0,
+    }
+
+
+def fit_complexity(results: List[Dict[str, Any]]) -> Dict[str, Optional[Dict[str, float]]]:
+    """Fit ``median_time ~ c * size**k`` per stage on a log-log scale.
+
+    Returns the exponent ``k`` and the fit's R^2 for every stage measured at two
+    or more sizes, ``None`` otherwise.
+    """
+    fits: Dict[str, Optional[Dict[str, float]]] = {}
+    stages = sorted({r["stage"] for r in results})
+    for stage in stages:
+        points = [
+            (r["size"], r["median"]) for r in results
+            if r["stage"] == stage and r["size"] > 0 and r["median"] > 0
+        ]
+        if len(points) < 2:
+            fits[stage] = None
+            continue
+        x = np.log([p[0] for p in points])
+        y = np.log([p[1] for p in points])
+        slope, intercept = np.polyfit(x, y, 1)
+        residual = y - (slope * x + intercept)
+        total = y - y.mean()
+        ss_total = float(np.dot(total, total))
+        r2 = 1.0 - float(np.dot(residual, residual)) / ss_total if ss_total else 1.0
+        fits[stage] = {"exponent": float(slope), "r2": r2}
+    return fits
+
+
+def run_stage_benchmarks(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    repeats: int = 5,
+    length_ratio: float = 1.0,
+    dim: int = 64,
+    diagonal_strength: float = 0.8,
+    seed: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    context_cutoff_value: float = DEFAULT_CONTEXT_CUTOFF_VALUE,
+    context_window_control: float = DEFAULT_CONTEXT_WINDOW_CONTROL,
+    lct: int = DEFAULT_LCT,
+    stages: Sequence[str] = STAGES,
+    max_seconds: float = 30.0,
+    log: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """Time each pipeline stage at every size and return a JSON-serializable report.
+
+    ``size`` is the number of reference segments; the generated side has
+    ``round(size * length_ratio)`` segments. Every stage is run ``repeats``
+    times after a warm-up pass, stopping early once its cumulative time at a
+    size exceeds ``max_seconds``. If the warm-up pass of the whole pipeline
+    exceeds ``max_seconds``, larger sizes are skipped and listed in the report.
+    """
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stages: {sorted(unknown)}")
+    if repeats < 1:
+        raise ValueError("repeats must be at least 1")
+
+    results: List[Dict[str, Any]] = []
+    skipped: List[Dict[str, Any]] = []
+    budget_exceeded = False
+
+    for size in sorted(sizes):
+        gen_size = max(1, int(round(size * length_ratio)))
+        if budget_exceeded:
+            skipped.append({"size": size, "reason": "previous size exceeded max_seconds"})
+            continue
+
+        pair = make_synthetic_pair(size, gen_size, dim, diagonal_strength, seed)
+        warmup_start = time.perf_counter()
+        runners = _build_stage_runners(
+            pair, chunk_size, context_cutoff_value, context_window_control, lct
+        )
+        warmup_seconds = time.perf_counter() - warmup_start
+        if log:
+            log(f"size={size} gen={gen_size} warm-up {warmup_seconds:.3f}s")
+
+        for stage in stages:
+            samples: List[float] = []
+            while len(samples) < repeats:
+                samples.append(_time_call(runners[stage]))
+                if sum(samples) > max_seconds:
+                    break
+            results.append({
+                "stage": stage,
+                "size": size,
+                "ref_len": size,
+                "gen_len": gen_size,
+                "samples": samples,
+                **_summarize(samples),
+            })
+            if log:
+                log(f"  {stage:<16} median {results[-1]['median'] * 1e3:10.3f} ms")
+
+        budget_exceeded = warmup_seconds > max_seconds
+
+    return {
+        "schema": RESULT_SCHEMA_VERSION,
+        "kind": "stages",
+        "environment": _environment_info(),
+        "config": {
+            "sizes": list(sizes),
+            "repeats": repeats,
+            "length_ratio": length_ratio,
+            "dim": dim,
+            "diagonal_strength": diagonal_strength,
+            "seed": seed,
+            "chunk_size": chunk_size,
+            "context_cutoff_value": context_cutoff_value,
+            "context_window_control": context_window_control,
+            "lct": lct,
+            "max_seconds": max_seconds,
+        },
+        "results": results,
+        "complexity": fit_complexity(results),
+        "skipped": skipped,
+    }
+
@@ -0,0 +1,163 @@
+"""Import-time and cold-start measurements, each in a fresh interpreter."""
+
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Callable, Dict, List, Optional
+
+from ._environment import _environment_info
+from ._stages import RESULT_SCHEMA_VERSION, _summarize
+
+HEAVY_MODULES = ("torch", "matplotlib", "seaborn", "pandas", "scipy")
+
+_IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+_CALL_SCRIPT = """
+import time
+from vcs import compute_vcs_score
+from vcs._bench._synthetic import make_synthetic_pair
+pair = make_synthetic_pair({size}, {size})
+timings = []
+for _ in range(2):
+    start = time.perf_counter()
+    compute_vcs_score(pair.reference_text, pair.generated_text,
+                      pair.segmenter_fn, pair.embedding_fn)
+    timings.append(time.perf_counter() - start)
+print(timings[0], timings[1])
+"""
+
+_MODULES_SCRIPT = """
+import json, sys
+from vcs import compute_vcs_score
+print(json.dumps(sorted({name.split('.')[0] for name in sys.modules})))
+"""
+
+
+def _subprocess_env() -> Dict[str, str]:
+    """Environment that makes the child import the same ``vcs`` as this process."""
+    import vcs
+
+    package_parent = os.path.dirname(os.path.dirname(os.path.abspath(vcs.__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (package_parent, env.get("PYTHONPATH")) if p
+    )
+    return env
+
+
+def _run_python(script: str, env: Dict[str, str], *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", script],
+        env=env, capture_output=True, text=True, check=True,
+    )
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parse ``python -X importtime`` output into per-module records (microseconds)."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        name = fields[2].rstrip()
+        records.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_us": int(fields[0]),
+            "cumulative_us": int(fields[1]),
+        })
+    return records
+
+
+def import_breakdown(statement: str = "import vcs", top: int = 25) -> Dict[str, Any]:
+    """Per-module import cost of ``statement`` in a fresh interpreter.
+
+    Returns the ``top`` modules by self time, and the cumulative time of each
+    top-level package, so a new heavy dependency shows up under its own name.
+    """
+    env = _subprocess_env()
+    proc = _run_python(statement, env, "-X", "importtime")
+    records = parse_importtime(proc.stderr)
+    packages: Dict[str, int] = {}
+    for record in records:
+        package = record["module"].split(".")[0]
+        packages[package] = packages.get(package, 0) + record["self_us"]
+    return {
+        "statement": statement,
+        "total_us": sum(r["self_us"] for r in records),
+        "top_modules": sorted(records, key=lambda r: r["self_us"], reverse=True)[:top],
+        "packages_us": dict(sorted(packages.items(), key=lambda kv: kv[1], reverse=True)),
+    }
+
+
+def scoring_path_heavy_modules() -> List[str]:
+    """Heavy third-party packages loaded by ``from vcs import compute_vcs_score``."""
+    proc = _run_python(_MODULES_SCRIPT, _subprocess_env())
+    loaded = set(json.loads(proc.stdout))
+    return [name for name in HEAVY_MODULES if name in loaded]
+
+
+def run_startup_benchmarks(
+    repeats: int = 5,
+    call_size: int = 50,
+    log: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """Measure cold-start costs in ``repeats`` fresh interpreters.
+
+    Rows use the same layout as :func:`run_stage_benchmarks` reports, so
+    ``vcs-bench compare`` gates them the same way:
+
+    * ``import_vcs`` - ``import vcs``
+    * ``import_compute_vcs_score`` - ``from vcs import compute_vcs_score``
+    * ``first_call`` / ``warm_call`` - the first and second
+      ``compute_vcs_score`` call on a ``call_size`` x ``call_size`` synthetic pair
+    """
+    env = _subprocess_env()
+    samples: Dict[str, List[float]] = {
+        "import_vcs": [],
+        "import_compute_vcs_score": [],
+        "first_call": [],
+        "warm_call": [],
+    }
+    for i in range(repeats):
+        samples["import_vcs"].append(
+            float(_run_python(_IMPORT_SCRIPT.format(statement="import vcs"), env).stdout)
+        )
+        samples["import_compute_vcs_score"].append(float(_run_python(
+            _IMPORT_SCRIPT.format(statement="from vcs import compute_vcs_score"), env
+        ).stdout))
+        first, warm = _run_python(_CALL_SCRIPT.format(size=call_size), env).stdout.split()
+        samples["first_call"].append(float(first))
+        samples["warm_call"].append(float(warm))
+        if log:
+            log(f"run {i + 1}/{repeats}: import vcs {samples['import_vcs'][-1]:.3f}s, "
+                f"first call {samples['first_call'][-1]:.3f}s")
+
+    sizes = {"first_call": call_size, "warm_call": call_size}
+    results = [
+        {
+            "stage": stage,
+            "size": sizes.get(stage, 0),
+            "samples": values,
+            **_summarize(values),
+        }
+        for stage, values in samples.items()
+    ]
+
+    return {
+        "schema": RESULT_SCHEMA_VERSION,
+        "kind": "startup",
+        "environment": _environment_info(),
+        "config": {"repeats": repeats, "call_size": call_size},
+        "results": results,
+        "heavy_modules": scoring_path_heavy_modules(),
+        "import_breakdown": import_breakdown("from vcs import compute_vcs_score"),
+    }
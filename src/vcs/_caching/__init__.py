@@ -0,0 +1,9 @@
+"""
+Persistent caches of scoring results.
+"""
+
+from ._result_cache import ResultCache
+
+__all__ = [
+    "ResultCache",
+]
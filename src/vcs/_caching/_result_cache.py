@@ -0,0 +1,223 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import torch
+
+from .._instrumentation import _record_cache_lookup
+from .._utils import _config_sha256, _json_default, _pair_key, _pipeline_fingerprint, _text_sha256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL,
+    reference_sha256 TEXT NOT NULL,
+    generated_sha256 TEXT NOT NULL,
+    config_sha256 TEXT NOT NULL,
+    fingerprint TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access);
+"""
+
+# The stored size is re-read every this many inserts (other processes write
+# too) and as soon as this instance's own inserts since the last check would
+# exceed ``max_bytes``; eviction then trims the cache to EVICT_TO of
+# ``max_bytes`` so it does not run again on the next put.
+_EVICT_CHECK_EVERY = 64
+_EVICT_TO = 0.9
+
+# Pipelines whose probe fingerprint is memoized, least recently used first out.
+_FINGERPRINT_MEMO_SIZE = 8
+
+
+class ResultCache:
+    """Persistent cache of ``compute_vcs_score`` results, backed by sqlite.
+
+    Results are stored under a key derived from the SHA-256 of the reference
+    and generated texts, the scoring config (``chunk_size``,
+    ``context_cutoff_value``, ``context_window_control``, ``lct``) and a
+    fingerprint of the segmenter and embedders (see ``fingerprint``). The
+    stored value is the ``return_all_metrics=True`` dict, so one entry serves
+    both minimal and full requests.
+
+    The database runs in WAL mode, so any number of threads and processes can
+    read and write the same file concurrently. With ``max_bytes``, the least
+    recently used entries are evicted once the stored results exceed it.
+
+    Parameters
+    ----------
+    path : str
+        sqlite database file; created if missing.
+    max_bytes : int, optional
+        Size limit of the stored results (JSON bytes, excluding sqlite
+        overhead). Unlimited by default. This instance's own inserts never
+        take the cache past it; inserts by other processes sharing the file
+        are noticed at most 64 inserts later.
+    fingerprint : str, optional
+        Identity of the segmenter/embedder combination. By default it is
+        computed once per set of functions by running them on fixed probe
+        inputs, so a changed model or segmenter never returns stale results.
+        Pass an explicit string (e.g. a model name and revision) to skip the
+        probes.
+
+    Examples
+    --------
+    >>> cache = ResultCache("vcs-results.sqlite", max_bytes=512 * 2**20)
+    >>> result = compute_vcs_score(ref_text, gen_text, segmenter, embedder,
+    ...                            result_cache=cache)
+    >>> cache.stats()
+    {'entries': 1, 'bytes': 412, 'hits': 0, 'misses': 1}
+    """
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None, fingerprint: Optional[str] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.fingerprint = fingerprint
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._fingerprints: "OrderedDict[Tuple[int, ...], Tuple[Tuple[Any, ...], str]]" = OrderedDict()
+        self._puts = 0
+        # Bytes stored as of the last eviction check plus this instance's
+        # inserts since; None until the first check.
+        self._stored_bytes: Optional[int] = None
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"path": self.path, "max_bytes": self.max_bytes, "fingerprint": self.fingerprint}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def pipeline_fingerprint(
+        self,
+        segmenter_fn: Callable[[str], List[str]],
+        embedding_fn_las: Callable[[List[str]], torch.Tensor],
+        embedding_fn_gas: Optional[Callable[[List[str]], torch.Tensor]] = None,
+    ) -> str:
+        """The fingerprint used for keys: ``fingerprint`` or a memoized probe hash."""
+        if self.fingerprint is not None:
+            return self.fingerprint
+        functions = (segmenter_fn, embedding_fn_las, embedding_fn_gas)
+        ids = tuple(id(fn) for fn in functions)
+        with self._lock:
+            entry = self._fingerprints.get(ids)
+            if entry is not None:
+                self._fingerprints.move_to_end(ids)
+        if entry is None:
+            # The functions are kept alive with the entry so their ids stay
+            # unique; only the most recent pipelines are kept.
+            entry = (functions, _pipeline_fingerprint(*functions))
+            with self._lock:
+                self._fingerprints[ids] = entry
+                while len(self._fingerprints) > _FINGERPRINT_MEMO_SIZE:
+                    self._fingerprints.popitem(last=False)
+        return entry[1]
+
+    def key(self, reference_text: str, generated_text: str, config: Dict[str, Any],
+            fingerprint: str) -> Tuple[str, str, str, str]:
+        """``(key, reference_sha256, generated_sha256, config_sha256)`` for a pair."""
+        reference_sha256 = _text_sha256(reference_text)
+        generated_sha256 = _text_sha256(generated_text)
+        config_sha256 = _config_sha256(config)
+        key = _pair_key(reference_sha256, generated_sha256, config_sha256, fingerprint)
+        return key, reference_sha256, generated_sha256, config_sha256
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        connection = self._connection()
+        row = connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        _record_cache_lookup("results", row is not None)
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        connection.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def __contains__(self, key: str) -> bool:
+        # Unlike get(), not counted as a lookup and leaves the entry's age alone.
+        row = self._connection().execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def put(self, key: str, reference_sha256: str, generated_sha256: str, config_sha256: str,
+            fingerprint: str, result: Dict[str, Any]) -> None:
+        value = json.dumps(result, default=_json_default)
+        now = time.time()
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, value, len(value), now, now, reference_sha256, generated_sha256,
+             config_sha256, fingerprint),
+        )
+        if self.max_bytes is None:
+            return
+        with self._lock:
+            self._puts += 1
+            if self._stored_bytes is not None:
+                self._stored_bytes += len(value)
+            check = (
+                self._stored_bytes is None
+                or self._stored_bytes > self.max_bytes
+                or self._puts % _EVICT_CHECK_EVERY == 0
+            )
+        if check:
+            self._evict()
+
+    def _evict(self) -> None:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - int(self.max_bytes * _EVICT_TO)
+                keys = []
+                for key, size in connection.execute(
+                    "SELECT key, size FROM results ORDER BY last_access"
+                ):
+                    keys.append((key,))
+                    excess -= size
+                    total -= size
+                    if excess <= 0:
+                        break
+                connection.executemany("DELETE FROM results WHERE key = ?", keys)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        with self._lock:
+            self._stored_bytes = total
+
+    def clear(self) -> None:
+        """Delete every stored result."""
+        self._connection().execute("DELETE FROM results")
+        with self._lock:
+            self._stored_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Entries and bytes stored, and this instance's hits and misses."""
+        entries, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        return {"entries": entries, "bytes": size, "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
@@ -0,0 +1,354 @@
+"""Command-line entry point for ``vcs``.
+
+Segmenters and embedders are given as importable ``module:function`` specs
+and loaded once per process.
+
+Examples
+--------
+Score a JSONL corpus (``id``, ``reference``, ``generated`` per line) with four
+worker processes, streaming results as they finish::
+
+    vcs score corpus.jsonl --segmenter my_models:segment --embedder my_models:embed \
+        --workers 4 --batch-size 16 --output scores.jsonl --progress
+
+Serve a JSON scoring endpoint on localhost, batching concurrent requests'
+embeddings::
+
+    vcs serve --segmenter my_models:segment --embedder my_models:embed --port 8000
+
+    curl -s localhost:8000/score -d '{"reference": "...", "generated": "..."}'
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from ._config import (
+    DEFAULT_CONTEXT_CUTOFF_VALUE,
+    DEFAULT_CONTEXT_WINDOW_CONTROL,
+    DEFAULT_LCT,
+    DEFAULT_CHUNK_SIZE,
+)
+from ._caching import ResultCache
+from ._results import ColumnarResultWriter, JsonLinesResultWriter
+from ._results._jsonl import _compression_for
+from ._utils import _load_object
+
+
+def _log(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+def _add_model_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--segmenter", required=True, metavar="MODULE:FUNCTION",
+                        help="Segmentation function, e.g. my_models:segment.")
+    parser.add_argument("--embedder", required=True, metavar="MODULE:FUNCTION",
+                        help="Embedding function used for LAS (and GAS unless --gas-embedder).")
+    parser.add_argument("--gas-embedder", metavar="MODULE:FUNCTION",
+                        help="Separate embedding function for GAS.")
+
+
+def _add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--context-cutoff-value", type=float, default=DEFAULT_CONTEXT_CUTOFF_VALUE)
+    parser.add_argument("--context-window-control", type=float, default=DEFAULT_CONTEXT_WINDOW_CONTROL)
+    parser.add_argument("--lct", type=int, default=DEFAULT_LCT)
+
+
+def _load_models(args: argparse.Namespace):
+    return (
+        _load_object(args.segmenter),
+        _load_object(args.embedder),
+        _load_object(args.gas_embedder) if args.gas_embedder else None,
+    )
+
+
+def _config_options(args: argparse.Namespace):
+    return {
+        "chunk_size": args.chunk_size,
+        "context_cutoff_value": args.context_cutoff_value,
+        "context_window_control": args.context_window_control,
+        "lct": args.lct,
+    }
+
+
+def _split_fields(values: Optional[List[str]]) -> Optional[List[str]]:
+    if values is None:
+        return None
+    return [field.strip() for value in values for field in value.split(",") if field.strip()]
+
+
+def _cmd_score(args: argparse.Namespace) -> int:
+    from ._corpus import ConsoleProgress, JsonLinesProgress
+    from ._corpus._io import _count_pairs, _read_pairs
+    from ._corpus._corpus import _embedding_config
+    from ._corpus._parallel import _score_corpus_parallel
+
+    torch_threads = args.torch_threads
+    if torch_threads is None and args.workers > 1:
+        torch_threads = max(1, (os.cpu_count() or 1) // args.workers)
+
+    progress = None
+    if args.progress_jsonl:
+        progress = JsonLinesProgress(args.progress_jsonl)
+    elif args.progress:
+        progress = ConsoleProgress()
+
+    results = _score_corpus_parallel(
+        _read_pairs(args.input),
+        args.segmenter, args.embedder, args.gas_embedder,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        torch_threads=torch_threads,
+        start_method=args.start_method,
+        progress=progress,
+        progress_interval=args.progress_interval,
+        total=_count_pairs(args.input) if progress else None,
+        return_all_metrics=args.all_metrics,
+        return_internals=args.internals,
+        similarity_top_k=args.similarity_top_k,
+        normalize=args.normalize,
+        dtype=args.dtype,
+        return_timings=args.timings,
+        memory_budget=args.memory_budget,
+        slow_pair_seconds=args.slow_pair_seconds,
+        slow_pair_dir=args.slow_pair_dir,
+        checkpoint_dir=args.checkpoint_dir,
+        checkpoint_every=args.checkpoint_every,
+        checkpoint_seconds=args.checkpoint_seconds,
+        cache_embeddings=args.cache_embeddings,
+        manifest_path=args.manifest,
+        fingerprint=args.fingerprint,
+        result_cache=(
+            ResultCache(
+                args.result_cache,
+                max_bytes=int(args.result_cache_max_mb * 2**20) if args.result_cache_max_mb else None,
+                fingerprint=args.fingerprint,
+            )
+            if args.result_cache else None
+        ),
+        log=_log,
+        **_config_options(args),
+    )
+
+    columnar = None
+    if args.columnar:
+        try:
+            columnar = ColumnarResultWriter(
+                args.columnar, {**_config_options(args), **_embedding_config(args.normalize, args.dtype)},
+                args.row_group_size,
+            )
+        except ImportError as exc:
+            raise ValueError(str(exc)) from None
+
+    output = args.output or "-"
+    compression = args.compression or (None if output == "-" else _compression_for(output))
+    writer_options = {
+        "compression": compression,
+        "internals_fields": _split_fields(args.internals_fields),
+        "drop_internals_fields": _split_fields(args.drop_internals_fields) or (),
+    }
+    # With a checkpoint, the checkpoint is the durable record and --output and
+    # --columnar are written from it once the run completes.
+    errors = 0
+    sink = None
+    if not (args.checkpoint_dir and args.output):
+        try:
+            sink = JsonLinesResultWriter(output, **writer_options)
+        except ImportError as exc:
+            raise ValueError(str(exc)) from None
+    try:
+        for result in results:
+            if "error" in result:
+                errors += 1
+                _log(f"vcs score: pair {result['id']!r} failed: {result['error']}")
+            if sink is not None:
+                sink.write(result)
+            if columnar is not None and not args.checkpoint_dir:
+                columnar.write(result)
+    finally:
+        if sink is not None:
+            sink.close()
+        if columnar is not None and not args.checkpoint_dir:
+            columnar.close()
+
+    if args.checkpoint_dir and columnar is not None:
+        from ._corpus import load_checkpoint_results
+
+        with columnar:
+            for result in load_checkpoint_results(args.checkpoint_dir):
+                columnar.write(result)
+
+    if args.checkpoint_dir and args.output:
+        from ._corpus import load_checkpoint_results
+
+        # Streamed to a temporary file and renamed, so a partial --output
+        # never replaces a complete one.
+        tmp_path = f"{args.output}.tmp-{os.getpid()}"
+        try:
+            with JsonLinesResultWriter(tmp_path, flush=False, **writer_options) as sink:
+                for result in load_checkpoint_results(args.checkpoint_dir):
+                    sink.write(result)
+            os.replace(tmp_path, args.output)
+        except ImportError as exc:
+            raise ValueError(str(exc)) from None
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    return 1 if errors else 0
+
+
+def _cmd_serve(args: argparse.Namespace) -> int:
+    from ._instrumentation import enable_metrics
+    from ._serve import create_scoring_server
+
+    segmenter_fn, embedding_fn_las, embedding_fn_gas = _load_models(args)
+    server = create_scoring_server(
+        segmenter_fn, embedding_fn_las, embedding_fn_gas,
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.max_batch_size,
+        max_wait=args.max_wait_ms / 1e3,
+        max_in_flight=args.max_in_flight,
+        max_queued=args.max_queued,
+        queue_timeout=args.queue_timeout,
+        max_body_bytes=args.max_body_bytes,
+        metrics=enable_metrics() if args.metrics else None,
+        warmup=not args.no_warmup,
+        verbose=args.verbose,
+        **_config_options(args),
+    )
+    host, port = server.server_address[:2]
+    _log(f"vcs serve: listening on http://{host}:{port} (POST /score, GET /health"
+         f"{', GET /metrics' if args.metrics else ''})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="vcs", description="Video Comprehension Score tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score = commands.add_parser(
+        "score", help="Score a JSONL or CSV corpus, streaming JSONL results."
+    )
+    score.add_argument("input", help="Corpus file: .jsonl, .csv or .tsv ('-' reads JSONL from stdin).")
+    _add_model_arguments(score)
+    _add_config_arguments(score)
+    score.add_argument("--output", "-o",
+                       help="Results JSONL path (default: stdout); a .gz or .zst suffix "
+                            "compresses it.")
+    score.add_argument("--compression", choices=("gzip", "zstd"),
+                       help="Compress --output regardless of its suffix (zstd needs zstandard).")
+    score.add_argument("--normalize", action="store_true",
+                       help="L2-normalize embeddings before GAS and LAS, for embedders that "
+                            "do not return unit vectors.")
+    score.add_argument("--dtype", choices=("float32", "float16"),
+                       help="Precision of embeddings and similarity matrices "
+                            "(default: the embedder's).")
+    score.add_argument("--all-metrics", action="store_true",
+                       help="Include GAS, LAS, NAS and their components, not only VCS.")
+    score.add_argument("--internals", action="store_true",
+                       help="Include each pair's internals (similarity matrix, alignments, "
+                            "best-match diagnostics, ...) in the results.")
+    score.add_argument("--similarity-top-k", type=int, metavar="K",
+                       help="With --internals, store each chunk's K best similarities "
+                            "instead of the full similarity matrix.")
+    score.add_argument("--internals-fields", action="append", metavar="FIELDS",
+                       help="Comma-separated dotted internals paths to keep, e.g. "
+                            "metrics,alignment.precision (repeatable).")
+    score.add_argument("--drop-internals-fields", action="append", metavar="FIELDS",
+                       help="Comma-separated dotted internals paths to leave out, e.g. "
+                            "similarity.matrix (repeatable).")
+    score.add_argument("--workers", type=int, default=1,
+                       help="Worker processes; each loads the models once. With more than "
+                            "one, results are written in completion order.")
+    score.add_argument("--batch-size", type=int, default=8,
+                       help="Pairs sent to a worker at a time.")
+    score.add_argument("--torch-threads", type=int,
+                       help="torch intra-op threads per worker (default: cores / workers "
+                            "with several workers, so they do not oversubscribe the CPU).")
+    score.add_argument("--start-method", choices=("spawn", "forkserver", "fork"), default="spawn",
+                       help="multiprocessing start method for workers.")
+    score.add_argument("--timings", action="store_true", help="Add per-stage timings to each result.")
+    score.add_argument("--memory-budget", type=int, metavar="BYTES",
+                       help="Add memory profiles and flag pairs whose peak exceeds BYTES.")
+    score.add_argument("--slow-pair-seconds", type=float,
+                       help="Save a cProfile capture for pairs slower than this. Pairs "
+                            "are then embedded one at a time, without batch deduplication, "
+                            "so timings and captures include their embeddings.")
+    score.add_argument("--slow-pair-dir", default="vcs-slow-pairs")
+    score.add_argument("--checkpoint-dir", metavar="DIR",
+                       help="Make the run resumable: commit results to DIR and skip pairs "
+                            "already committed there. --output is written when the run completes.")
+    score.add_argument("--checkpoint-every", type=int, default=100, metavar="PAIRS")
+    score.add_argument("--checkpoint-seconds", type=float, default=60.0)
+    score.add_argument("--cache-embeddings", action="store_true",
+                       help="Reuse embeddings of repeated texts (saved in --checkpoint-dir if given).")
+    score.add_argument("--manifest", metavar="PATH",
+                       help="Content-hash manifest: reuse results of pairs whose texts, config "
+                            "and model are unchanged since the run that wrote PATH.")
+    score.add_argument("--fingerprint",
+                       help="Model identity for the manifest and result cache (default: derived "
+                            "from the segmenter's and embedders' output on probe texts).")
+    score.add_argument("--result-cache", metavar="PATH",
+                       help="sqlite result cache shared across runs and processes.")
+    score.add_argument("--result-cache-max-mb", type=float, metavar="MB",
+                       help="Evict least recently used results beyond this size.")
+    score.add_argument("--columnar", metavar="PATH",
+                       help="Also write results to a columnar .parquet (needs pyarrow) or .npz "
+                            "file; use with --all-metrics to fill every metric column.")
+    score.add_argument("--row-group-size", type=int, default=10_000, metavar="ROWS",
+                       help="Rows per row group of --columnar.")
+    score.add_argument("--progress", action="store_true", help="Show progress on stderr.")
+    score.add_argument("--progress-jsonl", metavar="PATH",
+                       help="Append progress events as JSON lines to PATH.")
+    score.add_argument("--progress-interval", type=float, default=1.0)
+    score.set_defaults(func=_cmd_score)
+
+    serve = commands.add_parser(
+        "serve", help="Run a local JSON scoring server with dynamic embedding batching."
+    )
+    _add_model_arguments(serve)
+    _add_config_arguments(serve)
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--max-batch-size", type=int, default=256,
+                       help="Most texts per coalesced embedding call.")
+    serve.add_argument("--max-wait-ms", type=float, default=5.0,
+                       help="How long an embedding call waits for others to join its batch.")
+    serve.add_argument("--max-in-flight", type=int, default=8,
+                       help="Requests scored concurrently.")
+    serve.add_argument("--max-queued", type=int, default=64,
+                       help="Requests allowed to wait for a slot; more are rejected with 503.")
+    serve.add_argument("--queue-timeout", type=float, default=5.0,
+                       help="Seconds a request waits for a slot before a 503.")
+    serve.add_argument("--max-body-bytes", type=int, default=16 * 2**20)
+    serve.add_argument("--metrics", action="store_true",
+                       help="Collect Prometheus metrics and serve them at /metrics.")
+    serve.add_argument("--no-warmup", action="store_true",
+                       help="Skip the start-up embedding call.")
+    serve.add_argument("--verbose", "-v", action="store_true", help="Log every request.")
+    serve.set_defaults(func=_cmd_serve)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except ValueError as exc:
+        _log(f"vcs {args.command}: error: {exc}")
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+"""
+Corpus-level scoring built on ``compute_vcs_score``.
+"""
+
+from ._corpus import compute_vcs_corpus
+from ._pairs import _normalize_pair
+from ._checkpoint import load_checkpoint_results
+from ._progress import (
+    ConsoleProgress,
+    JsonLinesProgress,
+    ProgressCallback,
+    ProgressEvent,
+)
+
+__all__ = [
+    "compute_vcs_corpus",
+    "load_checkpoint_results",
+    "ProgressCallback",
+    "ProgressEvent",
+    "ConsoleProgress",
+    "JsonLinesProgress",
+    "_normalize_pair",
+]
@@ -0,0 +1,132 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import torch
+
+from .._caching import ResultCache
+from .._segmenting import _segment_and_chunk_texts, _embed_unique
+
+
+def _groups(pairs: Iterable[Any], size: int) -> Iterator[List[Tuple[int, Any]]]:
+    # ``(index, item)`` lists of ``size`` consecutive items, the last one shorter.
+    group: List[Tuple[int, Any]] = []
+    for index, item in enumerate(pairs):
+        group.append((index, item))
+        if len(group) == size:
+            yield group
+            group = []
+    if group:
+        yield group
+
+
+def _embed_table(embedding_fn: Callable, texts: Sequence[str]) -> Dict[str, torch.Tensor]:
+    if not texts:
+        return {}
+    rows = torch.as_tensor(embedding_fn(list(texts)))
+    return dict(zip(texts, rows))
+
+
+class _BatchPrefetcher:
+    """Embeds every distinct chunk and document of a batch of pairs up front.
+
+    Pairs scored together often share texts (one reference against several
+    generations, stock sentences repeated across captions). :meth:`prefetch`
+    segments each pair of a batch once (the segmentation is reused for
+    scoring), then embeds each distinct chunk (LAS) and whole text (GAS) of
+    the batch in a single call per embedding function. The batch is then
+    scored with ``segmenter_fn``, ``embedding_fn_las`` and
+    ``embedding_fn_gas``, which serve those tables and embed anything else
+    as usual. They are created once, so result cache fingerprints computed
+    from them stay valid across batches; each batch replaces the tables of
+    the previous one.
+
+    A pair that cannot be segmented is left out and a failed embedding call
+    leaves the tables empty, so errors are still reported for the offending
+    pair when it is scored.
+    """
+
+    def __init__(
+        self,
+        segmenter_fn: Callable[[str], List[str]],
+        embedding_fn_las: Callable[[List[str]], torch.Tensor],
+        embedding_fn_gas: Optional[Callable[[List[str]], torch.Tensor]],
+        chunk_size: int,
+    ):
+        self.chunk_size = chunk_size
+        self._segmenter_fn = segmenter_fn
+        self._embedding_fn_las = embedding_fn_las
+        self._embedding_fn_gas = embedding_fn_gas
+        # compute_vcs_score uses the LAS function for GAS: one table for both.
+        self._shared = embedding_fn_gas is None or embedding_fn_gas is embedding_fn_las
+        self._segments: Dict[str, List[str]] = {}
+        self._las_table: Dict[str, torch.Tensor] = {}
+        self._gas_table: Dict[str, torch.Tensor] = {}
+        self.segmenter_fn = self._segment
+        self.embedding_fn_las = self._embed_las
+        if embedding_fn_gas is None:
+            self.embedding_fn_gas = None
+        else:
+            self.embedding_fn_gas = self._embed_las if self._shared else self._embed_gas
+
+    def _segment(self, text: str) -> List[str]:
+        if text not in self._segments:
+            self._segments[text] = self._segmenter_fn(text)
+        return self._segments[text]
+
+    def _embed_las(self, texts: List[str]) -> Any:
+        return self._lookup(self._embedding_fn_las, self._las_table, texts)
+
+    def _embed_gas(self, texts: List[str]) -> Any:
+        return self._lookup(self._embedding_fn_gas, self._gas_table, texts)
+
+    @staticmethod
+    def _lookup(embedding_fn: Callable, table: Dict[str, torch.Tensor], texts: List[str]) -> Any:
+        if not texts or any(text not in table for text in texts):
+            return _embed_unique(embedding_fn, texts)
+        return torch.stack([table[text] for text in texts])
+
+    def prefetch(
+        self,
+        pairs: Sequence[Tuple[Any, str, str]],
+        result_cache: Optional[ResultCache] = None,
+        config: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[Any, str, str]]:
+        """Replace the tables with the embeddings of ``(id, reference, generated)`` pairs.
+
+        With ``result_cache`` (and the scoring ``config`` its keys are built
+        from), pairs whose result it already holds need no embeddings and
+        are left out. Returns the pairs that were prefetched.
+        """
+        self._segments, self._las_table, self._gas_table = {}, {}, {}
+        if result_cache is not None:
+            fingerprint = result_cache.pipeline_fingerprint(
+                self.segmenter_fn, self.embedding_fn_las, self.embedding_fn_gas or self.embedding_fn_las
+            )
+            pairs = [
+                pair for pair in pairs
+                if result_cache.key(pair[1], pair[2], config, fingerprint)[0] not in result_cache
+            ]
+        chunks: Dict[str, None] = {}
+        documents: Dict[str, None] = {}
+        prefetched = []
+        for pair in pairs:
+            _, reference_text, generated_text = pair
+            try:
+                ref_chunks, gen_chunks = _segment_and_chunk_texts(
+                    reference_text, generated_text, self.chunk_size, self._segment
+                )
+            except Exception:
+                continue
+            prefetched.append(pair)
+            chunks.update(dict.fromkeys(ref_chunks))
+            chunks.update(dict.fromkeys(gen_chunks))
+            documents.update(dict.fromkeys((reference_text, generated_text)))
+
+        try:
+            if self._shared:
+                self._las_table = _embed_table(self._embedding_fn_las, list({**chunks, **documents}))
+            else:
+                self._las_table = _embed_table(self._embedding_fn_las, list(chunks))
+                self._gas_table = _embed_table(self._embedding_fn_gas, list(documents))
+        except Exception:
+            self._las_table, self._gas_table = {}, {}
+        return prefetched
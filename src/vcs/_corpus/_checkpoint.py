@@ -0,0 +1,134 @@
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from .._utils import _atomic_write_bytes, _json_default
+
+CHECKPOINT_SCHEMA_VERSION = 1
+RESULTS_FILE = "results.jsonl"
+STATE_FILE = "state.json"
+
+
+def _id_key(pair_id: Any) -> str:
+    return json.dumps(pair_id, sort_keys=True, default=str)
+
+
+def _read_state(directory: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(directory, STATE_FILE), "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return None
+
+
+def load_checkpoint_results(checkpoint_dir: str) -> Iterator[Dict[str, Any]]:
+    """Iterate over the results committed to a corpus checkpoint.
+
+    Only results covered by the last committed checkpoint are returned;
+    anything written after it (for example by a run that was killed) is
+    ignored, exactly as a resumed run would.
+
+    Parameters
+    ----------
+    checkpoint_dir : str
+        Directory passed as ``checkpoint_dir`` to :func:`compute_vcs_corpus`.
+
+    Yields
+    ------
+    dict
+        Stored results, in the order they were committed.
+    """
+    state = _read_state(checkpoint_dir)
+    if state is None:
+        return
+    remaining = state["results_bytes"]
+    with open(os.path.join(checkpoint_dir, RESULTS_FILE), "rb") as fh:
+        for line in fh:
+            if remaining <= 0:
+                break
+            remaining -= len(line)
+            yield json.loads(line)
+
+
+class _Checkpoint:
+    """Append-only results log plus an atomically replaced state file.
+
+    Results are appended to ``results.jsonl`` as they arrive. A commit fsyncs
+    the log and then atomically rewrites ``state.json`` with the log's byte
+    length, so the state always describes a fully written prefix of the log.
+    On open, anything past that prefix is truncated away and the committed
+    pair ids are loaded. Commits happen every ``every_pairs`` results or
+    ``every_seconds`` seconds, whichever comes first, and on close.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        config: Dict[str, Any],
+        every_pairs: int = 100,
+        every_seconds: float = 60.0,
+        on_commit: Optional[List[Callable[[], None]]] = None,
+    ):
+        self.directory = directory
+        self.config = config
+        self.every_pairs = every_pairs
+        self.every_seconds = every_seconds
+        self.on_commit = list(on_commit or [])
+        self.completed: Set[str] = set()
+        os.makedirs(directory, exist_ok=True)
+
+        state = _read_state(directory)
+        results_path = os.path.join(directory, RESULTS_FILE)
+        committed_bytes = 0
+        if state is not None:
+            if state.get("config") != config:
+                raise ValueError(
+                    f"Checkpoint in {directory!r} was written with config {state.get('config')}, "
+                    f"not {config}; use a new checkpoint directory."
+                )
+            committed_bytes = state["results_bytes"]
+            self.completed = {_id_key(r["id"]) for r in load_checkpoint_results(directory)}
+
+        self._fh = open(results_path, "ab")
+        self._fh.truncate(committed_bytes)
+        self._fh.seek(committed_bytes)
+        self._committed_bytes = committed_bytes
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+    def is_done(self, pair_id: Any) -> bool:
+        return _id_key(pair_id) in self.completed
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self._fh.write((json.dumps(result, default=_json_default) + "\n").encode("utf-8"))
+        self.completed.add(_id_key(result["id"]))
+        self._uncommitted += 1
+        if (self._uncommitted >= self.every_pairs
+                or time.monotonic() - self._last_commit >= self.every_seconds):
+            self.commit()
+
+    def commit(self) -> None:
+        for callback in self.on_commit:
+            callback()
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._committed_bytes = self._fh.tell()
+        state = {
+            "schema": CHECKPOINT_SCHEMA_VERSION,
+            "results_bytes": self._committed_bytes,
+            "pairs": len(self.completed),
+            "config": self.config,
+            "updated": time.time(),
+        }
+        _atomic_write_bytes(
+            os.path.join(self.directory, STATE_FILE),
+            json.dumps(state, indent=2).encode("utf-8"),
+        )
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+    def close(self) -> None:
+        if not self._fh.closed:
+            self.commit()
+            self._fh.close()
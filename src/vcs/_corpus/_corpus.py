@@ -0,0 +1,398 @@
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import torch
+
+from .._config import (
+    DEFAULT_CONTEXT_CUTOFF_VALUE,
+    DEFAULT_CONTEXT_WINDOW_CONTROL,
+    DEFAULT_LCT,
+    DEFAULT_CHUNK_SIZE,
+)
+from .._instrumentation import _Instrument, _active_hooks
+from .._caching import ResultCache
+from .._segmenting import _resolve_embedding_dtype
+from .._utils import _pipeline_fingerprint
+from ..scorer import compute_vcs_score
+from ._batch_embeddings import _BatchPrefetcher, _groups
+from ._pairs import _normalize_pair
+from ._progress import ProgressCallback, _ProgressTracker
+from ._checkpoint import _Checkpoint, _id_key
+from ._embedding_cache import _EmbeddingCache
+from ._manifest import _Manifest
+from ._slow_pairs import _capture_slow_pair
+
+
+def _embedding_config(normalize: bool, dtype: Any) -> Dict[str, Any]:
+    # Same entries compute_vcs_score adds to its config, only when set.
+    config: Dict[str, Any] = {}
+    if normalize:
+        config["normalize"] = True
+    dtype = _resolve_embedding_dtype(dtype)
+    if dtype is not None:
+        config["dtype"] = str(dtype).replace("torch.", "")
+    return config
+
+
+def _checkpoint_config(
+    config: Dict[str, Any],
+    return_all_metrics: bool,
+    return_internals: bool = False,
+    similarity_top_k: Optional[int] = None,
+) -> Dict[str, Any]:
+    run_config = {**config, "return_all_metrics": return_all_metrics}
+    # Only recorded when set, so existing checkpoints and manifests still match.
+    if return_internals:
+        run_config["return_internals"] = True
+        if similarity_top_k is not None:
+            run_config["similarity_top_k"] = similarity_top_k
+    return run_config
+
+
+def compute_vcs_corpus(
+    pairs: Iterable[Any],
+    segmenter_fn: Callable[[str], List[str]],
+    embedding_fn_las: Callable[[List[str]], torch.Tensor],
+    embedding_fn_gas: Callable[[List[str]], torch.Tensor] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    context_cutoff_value: float = DEFAULT_CONTEXT_CUTOFF_VALUE,
+    context_window_control: float = DEFAULT_CONTEXT_WINDOW_CONTROL,
+    lct: int = DEFAULT_LCT,
+    return_all_metrics: bool = False,
+    return_internals: bool = False,
+    similarity_top_k: Optional[int] = None,
+    return_timings: bool = False,
+    return_memory: bool = False,
+    memory_sample_rss: bool = False,
+    memory_budget: Optional[int] = None,
+    slow_pair_seconds: Optional[float] = None,
+    slow_pair_dir: str = "vcs-slow-pairs",
+    progress: Optional[ProgressCallback] = None,
+    progress_interval: float = 1.0,
+    total: Optional[int] = None,
+    checkpoint_dir: Optional[str] = None,
+    checkpoint_every: int = 100,
+    checkpoint_seconds: float = 60.0,
+    cache_embeddings: bool = False,
+    manifest_path: Optional[str] = None,
+    fingerprint: Optional[str] = None,
+    result_cache: Optional[ResultCache] = None,
+    normalize: bool = False,
+    dtype: Optional[str] = None,
+    batch_size: int = 8,
+) -> Iterator[Dict[str, Any]]:
+    """Score a corpus of reference/generated pairs, yielding results as they finish.
+
+    A thin streaming loop around :func:`compute_vcs_score`: pairs are read
+    ``batch_size`` at a time and nothing is kept once a batch's results have
+    been yielded, so memory stays flat for any corpus size.
+    Registered stage hooks additionally see a ``'corpus_pair'`` stage around
+    each pair.
+
+
+    Parameters
+    ----------
+    pairs : iterable
+        Items in any of these forms:
+        
+        - ``{'id': ..., 'reference': str, 'generated': str}`` (``id`` optional;
+          ``reference_text``/``generated_text`` are accepted as key names)
+        - ``(reference, generated)``
+        - ``(id, reference, generated)``
+        
+        Items without an id are identified by their position.
+    segmenter_fn, embedding_fn_las, embedding_fn_gas : callable
+        Segmentation and embedding functions, as for :func:`compute_vcs_score`.
+    chunk_size, context_cutoff_value, context_window_control, lct
+        Configuration shared by every pair, as for :func:`compute_vcs_score`.
+    return_all_metrics, return_internals, return_timings, return_memory, memory_sample_rss : bool
+        Per-pair outputs, as for :func:`compute_vcs_score`. Internals are
+        large; stream them to a :class:`JsonLinesResultWriter` rather than
+        collecting them.
+    similarity_top_k : int, optional
+        Store a top-k similarity sketch in the internals instead of the full
+        matrix, as for :func:`compute_vcs_score`.
+    memory_budget : int, optional
+        Peak traced allocation in bytes. Implies ``return_memory=True``; each
+        result's ``'memory'`` entry gets an ``'over_budget'`` flag.
+    slow_pair_seconds : float, optional
+        Latency threshold. A pair that takes longer (including its share of
+        its batch's segmentation and embedding, see ``batch_size``) is scored
+        again, on its own, under ``cProfile``; the profile (``.prof``, readable with ``pstats`` or
+        snakeviz) and a JSON file with the texts' SHA-256 hashes, sizes,
+        config and per-stage timings are written to ``slow_pair_dir``, and the
+        result gets a ``'slow_pair'`` entry pointing to both files.
+    slow_pair_dir : str, default="vcs-slow-pairs"
+        Directory for slow-pair captures; created on first use.
+    progress : ProgressCallback, optional
+        Receives a :class:`ProgressEvent` (pairs done, pairs/s, embedded
+        texts/s, ETA, queue depths) at most every ``progress_interval``
+        seconds, and a final one with ``finished=True``. Use
+        :class:`ConsoleProgress` or :class:`JsonLinesProgress`, or subclass
+        :class:`ProgressCallback`.
+    progress_interval : float, default=1.0
+        Minimum seconds between progress events.
+    total : int, optional
+        Number of pairs, for the ETA. Defaults to ``len(pairs)`` when
+        ``pairs`` has a length.
+    checkpoint_dir : str, optional
+        Makes the run resumable. Each result is appended to
+        ``checkpoint_dir/results.jsonl`` and committed every
+        ``checkpoint_every`` pairs or ``checkpoint_seconds`` seconds with an
+        fsync and an atomic rewrite of ``state.json``, so killing the process
+        at any moment loses at most the uncommitted results. Running again
+        with the same directory skips every committed pair id; only new
+        results are yielded (read all of them with
+        :func:`load_checkpoint_results`). Pair ids must be stable between
+        runs, and the configuration must match the checkpoint's.
+    checkpoint_every : int, default=100
+    checkpoint_seconds : float, default=60.0
+        Commit frequency of the checkpoint.
+    cache_embeddings : bool, default=False
+        Reuse embeddings of texts seen earlier in the run (e.g. one reference
+        scored against many generations). With ``checkpoint_dir``, new cache
+        entries are saved at every commit and reloaded on resume. At most
+        512 MiB of embeddings stay in memory; older ones are read back from
+        ``checkpoint_dir`` when needed, or embedded again without it.
+    manifest_path : str, optional
+        Content-hash manifest (JSONL). Pairs whose texts, configuration and
+        pipeline fingerprint match an entry written by an earlier run reuse
+        its result instead of being scored; the manifest is then rewritten
+        for this run. Reused results carry no ``'timings'``, ``'memory'`` or
+        ``'slow_pair'`` entries: those describe the run that scored them.
+    fingerprint : str, optional
+        Identity of the segmenter/embedder combination for the manifest.
+        Derived from their output on fixed probe texts by default.
+    result_cache : ResultCache, optional
+        Persistent result cache passed on to every :func:`compute_vcs_score`
+        call; unlike the manifest, it can be shared by concurrent runs.
+    normalize, dtype
+        Embedding normalization and precision, as for :func:`compute_vcs_score`.
+    batch_size : int, default=8
+        Pairs read ahead together. The distinct chunks and texts of a batch
+        are embedded in one call per embedding function before its pairs are
+        scored, so text shared between pairs is embedded once; pairs reused
+        from the manifest or the result cache are left out. ``1`` scores
+        each pair as soon as it is read.
+    
+    Yields
+    ------
+    dict
+        ``{'id': pair_id, **compute_vcs_score(...)}`` for each pair, in input order.
+    
+    Examples
+    --------
+    >>> pairs = [{'id': 'clip-1', 'reference': ref_1, 'generated': gen_1},
+    ...          {'id': 'clip-2', 'reference': ref_2, 'generated': gen_2}]
+    >>> for result in compute_vcs_corpus(pairs, segmenter, embedder):
+    ...     print(result['id'], result['VCS'])
+    
+    **Flag memory-hungry pairs:**
+    
+    >>> results = list(compute_vcs_corpus(pairs, segmenter, embedder,
+    ...                                   memory_budget=256 * 2**20))
+    >>> summary = summarize_memory_profiles(results, budget_bytes=256 * 2**20)
+    
+    **Resume a long run after a crash or preemption:**
+    
+    >>> for result in compute_vcs_corpus(pairs, segmenter, embedder,
+    ...                                  checkpoint_dir="eval-ckpt",
+    ...                                  cache_embeddings=True):
+    ...     pass
+    >>> all_results = list(load_checkpoint_results("eval-ckpt"))
+    
+    **Re-score only pairs whose texts, config or model changed:**
+    
+    >>> results = list(compute_vcs_corpus(pairs, segmenter, embedder,
+    ...                                   manifest_path="eval-manifest.jsonl"))
+    
+    **Show progress on the terminal:**
+    
+    >>> for result in compute_vcs_corpus(pairs, segmenter, embedder,
+    ...                                  progress=ConsoleProgress()):
+    ...     write(result)
+    
+    **Stream scores and trimmed internals to a compressed file:**
+    
+    >>> write_results_jsonl(
+    ...     compute_vcs_corpus(pairs, segmenter, embedder, return_internals=True),
+    ...     "results.jsonl.gz", drop_internals_fields=["similarity.matrix"])
+    
+    See Also
+    --------
+    compute_vcs_score : Score a single pair
+    summarize_memory_profiles : Corpus-level memory summary
+    load_checkpoint_results : Read the results stored in a checkpoint
+    """
+    if memory_budget is not None:
+        return_memory = True
+    config = {
+        "chunk_size": chunk_size,
+        "context_cutoff_value": context_cutoff_value,
+        "context_window_control": context_window_control,
+        "lct": lct,
+        **_embedding_config(normalize, dtype),
+    }
+    manifest = None
+    if manifest_path is not None:
+        manifest = _Manifest(
+            manifest_path, _checkpoint_config(config, return_all_metrics, return_internals, similarity_top_k),
+            fingerprint or _pipeline_fingerprint(segmenter_fn, embedding_fn_las, embedding_fn_gas),
+        )
+
+    tracker = None
+    if progress is not None:
+        if total is None and hasattr(pairs, "__len__"):
+            total = len(pairs)
+        tracker = _ProgressTracker(progress, total, progress_interval)
+        embedding_fn_las = tracker.wrap_embedding(embedding_fn_las)
+        if embedding_fn_gas is not None:
+            embedding_fn_gas = tracker.wrap_embedding(embedding_fn_gas)
+
+    caches = []
+    if cache_embeddings:
+        caches.append(_EmbeddingCache("las", checkpoint_dir))
+        embedding_fn_las = caches[-1].wrap(embedding_fn_las)
+        if embedding_fn_gas is not None:
+            caches.append(_EmbeddingCache("gas", checkpoint_dir))
+            embedding_fn_gas = caches[-1].wrap(embedding_fn_gas)
+
+    # Slow pairs are profiled again without the prefetcher, so the profile
+    # includes their segmentation and embeddings.
+    unbatched = (segmenter_fn, embedding_fn_las, embedding_fn_gas)
+    prefetcher = None
+    if batch_size > 1:
+        prefetcher = _BatchPrefetcher(segmenter_fn, embedding_fn_las, embedding_fn_gas, chunk_size)
+        segmenter_fn = prefetcher.segmenter_fn
+        embedding_fn_las = prefetcher.embedding_fn_las
+        embedding_fn_gas = prefetcher.embedding_fn_gas
+    # compute_vcs_score only consults the cache for results without these.
+    uses_result_cache = result_cache is not None and not (
+        return_internals or return_timings or return_memory
+    )
+
+    checkpoint = None
+    if checkpoint_dir is not None:
+        checkpoint = _Checkpoint(
+            checkpoint_dir, _checkpoint_config(config, return_all_metrics, return_internals, similarity_top_k),
+            checkpoint_every, checkpoint_seconds, on_commit=[c.flush for c in caches],
+        )
+        if total is not None:
+            total = max(total - len(checkpoint.completed), 0)
+            if tracker is not None:
+                tracker.total = total
+
+    def queue_depths() -> Dict[str, int]:
+        depths = {"scoring": 0}
+        if total is not None:
+            depths["pending"] = max(total - tracker.pairs_done, 0)
+        return depths
+
+    def pending(group: List[Tuple[int, Any]]) -> List[Tuple[Any, str, str]]:
+        # The pairs of a batch that will be scored; malformed items are
+        # left for the scoring loop to raise on, in order.
+        pairs_to_score = []
+        for index, item in group:
+            try:
+                pair = _normalize_pair(item, index)
+            except Exception:
+                continue
+            if checkpoint is not None and checkpoint.is_done(pair[0]):
+                continue
+            if manifest is not None and manifest.key(pair[1], pair[2])[0] in manifest:
+                continue
+            pairs_to_score.append(pair)
+        return pairs_to_score
+
+    completed = False
+    try:
+        for group in _groups(pairs, max(batch_size, 1)):
+            # Each prefetched pair is charged an equal share of the batch's
+            # segmentation and embedding time.
+            prefetch_seconds: Dict[str, float] = {}
+            if prefetcher is not None:
+                start = time.perf_counter()
+                prefetched = prefetcher.prefetch(
+                    pending(group), result_cache if uses_result_cache else None, config
+                )
+                if prefetched:
+                    share = (time.perf_counter() - start) / len(prefetched)
+                    prefetch_seconds = {_id_key(pair[0]): share for pair in prefetched}
+            for index, item in group:
+                pair_id, reference_text, generated_text = _normalize_pair(item, index)
+                if checkpoint is not None and checkpoint.is_done(pair_id):
+                    continue
+                if manifest is not None:
+                    key, reference_sha256, generated_sha256 = manifest.key(reference_text, generated_text)
+                    result = manifest.lookup(key, pair_id)
+                    if result is not None:
+                        if checkpoint is not None:
+                            checkpoint.add(result)
+                        if tracker is not None:
+                            tracker.pair_done(queue_depths)
+                        yield result
+                        continue
+                hooks = _active_hooks()
+                instrument = _Instrument(False, hooks, config) if hooks else None
+
+                def score(
+                    return_timings: bool = return_timings,
+                    functions: Tuple[Callable, Callable, Optional[Callable]] = (
+                        segmenter_fn, embedding_fn_las, embedding_fn_gas
+                    ),
+                ) -> Dict[str, Any]:
+                    return compute_vcs_score(
+                        reference_text, generated_text, *functions,
+                        chunk_size=chunk_size,
+                        context_cutoff_value=context_cutoff_value,
+                        context_window_control=context_window_control,
+                        lct=lct,
+                        return_all_metrics=return_all_metrics,
+                        return_internals=return_internals,
+                        similarity_top_k=similarity_top_k,
+                        return_timings=return_timings,
+                        return_memory=return_memory,
+                        memory_sample_rss=memory_sample_rss,
+                        result_cache=result_cache,
+                        normalize=normalize,
+                        dtype=dtype,
+                    )
+
+                start = time.perf_counter()
+                if instrument is None:
+                    scores = score()
+                else:
+                    with instrument.stage(
+                        "corpus_pair",
+                        reference_chars=len(reference_text), generated_chars=len(generated_text)
+                    ):
+                        scores = score()
+                seconds = time.perf_counter() - start + prefetch_seconds.get(_id_key(pair_id), 0.0)
+
+                if slow_pair_seconds is not None and seconds > slow_pair_seconds:
+                    scores["slow_pair"] = _capture_slow_pair(
+                        pair_id, reference_text, generated_text, seconds, config,
+                        lambda: score(return_timings=True, functions=unbatched), slow_pair_dir
+                    )
+
+                if memory_budget is not None:
+                    scores["memory"]["over_budget"] = (
+                        scores["memory"]["total"]["peak_bytes"] > memory_budget
+                    )
+                result = {"id": pair_id, **scores}
+                if manifest is not None:
+                    manifest.record(key, reference_sha256, generated_sha256, result)
+                if checkpoint is not None:
+                    checkpoint.add(result)
+                if tracker is not None:
+                    tracker.pair_done(queue_depths)
+                yield result
+        completed = True
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+        if manifest is not None:
+            manifest.close(completed)
+
+    if tracker is not None:
+        tracker.finish(queue_depths)
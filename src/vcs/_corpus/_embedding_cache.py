@@ -0,0 +1,132 @@
+import glob
+import io
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import torch
+
+from .._instrumentation import _record_cache_lookup
+from .._utils import _atomic_write_bytes, _text_sha256
+
+# Embeddings kept in memory per cache beyond those not yet flushed to a shard.
+_MAX_RESIDENT_BYTES = 512 * 2**20
+
+
+class _EmbeddingCache:
+    """Text -> embedding cache, optionally persisted as ``.npz`` shards.
+
+    Entries are keyed by the SHA-256 of the text. ``flush`` writes the
+    entries added since the previous flush to a new shard in ``directory``
+    (atomically, so a shard is either complete or absent); on start-up the
+    keys of every shard for ``name`` are indexed. Several processes can share
+    a directory because each writes only its own, uniquely named shards.
+
+    Memory is bounded: flushed entries are kept in a least recently used
+    table of at most ``max_bytes``. An entry evicted from it is read back
+    from its shard (with the rest of that shard) when it is needed again;
+    without a directory it is simply embedded again. Only entries added since
+    the last flush are always resident.
+    """
+
+    def __init__(self, name: str, directory: Optional[str] = None, max_bytes: int = _MAX_RESIDENT_BYTES):
+        self.name = name
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._resident_bytes = 0
+        self._new: Dict[str, np.ndarray] = {}
+        # Shard path of every key on disk.
+        self._shard_of: Dict[str, str] = {}
+        self._device: Optional[torch.device] = None
+        self._shard_prefix = f"embeddings-{name}-{uuid.uuid4().hex[:12]}"
+        self._shards_written = 0
+        self._last_flush = time.monotonic()
+        if directory is not None:
+            for path in sorted(glob.glob(os.path.join(directory, f"embeddings-{name}-*.npz"))):
+                with np.load(path, allow_pickle=False) as shard:
+                    for key in shard["keys"]:
+                        self._shard_of[str(key)] = path
+
+    def __len__(self) -> int:
+        return len(self._shard_of.keys() | self._entries.keys() | self._new.keys())
+
+    def _keep(self, key: str, vector: np.ndarray) -> None:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+        self._entries[key] = vector
+        self._resident_bytes += vector.nbytes
+        while self._resident_bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._resident_bytes -= evicted.nbytes
+
+    def _load_shard(self, path: str, wanted: str) -> Optional[np.ndarray]:
+        # Keeps the whole shard, as neighbouring texts tend to be needed together.
+        found = None
+        with np.load(path, allow_pickle=False) as shard:
+            for key, vector in zip(shard["keys"], shard["vectors"]):
+                key = str(key)
+                self._keep(key, vector)
+                if key == wanted:
+                    found = vector
+        return found
+
+    def _lookup(self, key: str) -> Optional[np.ndarray]:
+        vector = self._new.get(key)
+        if vector is None and key in self._entries:
+            self._entries.move_to_end(key)
+            vector = self._entries[key]
+        if vector is None and key in self._shard_of:
+            vector = self._load_shard(self._shard_of[key], key)
+        return vector
+
+    def wrap(self, embedding_fn: Callable[[List[str]], torch.Tensor]) -> Callable[[List[str]], torch.Tensor]:
+        def cached_embedding_fn(texts: List[str]) -> torch.Tensor:
+            keys = [_text_sha256(text) for text in texts]
+            # Held here, as a later lookup or insert may evict them from the table.
+            vectors = [self._lookup(key) for key in keys]
+            missing = [i for i, vector in enumerate(vectors) if vector is None]
+            _record_cache_lookup(f"embeddings_{self.name}", True, len(keys) - len(missing))
+            _record_cache_lookup(f"embeddings_{self.name}", False, len(missing))
+            if missing:
+                fresh = torch.as_tensor(embedding_fn([texts[i] for i in missing]))
+                self._device = fresh.device
+                rows = fresh.detach().cpu().numpy()
+                for i, row in zip(missing, rows):
+                    vectors[i] = row
+                    if self.directory is not None:
+                        self._new[keys[i]] = row
+                    else:
+                        self._keep(keys[i], row)
+            if not keys:
+                return embedding_fn(texts)
+            stacked = torch.from_numpy(np.stack(vectors))
+            return stacked.to(self._device) if self._device is not None else stacked
+        return cached_embedding_fn
+
+    def maybe_flush(self, min_entries: int = 1024, max_age: float = 60.0) -> None:
+        """Flush once enough new entries piled up or the last flush is old enough."""
+        if len(self._new) >= min_entries or time.monotonic() - self._last_flush >= max_age:
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if self.directory is None or not self._new:
+            return
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            keys=np.array(list(self._new)),
+            vectors=np.stack(list(self._new.values())),
+        )
+        self._shards_written += 1
+        path = os.path.join(self.directory, f"{self._shard_prefix}-{self._shards_written:06d}.npz")
+        _atomic_write_bytes(path, buffer.getvalue())
+        for key, vector in self._new.items():
+            self._shard_of[key] = path
+            self._keep(key, vector)
+        self._new = {}
@@ -0,0 +1,54 @@
+import csv
+import io
+import json
+import sys
+from typing import Any, Dict, Iterator, Optional
+
+
+def _open_text(path: str):
+    if path == "-":
+        return sys.stdin
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def _is_csv(path: str) -> bool:
+    return path.lower().endswith((".csv", ".tsv"))
+
+
+def _csv_dialect(path: str) -> str:
+    return "excel-tab" if path.lower().endswith(".tsv") else "excel"
+
+
+def _read_pairs(path: str) -> Iterator[Dict[str, Any]]:
+    """Stream corpus items from a JSONL or CSV/TSV file (``'-'`` reads JSONL from stdin).
+
+    JSONL lines and CSV rows are returned as dictionaries and accepted by
+    ``compute_vcs_corpus`` as they are (``id``, ``reference``, ``generated``
+    columns, or their aliases). Blank JSONL lines are skipped.
+    """
+    fh = _open_text(path)
+    try:
+        if _is_csv(path):
+            yield from csv.DictReader(fh, dialect=_csv_dialect(path))
+        else:
+            for line_number, line in enumerate(fh, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise ValueError(f"{path}:{line_number}: invalid JSON ({exc})") from None
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+
+
+def _count_pairs(path: str) -> Optional[int]:
+    """Number of items in a corpus file, or None for stdin."""
+    if path == "-":
+        return None
+    with open(path, "rb") as fh:
+        if _is_csv(path):
+            text = io.TextIOWrapper(fh, encoding="utf-8", newline="")
+            return max(sum(1 for _ in csv.reader(text, dialect=_csv_dialect(path))) - 1, 0)
+        return sum(1 for line in fh if line.strip())
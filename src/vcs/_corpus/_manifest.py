@@ -0,0 +1,120 @@
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .._utils import _config_sha256, _fsync_directory, _json_default, _pair_key, _text_sha256
+
+# Diagnostics of the run that scored a pair; they describe that run, not the
+# result, so they are neither stored nor handed back on reuse.
+_PER_RUN_FIELDS = ("timings", "memory", "slow_pair")
+
+
+def _without_per_run_fields(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in result.items() if key not in _PER_RUN_FIELDS}
+
+
+class _Manifest:
+    """Content-addressed record of earlier results for incremental re-evaluation.
+
+    Each line of the manifest (JSONL) stores one result under a key derived
+    from the SHA-256 of the reference text, of the generated text, of the
+    scoring config and the segmenter/embedder fingerprint. A new run looks up
+    every pair's key, reuses the stored result when it is present and scores
+    only the rest. Per-run diagnostics (``timings``, ``memory``,
+    ``slow_pair``) are not stored, so reused results never carry those of
+    an earlier run.
+
+    Only byte offsets of the previous manifest are held in memory. The new
+    manifest is written next to it and moved into place atomically by
+    :meth:`close`: after a complete run it holds exactly the pairs of that
+    run; after an interrupted one, it also keeps the previous entries that
+    were not reached, so no work is lost either way.
+    """
+
+    def __init__(self, path: str, config: Dict[str, Any], fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.config_sha256 = _config_sha256(config)
+        self.reused = 0
+        self.scored = 0
+        self._previous: Dict[str, int] = {}
+        self._written: Set[str] = set()
+        self._previous_fh = None
+        if os.path.exists(path):
+            self._previous_fh = open(path, "rb")
+            offset = 0
+            for line in self._previous_fh:
+                try:
+                    self._previous[json.loads(line)["key"]] = offset
+                except (ValueError, KeyError):
+                    pass
+                offset += len(line)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=".tmp-", suffix=os.path.basename(path)
+        )
+        self._fh = os.fdopen(fd, "wb")
+
+    def key(self, reference_text: str, generated_text: str) -> Tuple[str, str, str]:
+        """``(key, reference_sha256, generated_sha256)`` for a pair."""
+        reference_sha256 = _text_sha256(reference_text)
+        generated_sha256 = _text_sha256(generated_text)
+        key = _pair_key(reference_sha256, generated_sha256, self.config_sha256, self.fingerprint)
+        return key, reference_sha256, generated_sha256
+
+    def _read_previous(self, key: str) -> Dict[str, Any]:
+        self._previous_fh.seek(self._previous[key])
+        return json.loads(self._previous_fh.readline())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._previous
+
+    def lookup(self, key: str, pair_id: Any) -> Optional[Dict[str, Any]]:
+        """The stored result for ``key``, relabelled with ``pair_id``, or None."""
+        if key not in self._previous:
+            return None
+        entry = self._read_previous(key)
+        entry["id"] = pair_id
+        # Manifests written before these fields were dropped may hold them.
+        entry["result"] = _without_per_run_fields(entry["result"])
+        entry["result"]["id"] = pair_id
+        self._write(entry)
+        self.reused += 1
+        return entry["result"]
+
+    def record(self, key: str, reference_sha256: str, generated_sha256: str,
+               result: Dict[str, Any]) -> None:
+        self._write({
+            "key": key,
+            "id": result["id"],
+            "reference_sha256": reference_sha256,
+            "generated_sha256": generated_sha256,
+            "config_sha256": self.config_sha256,
+            "fingerprint": self.fingerprint,
+            "result": _without_per_run_fields(result),
+        })
+        self.scored += 1
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        if entry["key"] in self._written:
+            return
+        self._written.add(entry["key"])
+        self._fh.write((json.dumps(entry, default=_json_default) + "\n").encode("utf-8"))
+
+    def close(self, completed: bool) -> None:
+        if self._fh.closed:
+            return
+        if not completed:
+            for key in self._previous:
+                if key not in self._written:
+                    self._write(self._read_previous(key))
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._fh.close()
+        if self._previous_fh is not None:
+            self._previous_fh.close()
+        os.replace(self._tmp_path, self.path)
+        _fsync_directory(os.path.dirname(os.path.abspath(self.path)))
@@ -0,0 +1,44 @@
+from typing import Any, Mapping, Tuple
+
+_REFERENCE_KEYS = ("reference", "reference_text", "ref")
+_GENERATED_KEYS = ("generated", "generated_text", "gen")
+
+
+def _first_present(record: Mapping[str, Any], keys: Tuple[str, ...], index: int) -> str:
+    for key in keys:
+        if key in record:
+            return record[key]
+    raise KeyError(f"Pair {index} has none of the keys {keys}")
+
+
+def _normalize_pair(item: Any, index: int) -> Tuple[Any, str, str]:
+    """Return ``(pair_id, reference_text, generated_text)`` for one corpus item.
+
+    Accepts mappings with ``reference``/``generated`` (or ``reference_text``/
+    ``generated_text``) and an optional ``id``, ``(reference, generated)``
+    tuples and ``(id, reference, generated)`` tuples. Items without an id get
+    their position in the corpus.
+    """
+    if isinstance(item, Mapping):
+        return (
+            item.get("id", index),
+            _first_present(item, _REFERENCE_KEYS, index),
+            _first_present(item, _GENERATED_KEYS, index),
+        )
+    if len(item) == 2:
+        return index, item[0], item[1]
+    if len(item) == 3:
+        return item[0], item[1], item[2]
+    raise ValueError(
+        f"Pair {index} must be a mapping, (reference, generated) or "
+        "(id, reference, generated)"
+    )
+
+
+def _pair_id(item: Any, index: int) -> Any:
+    """The id :func:`_normalize_pair` would return, without validating the item."""
+    if isinstance(item, Mapping):
+        return item.get("id", index)
+    if isinstance(item, (tuple, list)) and len(item) == 3:
+        return item[0]
+    return index
@@ -0,0 +1,326 @@
+"""Process-pool corpus scoring for the ``vcs score`` command.
+
+Worker processes cannot receive arbitrary callables, so they load the
+segmenter and embedders themselves from ``module:function`` specs, once, in
+the pool initializer. Pairs travel in batches to amortize inter-process
+overhead, and at most ``2 * workers`` batches are outstanding so reading a
+large corpus never gets ahead of scoring.
+"""
+
+import multiprocessing
+import multiprocessing.util
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ._corpus import compute_vcs_corpus
+from .._config import (
+    DEFAULT_CONTEXT_CUTOFF_VALUE,
+    DEFAULT_CONTEXT_WINDOW_CONTROL,
+    DEFAULT_LCT,
+    DEFAULT_CHUNK_SIZE,
+)
+from .._utils import _pipeline_fingerprint
+from ._checkpoint import _Checkpoint, _id_key
+from ._corpus import _checkpoint_config, _embedding_config
+from ._batch_embeddings import _BatchPrefetcher
+from ._embedding_cache import _EmbeddingCache
+from ._manifest import _Manifest
+from ._pairs import _normalize_pair, _pair_id
+from ._progress import ProgressCallback, _ProgressTracker
+
+_worker_models: Optional[Tuple[Any, Any, Any]] = None
+_worker_raw_models: Optional[Tuple[Any, Any, Any]] = None
+_worker_caches: List[_EmbeddingCache] = []
+_worker_prefetcher: Optional[_BatchPrefetcher] = None
+_worker_embedded_items = 0
+
+
+def _count_items(embedding_fn):
+    def counting_embedding_fn(texts):
+        global _worker_embedded_items
+        _worker_embedded_items += len(texts)
+        return embedding_fn(texts)
+    return counting_embedding_fn
+
+
+def _score_config(options: Dict[str, Any]) -> Dict[str, Any]:
+    # The config compute_vcs_score builds from the same options.
+    return {
+        "chunk_size": options.get("chunk_size", DEFAULT_CHUNK_SIZE),
+        "context_cutoff_value": options.get("context_cutoff_value", DEFAULT_CONTEXT_CUTOFF_VALUE),
+        "context_window_control": options.get("context_window_control", DEFAULT_CONTEXT_WINDOW_CONTROL),
+        "lct": options.get("lct", DEFAULT_LCT),
+        **_embedding_config(options.get("normalize", False), options.get("dtype")),
+    }
+
+
+def _load_models(segmenter: str, embedder: str, gas_embedder: Optional[str]) -> Tuple[Any, Any, Any]:
+    from .._utils import _load_object
+
+    return (
+        _load_object(segmenter),
+        _load_object(embedder),
+        _load_object(gas_embedder) if gas_embedder else None,
+    )
+
+
+def _flush_worker_caches() -> None:
+    for cache in _worker_caches:
+        cache.flush()
+
+
+def _init_worker(
+    segmenter: str,
+    embedder: str,
+    gas_embedder: Optional[str],
+    torch_threads: Optional[int],
+    cache_embeddings: bool = False,
+    cache_dir: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> None:
+    global _worker_models, _worker_raw_models, _worker_caches, _worker_prefetcher
+    if torch_threads:
+        import torch
+        torch.set_num_threads(torch_threads)
+    segmenter_fn, embedding_fn_las, embedding_fn_gas = _load_models(segmenter, embedder, gas_embedder)
+    _worker_raw_models = (segmenter_fn, embedding_fn_las, embedding_fn_gas)
+    embedding_fn_las = _count_items(embedding_fn_las)
+    if embedding_fn_gas is not None:
+        embedding_fn_gas = _count_items(embedding_fn_gas)
+    _worker_caches = []
+    if cache_embeddings:
+        _worker_caches.append(_EmbeddingCache("las", cache_dir))
+        embedding_fn_las = _worker_caches[-1].wrap(embedding_fn_las)
+        if embedding_fn_gas is not None:
+            _worker_caches.append(_EmbeddingCache("gas", cache_dir))
+            embedding_fn_gas = _worker_caches[-1].wrap(embedding_fn_gas)
+        # Pool workers skip atexit handlers but run multiprocessing finalizers.
+        multiprocessing.util.Finalize(None, _flush_worker_caches, exitpriority=10)
+    _worker_prefetcher = _BatchPrefetcher(segmenter_fn, embedding_fn_las, embedding_fn_gas, chunk_size)
+    _worker_models = (
+        _worker_prefetcher.segmenter_fn,
+        _worker_prefetcher.embedding_fn_las,
+        _worker_prefetcher.embedding_fn_gas,
+    )
+
+
+def _score_batch(
+    batch: List[Tuple[int, Any]], options: Dict[str, Any]
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Score ``(index, item)`` pairs in a worker.
+
+    A malformed item or a pair that fails to score yields an ``'error'``
+    record instead of aborting the batch.
+    """
+    global _worker_embedded_items
+    _worker_embedded_items = 0
+    segmenter_fn, embedding_fn_las, embedding_fn_gas = _worker_models
+    pairs: List[Any] = []
+    for index, item in batch:
+        try:
+            pairs.append(_normalize_pair(item, index))
+        except Exception as exc:
+            pairs.append(exc)
+    # Cached results need no embeddings, so nothing is fetched ahead for them;
+    # compute_vcs_score only consults the cache for results without these.
+    uses_result_cache = not (
+        options.get("return_internals") or options.get("return_timings")
+        or options.get("return_memory") or options.get("memory_budget") is not None
+    )
+    result_cache = options.get("result_cache") if uses_result_cache else None
+    if options.get("slow_pair_seconds") is None:
+        _worker_prefetcher.prefetch(
+            [pair for pair in pairs if not isinstance(pair, Exception)], result_cache, _score_config(options)
+        )
+    else:
+        # Pairs are timed and profiled one at a time, so each must do its own
+        # segmentation and embedding for slow-pair captures to include them.
+        _worker_prefetcher.prefetch([])
+    results = []
+    for (index, item), pair in zip(batch, pairs):
+        try:
+            if isinstance(pair, Exception):
+                raise pair
+            results.extend(compute_vcs_corpus(
+                [pair], segmenter_fn, embedding_fn_las, embedding_fn_gas, batch_size=1, **options
+            ))
+        except Exception as exc:
+            message = exc.args[0] if isinstance(exc, KeyError) and exc.args else exc
+            results.append({
+                "id": _pair_id(item, index),
+                "error": f"{type(exc).__name__}: {message}",
+                "traceback": traceback.format_exc(),
+            })
+    # Losing unsaved cache entries only costs recomputation, so workers save
+    # in larger shards rather than after every batch.
+    for cache in _worker_caches:
+        cache.maybe_flush()
+    return results, _worker_embedded_items
+
+
+class _InlineExecutor:
+    """Runs submitted calls immediately in this process (``workers <= 1``)."""
+
+    def __init__(self, init_args: Tuple[Any, ...]):
+        _init_worker(*init_args)
+
+    def submit(self, fn, *args: Any) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+    def __enter__(self) -> "_InlineExecutor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _flush_worker_caches()
+
+
+def _worker_fingerprint() -> str:
+    return _pipeline_fingerprint(*_worker_raw_models)
+
+
+def _score_corpus_parallel(
+    pairs: Iterable[Any],
+    segmenter: str,
+    embedder: str,
+    gas_embedder: Optional[str] = None,
+    workers: int = 2,
+    batch_size: int = 8,
+    torch_threads: Optional[int] = None,
+    start_method: str = "spawn",
+    progress: Optional[ProgressCallback] = None,
+    progress_interval: float = 1.0,
+    total: Optional[int] = None,
+    checkpoint_dir: Optional[str] = None,
+    checkpoint_every: int = 100,
+    checkpoint_seconds: float = 60.0,
+    cache_embeddings: bool = False,
+    manifest_path: Optional[str] = None,
+    fingerprint: Optional[str] = None,
+    log: Optional[Callable[[str], None]] = None,
+    **options: Any,
+) -> Iterator[Dict[str, Any]]:
+    """Yield ``compute_vcs_corpus`` results from ``workers`` processes in completion order.
+
+    With ``workers <= 1`` batches are scored in this process, in input order.
+    ``options`` are passed on to :func:`compute_vcs_corpus`. Checkpoints and
+    the manifest work as in :func:`compute_vcs_corpus` but are kept here, in
+    the parent, which also yields reused results without sending them to a
+    worker; each worker keeps its own embedding cache. Error records are
+    yielded but neither checkpointed nor recorded, so later runs retry them.
+    """
+    config = _score_config(options)
+    run_config = _checkpoint_config(
+        config,
+        options.get("return_all_metrics", False),
+        options.get("return_internals", False),
+        options.get("similarity_top_k"),
+    )
+    checkpoint = None
+    if checkpoint_dir is not None:
+        checkpoint = _Checkpoint(checkpoint_dir, run_config, checkpoint_every, checkpoint_seconds)
+        if total is not None:
+            total = max(total - len(checkpoint.completed), 0)
+    tracker = _ProgressTracker(progress, total, progress_interval) if progress else None
+    init_args = (
+        segmenter, embedder, gas_embedder, torch_threads, cache_embeddings, checkpoint_dir,
+        config["chunk_size"],
+    )
+    outstanding: Set[Future] = set()
+    sizes: Dict[Future, int] = {}
+    # Manifest keys of pairs sent to workers, by pair id.
+    manifest_keys: Dict[str, Tuple[str, str, str]] = {}
+    manifest = None
+
+    def queue_depths() -> Dict[str, int]:
+        scoring = sum(sizes.values())
+        depths = {"scoring": scoring}
+        if total is not None:
+            depths["pending"] = max(total - tracker.pairs_done - scoring, 0)
+        return depths
+
+    def emit(results: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for result in results:
+            if "error" not in result:
+                if manifest is not None and _id_key(result["id"]) in manifest_keys:
+                    manifest.record(*manifest_keys.pop(_id_key(result["id"])), result)
+                if checkpoint is not None:
+                    checkpoint.add(result)
+            if tracker is not None:
+                tracker.pair_done(queue_depths)
+            yield result
+
+    def collect(max_outstanding: int) -> Iterator[Dict[str, Any]]:
+        while len(outstanding) > max_outstanding:
+            done, _ = wait(outstanding, return_when=FIRST_COMPLETED)
+            for future in done:
+                outstanding.discard(future)
+                sizes.pop(future)
+                results, embedded_items = future.result()
+                if tracker is not None:
+                    tracker.embedding_items += embedded_items
+                yield from emit(results)
+
+    if workers <= 1:
+        executor = _InlineExecutor(init_args)
+        max_outstanding = 0
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker, initargs=init_args,
+        )
+        max_outstanding = 2 * workers - 1
+
+    completed = False
+    try:
+        with executor:
+            if manifest_path is not None:
+                manifest = _Manifest(
+                    manifest_path, run_config,
+                    fingerprint or executor.submit(_worker_fingerprint).result(),
+                )
+            batch: List[Tuple[int, Any]] = []
+            for index, item in enumerate(pairs):
+                pair_id = _pair_id(item, index)
+                if checkpoint is not None and checkpoint.is_done(pair_id):
+                    continue
+                if manifest is not None:
+                    try:
+                        _, reference_text, generated_text = _normalize_pair(item, index)
+                        keys = manifest.key(reference_text, generated_text)
+                    except Exception:
+                        keys = None  # malformed; the worker reports it
+                    if keys is not None:
+                        reused = manifest.lookup(keys[0], pair_id)
+                        if reused is not None:
+                            yield from emit([reused])
+                            continue
+                        manifest_keys[_id_key(pair_id)] = keys
+                batch.append((index, item))
+                if len(batch) == batch_size:
+                    future = executor.submit(_score_batch, batch, options)
+                    outstanding.add(future)
+                    sizes[future] = len(batch)
+                    batch = []
+                    yield from collect(max_outstanding)
+            if batch:
+                future = executor.submit(_score_batch, batch, options)
+                outstanding.add(future)
+                sizes[future] = len(batch)
+            yield from collect(0)
+        completed = True
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+        if manifest is not None:
+            manifest.close(completed)
+            if log is not None:
+                log(f"manifest: reused {manifest.reused} result(s), scored {manifest.scored}")
+
+    if tracker is not None:
+        tracker.finish(queue_depths)
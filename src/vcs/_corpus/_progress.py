@@ -0,0 +1,167 @@
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, IO, List, NamedTuple, Optional
+
+
+class ProgressEvent(NamedTuple):
+    """Snapshot of a running corpus evaluation.
+
+    Attributes
+    ----------
+    pairs_done : int
+        Pairs scored so far.
+    pairs_total : int or None
+        Corpus size, if known.
+    elapsed_seconds : float
+        Wall time since the run started.
+    pairs_per_second : float
+        Average throughput since the run started.
+    embedding_items_per_second : float
+        Texts sent to the embedding functions per second (GAS documents and
+        LAS chunks).
+    eta_seconds : float or None
+        Estimated time to completion at the current throughput, if the corpus
+        size is known.
+    queue_depths : dict
+        Items waiting in or passing through each stage of the runner, e.g.
+        ``{'pending': 9000, 'scoring': 8, 'writing': 2}``. Sequential runs
+        report ``scoring`` as 0 between pairs.
+    finished : bool
+        True for the last event of a run.
+    """
+    pairs_done: int
+    pairs_total: Optional[int]
+    elapsed_seconds: float
+    pairs_per_second: float
+    embedding_items_per_second: float
+    eta_seconds: Optional[float]
+    queue_depths: Dict[str, int]
+    finished: bool = False
+
+
+class ProgressCallback:
+    """Base class for progress reporting during corpus scoring.
+
+    Override :meth:`on_progress`; it is called at most every
+    ``progress_interval`` seconds and once more with ``finished=True`` at the
+    end of the run.
+    """
+
+    def on_progress(self, event: ProgressEvent) -> None:
+        pass
+
+
+class ConsoleProgress(ProgressCallback):
+    """Single-line, self-overwriting progress display on a terminal stream.
+
+    Parameters
+    ----------
+    stream : file-like, optional
+        Defaults to ``sys.stderr``.
+    """
+
+    def __init__(self, stream: Optional[IO[str]] = None):
+        self.stream = stream
+        self._width = 0
+
+    def on_progress(self, event: ProgressEvent) -> None:
+        stream = self.stream or sys.stderr
+        total = f"/{event.pairs_total}" if event.pairs_total is not None else ""
+        eta = (
+            f" | ETA {_format_duration(event.eta_seconds)}"
+            if event.eta_seconds is not None and not event.finished else ""
+        )
+        queues = " ".join(f"{k}={v}" for k, v in event.queue_depths.items())
+        line = (
+            f"{event.pairs_done}{total} pairs | {event.pairs_per_second:.2f} pairs/s | "
+            f"{event.embedding_items_per_second:.1f} emb/s{eta} | {queues}"
+        )
+        # Pad over the remainder of a longer previous line.
+        padding = " " * max(self._width - len(line), 0)
+        self._width = len(line)
+        stream.write("\r" + line + padding + ("\n" if event.finished else ""))
+        stream.flush()
+
+
+class JsonLinesProgress(ProgressCallback):
+    """Write every progress event as one JSON object per line.
+
+    Parameters
+    ----------
+    target : str or file-like
+        Path (opened for appending) or an open text stream.
+
+    Examples
+    --------
+    >>> results = compute_vcs_corpus(pairs, segmenter, embedder,
+    ...                              progress=JsonLinesProgress("progress.jsonl"))
+    """
+
+    def __init__(self, target: Any):
+        if isinstance(target, str):
+            self._stream = open(target, "a", encoding="utf-8")
+            self._owns_stream = True
+        else:
+            self._stream = target
+            self._owns_stream = False
+
+    def on_progress(self, event: ProgressEvent) -> None:
+        record = {"timestamp": time.time(), **event._asdict()}
+        self._stream.write(json.dumps(record) + "\n")
+        self._stream.flush()
+        if event.finished and self._owns_stream:
+            self._stream.close()
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours:d}:{minutes:02d}:{secs:02d}" if hours else f"{minutes:d}:{secs:02d}"
+
+
+class _ProgressTracker:
+    """Counts work for a run and emits throttled :class:`ProgressEvent` objects."""
+
+    def __init__(self, callback: ProgressCallback, total: Optional[int], interval: float):
+        self.callback = callback
+        self.total = total
+        self.interval = interval
+        self.pairs_done = 0
+        self.embedding_items = 0
+        self._start = time.perf_counter()
+        self._last_emit = float("-inf")
+
+    def wrap_embedding(self, embedding_fn: Callable) -> Callable:
+        def counting_embedding_fn(texts: List[str]):
+            self.embedding_items += len(texts)
+            return embedding_fn(texts)
+        return counting_embedding_fn
+
+    def pair_done(self, queue_depths: Callable[[], Dict[str, int]]) -> None:
+        self.pairs_done += 1
+        now = time.perf_counter()
+        if now - self._last_emit >= self.interval:
+            self._emit(now, queue_depths(), finished=False)
+
+    def finish(self, queue_depths: Callable[[], Dict[str, int]]) -> None:
+        self._emit(time.perf_counter(), queue_depths(), finished=True)
+
+    def _emit(self, now: float, queue_depths: Dict[str, int], finished: bool) -> None:
+        self._last_emit = now
+        elapsed = now - self._start
+        rate = self.pairs_done / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if self.total is not None and rate > 0:
+            eta = max(self.total - self.pairs_done, 0) / rate
+        self.callback.on_progress(ProgressEvent(
+            pairs_done=self.pairs_done,
+            pairs_total=self.total,
+            elapsed_seconds=elapsed,
+            pairs_per_second=rate,
+            embedding_items_per_second=self.embedding_items / elapsed if elapsed > 0 else 0.0,
+            eta_seconds=eta,
+            queue_depths=dict(queue_depths),
+            finished=finished,
+        ))
@@ -0,0 +1,62 @@
+import cProfile
+import json
+import os
+import platform
+import re
+from typing import Any, Callable, Dict
+
+from .._utils import _text_sha256
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def _capture_slow_pair(
+    pair_id: Any,
+    reference_text: str,
+    generated_text: str,
+    seconds: float,
+    config: Dict[str, Any],
+    rerun: Callable[[], Dict[str, Any]],
+    output_dir: str,
+) -> Dict[str, Any]:
+    """Re-run a slow pair under cProfile and save the profile with a JSON sidecar.
+
+    ``rerun`` must score the pair again with ``return_timings=True``. The
+    sidecar holds text hashes rather than the texts, plus sizes, config,
+    the original latency and the per-stage timings of the profiled run, which
+    is enough to report the case and to match it against the source data.
+    """
+    from .. import __version__
+
+    reference_hash = _text_sha256(reference_text)
+    generated_hash = _text_sha256(generated_text)
+    safe_id = _UNSAFE_FILENAME_CHARS.sub("_", str(pair_id))[:80]
+    stem = os.path.join(output_dir, f"{safe_id}-{reference_hash[:8]}{generated_hash[:8]}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    profiler = cProfile.Profile()
+    profiled = profiler.runcall(rerun)
+    profiler.dump_stats(stem + ".prof")
+
+    timings = profiled["timings"]
+    sidecar = {
+        "id": pair_id,
+        "seconds": seconds,
+        "profiled_seconds": timings["total"]["wall"],
+        "reference_sha256": reference_hash,
+        "generated_sha256": generated_hash,
+        "reference_chars": len(reference_text),
+        "generated_chars": len(generated_text),
+        "sizes": timings["sizes"],
+        "config": config,
+        "stages": [
+            {"stage": s["stage"], "wall": s["wall"], "cpu": s["cpu"]}
+            for s in timings["stages"]
+        ],
+        "vcs": __version__,
+        "python": platform.python_version(),
+    }
+    with open(stem + ".json", "w", encoding="utf-8") as fh:
+        json.dump(sidecar, fh, indent=2, default=str)
+
+    return {"seconds": seconds, "profile": stem + ".prof", "details": stem + ".json"}
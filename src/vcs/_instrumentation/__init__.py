@@ -0,0 +1,41 @@
+"""
+Opt-in instrumentation of the scoring pipeline: per-stage timings, memory
+profiles, user-registered stage hooks and Prometheus metrics.
+"""
+
+from ._instrument import _Instrument, _NullInstrument, _NULL_INSTRUMENT
+from ._memory import _MemoryTracker, summarize_memory_profiles
+from ._hooks import (
+    StageHook,
+    OpenTelemetryStageHook,
+    register_stage_hook,
+    unregister_stage_hook,
+    stage_hooks,
+    _active_hooks,
+)
+from ._metrics import (
+    MetricsRegistry,
+    enable_metrics,
+    disable_metrics,
+    start_metrics_server,
+    _record_cache_lookup,
+)
+
+__all__ = [
+    "StageHook",
+    "OpenTelemetryStageHook",
+    "register_stage_hook",
+    "unregister_stage_hook",
+    "stage_hooks",
+    "summarize_memory_profiles",
+    "MetricsRegistry",
+    "enable_metrics",
+    "disable_metrics",
+    "start_metrics_server",
+    "_Instrument",
+    "_NullInstrument",
+    "_NULL_INSTRUMENT",
+    "_MemoryTracker",
+    "_active_hooks",
+    "_record_cache_lookup",
+]
@@ -0,0 +1,159 @@
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+_hooks: Tuple["StageHook", ...] = ()
+_hooks_lock = threading.Lock()
+
+
+class StageHook:
+    """Base class for callbacks around every VCS pipeline stage.
+
+    ``compute_vcs_score`` (and the batch and corpus runners built on it) call
+    :meth:`on_stage_start` when a stage begins and :meth:`on_stage_end` when it
+    finishes, in properly nested order. Override either or both.
+
+    The ``info`` dictionary is shared between the two calls of one stage and
+    contains:
+
+    * ``'sizes'`` : dict - input sizes known when the stage starts, such as
+      ``reference_chunks``, ``generated_chunks`` or embedding ``items``
+    * ``'config'`` : dict - ``chunk_size``, ``context_cutoff_value``,
+      ``context_window_control`` and ``lct`` of the current call
+    * ``'wall'`` : float - stage duration in seconds (``on_stage_end`` only)
+
+    Stage names are the same as in ``compute_vcs_score(..., return_timings=True)``,
+    plus ``'compute_vcs_score'`` around the whole call.
+
+    Examples
+    --------
+    >>> class PrintHook(StageHook):
+    ...     def on_stage_end(self, stage, info, error):
+    ...         print(f"{stage}: {info['wall'] * 1e3:.2f} ms")
+    >>> with stage_hooks(PrintHook()):
+    ...     compute_vcs_score(ref_text, gen_text, segmenter, embedder)
+    """
+
+    def on_stage_start(self, stage: str, info: Dict[str, Any]) -> None:
+        pass
+
+    def on_stage_end(
+        self, stage: str, info: Dict[str, Any], error: Optional[BaseException]
+    ) -> None:
+        pass
+
+
+def register_stage_hook(hook: StageHook) -> None:
+    """Register ``hook`` for every subsequent scoring call in this process.
+
+    Parameters
+    ----------
+    hook : StageHook
+        Object implementing ``on_stage_start`` and ``on_stage_end``.
+
+    See Also
+    --------
+    stage_hooks : Register hooks for the duration of a ``with`` block
+    unregister_stage_hook : Remove a registered hook
+    """
+    global _hooks
+    with _hooks_lock:
+        _hooks = _hooks + (hook,)
+
+
+def unregister_stage_hook(hook: StageHook) -> None:
+    """Remove a hook added with :func:`register_stage_hook`.
+
+    Raises
+    ------
+    ValueError
+        If ``hook`` is not registered.
+    """
+    global _hooks
+    with _hooks_lock:
+        if hook not in _hooks:
+            raise ValueError("Stage hook is not registered.")
+        index = _hooks.index(hook)
+        _hooks = _hooks[:index] + _hooks[index + 1:]
+
+
+@contextmanager
+def stage_hooks(*hooks: StageHook) -> Iterator[None]:
+    """Register ``hooks`` for the duration of a ``with`` block.
+
+    Examples
+    --------
+    >>> with stage_hooks(OpenTelemetryStageHook(tracer)):
+    ...     result = compute_vcs_score(ref_text, gen_text, segmenter, embedder)
+    """
+    for hook in hooks:
+        register_stage_hook(hook)
+    try:
+        yield
+    finally:
+        for hook in hooks:
+            unregister_stage_hook(hook)
+
+
+def _active_hooks() -> Tuple[StageHook, ...]:
+    return _hooks
+
+
+def _flatten_attributes(prefix: str, values: Dict[str, Any], out: Dict[str, Any]) -> None:
+    for key, value in values.items():
+        if isinstance(value, (bool, int, float, str)):
+            out[f"{prefix}.{key}"] = value
+        elif isinstance(value, (list, tuple)):
+            out[f"{prefix}.{key}"] = [int(v) if isinstance(v, bool) else v for v in value]
+
+
+class OpenTelemetryStageHook(StageHook):
+    """Report every pipeline stage as a span of an OpenTelemetry-style tracer.
+
+    Works with any tracer exposing ``start_as_current_span(name, attributes=...)``
+    (the OpenTelemetry API), without importing ``opentelemetry`` itself. Stage
+    spans are nested under whatever span is current when scoring starts, so VCS
+    stages appear inside your request traces.
+
+    Parameters
+    ----------
+    tracer : object
+        For example ``opentelemetry.trace.get_tracer("vcs")``.
+    span_prefix : str, default="vcs."
+        Prefix for span names, e.g. ``vcs.precision_matching``.
+
+    Examples
+    --------
+    >>> from opentelemetry import trace
+    >>> register_stage_hook(OpenTelemetryStageHook(trace.get_tracer("vcs")))
+    """
+
+    def __init__(self, tracer: Any, span_prefix: str = "vcs."):
+        self.tracer = tracer
+        self.span_prefix = span_prefix
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def on_stage_start(self, stage: str, info: Dict[str, Any]) -> None:
+        attributes: Dict[str, Any] = {"vcs.stage": stage}
+        _flatten_attributes("vcs.sizes", info.get("sizes", {}), attributes)
+        _flatten_attributes("vcs.config", info.get("config", {}), attributes)
+        manager = self.tracer.start_as_current_span(
+            self.span_prefix + stage, attributes=attributes
+        )
+        span = manager.__enter__()
+        self._stack().append((manager, span))
+
+    def on_stage_end(
+        self, stage: str, info: Dict[str, Any], error: Optional[BaseException]
+    ) -> None:
+        manager, span = self._stack().pop()
+        if error is None:
+            manager.__exit__(None, None, None)
+        else:
+            manager.__exit__(type(error), error, error.__traceback__)
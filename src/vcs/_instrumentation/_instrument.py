@@ -0,0 +1,117 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ._memory import _MemoryTracker
+
+
+class _Stage:
+    __slots__ = ("_instrument", "_name", "_info", "_record", "_wall_start", "_cpu_start")
+
+    def __init__(self, instrument: "_Instrument", name: str, sizes: Dict[str, Any]):
+        self._instrument = instrument
+        self._name = name
+        self._info = {"sizes": sizes, "config": instrument.config}
+        self._record = None
+        if instrument.records is not None:
+            self._record = {"stage": name}
+            if sizes:
+                self._record["sizes"] = sizes
+            instrument.records.append(self._record)
+
+    def __enter__(self) -> "_Stage":
+        for hook in self._instrument.hooks:
+            hook.on_stage_start(self._name, self._info)
+        if self._instrument.memory is not None:
+            self._instrument.memory.enter(self._name)
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        wall = time.perf_counter() - self._wall_start
+        if self._record is not None:
+            self._record["wall"] = wall
+            self._record["cpu"] = time.process_time() - self._cpu_start
+        if self._instrument.memory is not None:
+            self._instrument.memory.exit()
+        if self._instrument.hooks:
+            self._info["wall"] = wall
+            for hook in reversed(self._instrument.hooks):
+                hook.on_stage_end(self._name, self._info, exc)
+
+
+class _Instrument:
+    """Times pipeline stages, tracks their memory and/or forwards their boundaries
+    to stage hooks.
+
+    ``records`` is None unless timings were requested, ``memory`` is None
+    unless a memory profile was requested, and ``hooks`` is the tuple of hooks
+    that were registered when the call started.
+    """
+
+    __slots__ = ("records", "sizes", "hooks", "config", "memory")
+
+    def __init__(
+        self,
+        record_timings: bool,
+        hooks: Sequence[Any],
+        config: Dict[str, Any],
+        memory: Optional[_MemoryTracker] = None,
+    ):
+        self.records: List[Dict[str, Any]] = [] if record_timings else None
+        self.sizes: Dict[str, Any] = {}
+        self.hooks = tuple(hooks)
+        self.config = config
+        self.memory = memory
+
+    def stage(self, name: str, **sizes: Any) -> _Stage:
+        return _Stage(self, name, sizes)
+
+    def wrap_embedding(self, name: str, embedding_fn: Callable) -> Callable:
+        def instrumented_embedding_fn(texts):
+            with self.stage(name, items=len(texts)):
+                return embedding_fn(texts)
+        return instrumented_embedding_fn
+
+    def note_sizes(self, **sizes: Any) -> None:
+        self.sizes.update(sizes)
+
+    def timings(self) -> Dict[str, Any]:
+        # The outermost stage is entered first, so it is always the first record.
+        total, *stages = self.records
+        return {
+            "stages": stages,
+            "sizes": self.sizes,
+            "total": {"wall": total["wall"], "cpu": total["cpu"]},
+        }
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _NullInstrument:
+    """Stand-in used when nothing observes the pipeline; every call is a no-op."""
+
+    __slots__ = ()
+
+    def stage(self, name: str, **sizes: Any) -> _NullStage:
+        return _NULL_STAGE
+
+    def wrap_embedding(self, name: str, embedding_fn: Callable) -> Callable:
+        return embedding_fn
+
+    def note_sizes(self, **sizes: Any) -> None:
+        return None
+
+
+_NULL_INSTRUMENT = _NullInstrument()
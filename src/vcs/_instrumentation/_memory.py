@@ -0,0 +1,193 @@
+import os
+import threading
+import tracemalloc
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def _current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, or None if unavailable."""
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return int(psutil.Process().memory_info().rss)
+
+
+class _RssSampler(threading.Thread):
+    """Background thread keeping the highest RSS seen since the last ``mark``."""
+
+    def __init__(self, interval: float):
+        super().__init__(name="vcs-rss-sampler", daemon=True)
+        self.interval = interval
+        self.peak = _current_rss() or 0
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            rss = _current_rss()
+            if rss is not None and rss > self.peak:
+                self.peak = rss
+
+    def mark(self, rss: int) -> int:
+        """Return the peak since the previous mark and restart from ``rss``."""
+        peak = max(self.peak, rss)
+        self.peak = rss
+        return peak
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+class _MemoryFrame:
+    __slots__ = ("record", "start", "max_peak", "rss_start", "rss_peak")
+
+
+class _MemoryTracker:
+    """Per-stage peak and retained allocations from tracemalloc, plus optional RSS.
+
+    Stages nest: ``tracemalloc.reset_peak`` is called on every entry, so each
+    frame folds the peak observed before a child started, and the child's own
+    peak, back into its running maximum.
+    """
+
+    def __init__(self, sample_rss: bool = False, rss_interval: float = 0.005):
+        self.records: List[Dict[str, Any]] = []
+        self._stack: List[_MemoryFrame] = []
+        self._owns_tracing = False
+        self._sampler: Optional[_RssSampler] = None
+        self._sample_rss = sample_rss
+        self._rss_interval = rss_interval
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        if self._sample_rss and _current_rss() is not None:
+            self._sampler = _RssSampler(self._rss_interval)
+            self._sampler.start()
+
+    def stop(self) -> None:
+        if self._sampler is not None:
+            self._sampler.stop()
+            self._sampler = None
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def enter(self, name: str) -> Dict[str, Any]:
+        record: Dict[str, Any] = {"stage": name}
+        self.records.append(record)
+        current, peak = tracemalloc.get_traced_memory()
+        rss = _current_rss() if self._sampler is not None else None
+        if self._stack:
+            parent = self._stack[-1]
+            parent.max_peak = max(parent.max_peak, peak)
+            if rss is not None:
+                parent.rss_peak = max(parent.rss_peak, self._sampler.mark(rss))
+        tracemalloc.reset_peak()
+
+        frame = _MemoryFrame()
+        frame.record = record
+        frame.start = current
+        frame.max_peak = current
+        frame.rss_start = rss
+        frame.rss_peak = rss or 0
+        self._stack.append(frame)
+        return record
+
+    def exit(self) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        frame = self._stack.pop()
+        frame.max_peak = max(frame.max_peak, peak)
+        record = frame.record
+        record["peak_bytes"] = frame.max_peak - frame.start
+        record["retained_bytes"] = current - frame.start
+        if frame.rss_start is not None:
+            rss = _current_rss()
+            frame.rss_peak = max(frame.rss_peak, self._sampler.mark(rss))
+            record["rss_start_bytes"] = frame.rss_start
+            record["rss_end_bytes"] = rss
+            record["rss_peak_bytes"] = frame.rss_peak
+        if self._stack:
+            parent = self._stack[-1]
+            parent.max_peak = max(parent.max_peak, frame.max_peak)
+            if frame.rss_start is not None:
+                parent.rss_peak = max(parent.rss_peak, frame.rss_peak)
+
+    def report(self) -> Dict[str, Any]:
+        # The outermost stage is entered first, so it is always the first record.
+        total, *stages = self.records
+        return {
+            "stages": stages,
+            "total": {k: v for k, v in total.items() if k != "stage"},
+        }
+
+
+def summarize_memory_profiles(
+    results: Iterable[Dict[str, Any]],
+    budget_bytes: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Aggregate per-pair memory profiles of a corpus run.
+
+    Parameters
+    ----------
+    results : iterable of dict
+        Results from ``compute_vcs_corpus(..., return_memory=True)`` (or
+        ``compute_vcs_score`` results with an added ``'id'``); each must
+        contain a ``'memory'`` entry.
+    budget_bytes : int, optional
+        Peak traced allocation per pair above which a pair is flagged.
+
+    Returns
+    -------
+    dict
+        ``'pairs'`` (count), ``'max_peak_bytes'``, ``'mean_peak_bytes'``,
+        ``'p95_peak_bytes'``, ``'stage_max_peak_bytes'`` (worst peak per stage
+        across the corpus) and ``'over_budget'``: one entry per flagged pair with
+        its ``'id'``, ``'peak_bytes'`` and the ``'dominant_stage'`` that had the
+        highest peak.
+
+    Examples
+    --------
+    >>> results = list(compute_vcs_corpus(pairs, segmenter, embedder,
+    ...                                   return_memory=True))
+    >>> summary = summarize_memory_profiles(results, budget_bytes=512 * 2**20)
+    >>> [p['id'] for p in summary['over_budget']]
+    """
+    peaks: List[int] = []
+    stage_max: Dict[str, int] = {}
+    over_budget: List[Dict[str, Any]] = []
+
+    for result in results:
+        memory = result["memory"]
+        peak = memory["total"]["peak_bytes"]
+        peaks.append(peak)
+        dominant = None
+        for stage in memory["stages"]:
+            name = stage["stage"]
+            stage_max[name] = max(stage_max.get(name, 0), stage["peak_bytes"])
+            if dominant is None or stage["peak_bytes"] > dominant["peak_bytes"]:
+                dominant = stage
+        if budget_bytes is not None and peak > budget_bytes:
+            over_budget.append({
+                "id": result.get("id"),
+                "peak_bytes": peak,
+                "dominant_stage": dominant["stage"] if dominant else None,
+            })
+
+    ordered = sorted(peaks)
+    return {
+        "pairs": len(peaks),
+        "max_peak_bytes": ordered[-1] if ordered else 0,
+        "mean_peak_bytes": (sum(ordered) / len(ordered)) if ordered else 0.0,
+        "p95_peak_bytes": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] if ordered else 0,
+        "stage_max_peak_bytes": stage_max,
+        "budget_bytes": budget_bytes,
+        "over_budget": over_budget,
+    }
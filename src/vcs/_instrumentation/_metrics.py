@@ -0,0 +1,300 @@
+import bisect
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ._hooks import StageHook, register_stage_hook, unregister_stage_hook
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+MATRIX_CELL_BUCKETS = (1e2, 1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+
+_EMBEDDING_STAGES = ("embedding_gas", "embedding_las")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape_label(str(value))}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], lock: threading.Lock):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = lock
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class _Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args: Any):
+        super().__init__(*args)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class _Gauge(_Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+
+class _Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args: Any, buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(*args)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts..., +Inf count], sum
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def count(self, **labels: Any) -> int:
+        entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide scoring metrics in Prometheus text exposition format.
+
+    Once registered with :func:`enable_metrics`, every ``compute_vcs_score``
+    call (directly or through the corpus runner) updates:
+
+    * ``vcs_pairs_scored_total{status}`` - scored pairs, results served from
+      a ``ResultCache`` included; ``status`` is ``ok`` or ``error``
+    * ``vcs_pairs_in_flight`` - pairs currently being scored
+    * ``vcs_stage_duration_seconds{stage}`` - latency histogram per pipeline stage
+    * ``vcs_embedding_batch_size{stage}`` - texts per embedding call
+    * ``vcs_similarity_matrix_cells`` - reference x generated chunks per pair
+    * ``vcs_cache_requests_total{cache,result}`` - lookups in the result and
+      embedding caches, ``result`` is ``hit`` or ``miss``; the hit ratio is
+      ``hit / (hit + miss)``
+
+    Examples
+    --------
+    >>> registry = enable_metrics()
+    >>> compute_vcs_score(ref_text, gen_text, segmenter, embedder)
+    >>> print(registry.render())
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pairs_scored = _Counter(
+            "vcs_pairs_scored_total", "Pairs scored by compute_vcs_score.", ("status",), self._lock
+        )
+        self.pairs_in_flight = _Gauge(
+            "vcs_pairs_in_flight", "Pairs currently being scored.", (), self._lock
+        )
+        self.stage_duration = _Histogram(
+            "vcs_stage_duration_seconds", "Wall time of each pipeline stage.", ("stage",),
+            self._lock, buckets=LATENCY_BUCKETS,
+        )
+        self.embedding_batch_size = _Histogram(
+            "vcs_embedding_batch_size", "Texts passed to one embedding call.", ("stage",),
+            self._lock, buckets=BATCH_SIZE_BUCKETS,
+        )
+        self.similarity_matrix_cells = _Histogram(
+            "vcs_similarity_matrix_cells", "Cells of the LAS similarity matrix per pair.", (),
+            self._lock, buckets=MATRIX_CELL_BUCKETS,
+        )
+        self.cache_requests = _Counter(
+            "vcs_cache_requests_total", "Cache lookups by cache and result.", ("cache", "result"),
+            self._lock,
+        )
+        self._metrics = (
+            self.pairs_scored, self.pairs_in_flight, self.stage_duration,
+            self.embedding_batch_size, self.similarity_matrix_cells, self.cache_requests,
+        )
+
+    def record_cache_lookup(self, cache: str, hit: bool, count: int = 1) -> None:
+        if count:
+            self.cache_requests.inc(count, cache=cache, result="hit" if hit else "miss")
+
+    def cache_hit_ratio(self, cache: str) -> Optional[float]:
+        hits = self.cache_requests.value(cache=cache, result="hit")
+        misses = self.cache_requests.value(cache=cache, result="miss")
+        return hits / (hits + misses) if hits + misses else None
+
+    def render(self) -> str:
+        """All metrics in Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        with self._lock:
+            for metric in self._metrics:
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class _MetricsStageHook(StageHook):
+    """Feeds stage boundaries into a :class:`MetricsRegistry`."""
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+
+    def on_stage_start(self, stage: str, info: Dict[str, Any]) -> None:
+        if stage == "compute_vcs_score":
+            self.registry.pairs_in_flight.inc()
+
+    def on_stage_end(self, stage: str, info: Dict[str, Any], error: Optional[BaseException]) -> None:
+        registry = self.registry
+        registry.stage_duration.observe(info["wall"], stage=stage)
+        sizes = info["sizes"]
+        if stage == "compute_vcs_score":
+            registry.pairs_in_flight.dec()
+            registry.pairs_scored.inc(status="error" if error is not None else "ok")
+        elif stage in _EMBEDDING_STAGES:
+            registry.embedding_batch_size.observe(sizes.get("items", 0), stage=stage)
+        elif stage == "similarity":
+            registry.similarity_matrix_cells.observe(
+                sizes.get("reference_chunks", 0) * sizes.get("generated_chunks", 0)
+            )
+
+
+_active: Optional[Tuple[MetricsRegistry, _MetricsStageHook]] = None
+_active_lock = threading.Lock()
+
+
+def enable_metrics(registry: Optional[MetricsRegistry] = None) -> MetricsRegistry:
+    """Start updating a metrics registry from every scoring call in this process.
+
+    Parameters
+    ----------
+    registry : MetricsRegistry, optional
+        Registry to update. Defaults to the currently enabled registry, or a
+        new one.
+
+    Returns
+    -------
+    MetricsRegistry
+        The enabled registry.
+
+    See Also
+    --------
+    start_metrics_server : Serve the registry over HTTP for Prometheus
+    """
+    global _active
+    with _active_lock:
+        if _active is not None:
+            if registry is None or registry is _active[0]:
+                return _active[0]
+            unregister_stage_hook(_active[1])
+        registry = registry or MetricsRegistry()
+        hook = _MetricsStageHook(registry)
+        register_stage_hook(hook)
+        _active = (registry, hook)
+        return registry
+
+
+def disable_metrics() -> None:
+    """Stop updating the registry enabled with :func:`enable_metrics`."""
+    global _active
+    with _active_lock:
+        if _active is not None:
+            unregister_stage_hook(_active[1])
+            _active = None
+
+
+def _record_cache_lookup(cache: str, hit: bool, count: int = 1) -> None:
+    active = _active
+    if active is not None:
+        active[0].record_cache_lookup(cache, hit, count)
+
+
+def start_metrics_server(
+    port: int = 9464,
+    host: str = "127.0.0.1",
+    registry: Optional[MetricsRegistry] = None,
+) -> ThreadingHTTPServer:
+    """Serve ``/metrics`` in Prometheus text format from a background thread.
+
+    Parameters
+    ----------
+    port : int, default=9464
+        TCP port; 0 picks a free one (see ``server.server_address``).
+    host : str, default="127.0.0.1"
+        Interface to bind; use ``"0.0.0.0"`` to allow remote scrapes.
+    registry : MetricsRegistry, optional
+        Registry to expose. Defaults to :func:`enable_metrics`'s registry,
+        enabling metrics if needed.
+
+    Returns
+    -------
+    http.server.ThreadingHTTPServer
+        The running server; call ``shutdown()`` to stop it.
+    """
+    registry = registry or enable_metrics()
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="vcs-metrics-server", daemon=True).start()
+    return server
@@ -1,6 +1,8 @@
-from ._best_match import _find_best_match_with_context, _calculate_row_col_matches_context
+from ._best_match import _calculate_row_col_matches_context
+from ._details import _BestMatchDetails, SELECTION_REASONS
 
 __all__ = [
-    "_find_best_match_with_context", 
-    "_calculate_row_col_matches_context"
-]
\ No newline at end of file
+    "_calculate_row_col_matches_context",
+    "_BestMatchDetails",
+    "SELECTION_REASONS",
+]
@@ -0,0 +1,293 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+# Selection reason codes, in ``reason`` order
+SELECTION_REASONS = (
+    "max_similarity",
+    "no_mapping_window",
+    "in_mapping_window",
+    "closest_to_mapping_window",
+)
+_MAX_SIMILARITY, _NO_MAPPING_WINDOW, _IN_MAPPING_WINDOW, _CLOSEST_TO_MAPPING_WINDOW = range(4)
+
+# Matrix cells per block of rows in the blocked passes below
+_BLOCK_CELLS = 1 << 20
+
+# Per-segment and per-candidate arrays, in constructor order
+_SEGMENT_COLUMNS = (
+    "valid", "window_start", "window_end", "max_index", "max_value",
+    "context_window", "context_threshold", "context_window_applied",
+    "selected_index", "reason",
+)
+_CANDIDATE_COLUMNS = (
+    "offsets", "candidate_index", "candidate_similarity",
+    "candidate_in_window", "candidate_distance",
+)
+
+
+class _BestMatchDetails(Mapping):
+    """Best-match diagnostics for one direction, stored as flat arrays.
+
+    Per segment ``i`` (a generated chunk for precision, a reference chunk for
+    recall): ``valid``, ``window_start``/``window_end`` (mapping window),
+    ``max_index``/``max_value``, ``context_window``, ``context_threshold``,
+    ``context_window_applied``, ``selected_index`` and ``reason`` (an index
+    into :data:`SELECTION_REASONS`).
+
+    Candidates are in CSR layout: those of segment ``i`` are
+    ``candidate_*[offsets[i]:offsets[i + 1]]`` (``index``, ``similarity``,
+    ``in_window``, ``distance``). As in the per-candidate records this
+    replaces, they are only kept when the context threshold admitted more
+    than one candidate.
+
+    The object still reads like the former ``{'direction': ...,
+    'segments': [...]}`` dict: ``details['segments']`` is a sequence that
+    builds each segment's dict only when it is accessed.
+    """
+
+    def __init__(
+        self,
+        direction: str,
+        context_range: float,
+        valid: np.ndarray,
+        window_start: np.ndarray,
+        window_end: np.ndarray,
+        max_index: np.ndarray,
+        max_value: np.ndarray,
+        context_window: np.ndarray,
+        context_threshold: np.ndarray,
+        context_window_applied: np.ndarray,
+        selected_index: np.ndarray,
+        reason: np.ndarray,
+        offsets: np.ndarray,
+        candidate_index: np.ndarray,
+        candidate_similarity: np.ndarray,
+        candidate_in_window: np.ndarray,
+        candidate_distance: np.ndarray,
+        invalid_reason: Optional[str] = None,
+    ):
+        self.direction = direction
+        self.context_range = context_range
+        self.valid = valid
+        self.window_start = window_start
+        self.window_end = window_end
+        self.max_index = max_index
+        self.max_value = max_value
+        self.context_window = context_window
+        self.context_threshold = context_threshold
+        self.context_window_applied = context_window_applied
+        self.selected_index = selected_index
+        self.reason = reason
+        self.offsets = offsets
+        self.candidate_index = candidate_index
+        self.candidate_similarity = candidate_similarity
+        self.candidate_in_window = candidate_in_window
+        self.candidate_distance = candidate_distance
+        self.invalid_reason = invalid_reason
+
+    def __len__(self) -> int:
+        return 2
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(("direction", "segments"))
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "direction":
+            return self.direction
+        if key == "segments":
+            return _SegmentViews(self)
+        raise KeyError(key)
+
+    def __repr__(self) -> str:
+        return (f"<best-match details: {self.direction}, {len(self.valid)} segments, "
+                f"{len(self.candidate_index)} candidates>")
+
+    def segment(self, i: int) -> Dict[str, Any]:
+        """The per-segment dict of segment ``i``, built on demand."""
+        if not self.valid[i]:
+            return {"index": i, "valid": False, "reason": self.invalid_reason}
+        code = int(self.reason[i])
+        selected = int(self.selected_index[i])
+        selection: Dict[str, Any] = {
+            "max_value": float(self.max_value[i]),
+            "max_index": int(self.max_index[i]),
+            "context_range": float(self.context_range),
+            "context_window": float(self.context_window[i]),
+            "context_threshold": float(self.context_threshold[i]),
+            "context_window_applied": bool(self.context_window_applied[i]),
+            "candidates": [],
+        }
+        window = {"start": int(self.window_start[i]), "end": int(self.window_end[i])}
+        if code in (_MAX_SIMILARITY, _NO_MAPPING_WINDOW):
+            selection["selected_index"] = selected
+            selection["selection_reason"] = SELECTION_REASONS[code]
+        else:
+            selection["mapping_window"] = dict(window)
+            start, end = self.offsets[i], self.offsets[i + 1]
+            selection["candidates"] = [
+                {
+                    "index": int(index),
+                    "similarity": float(similarity),
+                    "in_window": bool(in_window),
+                    "distance": int(distance),
+                    "is_selected": int(index) == selected,
+                }
+                for index, similarity, in_window, distance in zip(
+                    self.candidate_index[start:end], self.candidate_similarity[start:end],
+                    self.candidate_in_window[start:end], self.candidate_distance[start:end],
+                )
+            ]
+            selection["selection_reason"] = SELECTION_REASONS[code]
+            selection["selected_index"] = selected
+        return {"index": i, "mapping_window": window, "selection": selection, "valid": True}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The equivalent ``{'direction': ..., 'segments': [dict, ...]}``."""
+        return {"direction": self.direction, "segments": list(self["segments"])}
+
+    def columns(self) -> Dict[str, Any]:
+        """Constructor arguments by name: scalars and arrays."""
+        columns: Dict[str, Any] = {
+            "direction": self.direction,
+            "context_range": self.context_range,
+            "invalid_reason": self.invalid_reason,
+        }
+        for name in _SEGMENT_COLUMNS + _CANDIDATE_COLUMNS:
+            columns[name] = getattr(self, name)
+        return columns
+
+
+def _row_argmax(scores: np.ndarray, workspace=None) -> np.ndarray:
+    # numpy copies the whole input before a row-wise argmax unless it is C
+    # contiguous and writeable, so the transposed matrix of the precision
+    # direction, sliced views and read-only memory maps are copied; in
+    # blocks, only one block is copied at a time, into the workspace if any.
+    n, m = scores.shape
+    if (scores.flags.c_contiguous and scores.flags.writeable) or m == 0:
+        return scores.argmax(axis=1)
+    out = np.empty(n, dtype=np.intp)
+    step = max(1, _BLOCK_CELLS // m)
+    for start in range(0, n, step):
+        block = scores[start:start + step]
+        if workspace is not None:
+            copy = workspace.array("argmax_block", block.shape, block.dtype)
+            np.copyto(copy, block)
+            block = copy
+        out[start:start + step] = block.argmax(axis=1)
+    return out
+
+
+def _admitted_candidates(
+    scores: np.ndarray, context_threshold: np.ndarray, workspace=None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Per row, the number of cells at or above its threshold and, for rows
+    # with more than one, their (row, column) positions in row-major order.
+    # Done in blocks of rows so no full-size boolean mask is built.
+    n, m = scores.shape
+    counts = np.empty(n, dtype=np.int64)
+    rows, columns = [], []
+    step = max(1, _BLOCK_CELLS // m)
+    for start in range(0, n, step):
+        block = scores[start:start + step]
+        admitted = None if workspace is None else workspace.array("admitted_block", block.shape, bool)
+        admitted = np.greater_equal(block, context_threshold[start:start + step, None], out=admitted)
+        counts[start:start + step] = admitted.sum(axis=1)
+        multiple = np.flatnonzero(counts[start:start + step] > 1)
+        block_rows, block_columns = np.nonzero(admitted[multiple])
+        rows.append(multiple[block_rows] + start)
+        columns.append(block_columns)
+    if not rows:
+        return counts, np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    return counts, np.concatenate(rows), np.concatenate(columns)
+
+
+class _SegmentViews(Sequence):
+    def __init__(self, details: _BestMatchDetails):
+        self._details = details
+
+    def __len__(self) -> int:
+        return len(self._details.valid)
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(i, slice):
+            return [self._details.segment(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("segment index out of range")
+        return self._details.segment(i)
+
+
+def _best_match_details(
+    sim_matrix: np.ndarray,
+    mapping_windows: List[Any],
+    direction: str,
+    context_cutoff_value: float,
+    context_window_ctrl: float,
+    workspace=None,
+) -> _BestMatchDetails:
+    # Rows of ``scores`` are the segments being matched, columns their candidates.
+    scores = sim_matrix.T if direction == "precision" else sim_matrix
+    n, m = scores.shape
+    windows = np.asarray(mapping_windows, dtype=np.int64).reshape(-1, 2)[:n]
+    context_range = 1 - context_cutoff_value
+    if m == 0:
+        empty_int = np.zeros(0, dtype=np.int64)
+        empty_float = np.zeros(0, dtype=np.float64)
+        return _BestMatchDetails(
+            direction, context_range, np.zeros(n, dtype=bool),
+            windows[:, 0], windows[:, 1], np.full(n, -1, dtype=np.int64),
+            np.zeros(n), np.zeros(n), np.zeros(n), np.zeros(n, dtype=bool),
+            np.full(n, -1, dtype=np.int64), np.zeros(n, dtype=np.int8),
+            np.zeros(n + 1, dtype=np.int64), empty_int, empty_float,
+            np.zeros(0, dtype=bool), empty_int,
+            invalid_reason="empty_column" if direction == "precision" else "empty_row",
+        )
+
+    # Per segment, in the matrix dtype: when the best similarity is within
+    # context_range of 1, the excess widens a context window below it (scaled
+    # by 1 / (max_value * context_window_ctrl)); every candidate at or above
+    # max_value - context_window is admitted, and the admitted candidate
+    # closest to the mapping window is selected.
+    max_value = scores.max(axis=1)
+    max_index = _row_argmax(scores, workspace)
+    excess = context_range - (1 - max_value)
+    applied = (max_value > 0) & (excess > 0)
+    context_window = np.zeros_like(max_value)
+    np.divide(np.divide(excess, max_value, where=applied, out=np.zeros_like(max_value)),
+              context_window_ctrl, where=applied, out=context_window)
+    context_threshold = max_value - context_window
+
+    counts, rows, candidate_index = _admitted_candidates(scores, context_threshold, workspace)
+    multiple = counts > 1
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.where(multiple, counts, 0), out=offsets[1:])
+
+    start, end = windows[rows, 0], windows[rows, 1]
+    in_window = (candidate_index >= start) & (candidate_index < end)
+    distance = np.where(
+        in_window, 0, np.maximum(np.maximum(start - candidate_index, candidate_index - (end - 1)), 0)
+    )
+
+    # Closest candidate to the window, ties going to the lowest index
+    selected_index = max_index.astype(np.int64)
+    reason = np.full(n, _MAX_SIMILARITY, dtype=np.int8)
+    if len(rows):
+        groups = offsets[:-1][multiple]
+        key = np.minimum.reduceat(distance * m + candidate_index, groups)
+        selected = key % m
+        selected_index[multiple] = selected
+        selected_in_window = (selected >= windows[multiple, 0]) & (selected < windows[multiple, 1])
+        reason[multiple] = np.where(selected_in_window, _IN_MAPPING_WINDOW, _CLOSEST_TO_MAPPING_WINDOW)
+
+    return _BestMatchDetails(
+        direction, context_range, np.ones(n, dtype=bool),
+        windows[:, 0], windows[:, 1], max_index.astype(np.int64),
+        max_value.astype(np.float64), context_window.astype(np.float64),
+        context_threshold.astype(np.float64), applied,
+        selected_index, reason, offsets,
+        candidate_index.astype(np.int64), scores[rows, candidate_index].astype(np.float64),
+        in_window, distance.astype(np.int64),
+    )
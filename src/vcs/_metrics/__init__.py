@@ -1,10 +1,11 @@
-from ._gas._gas import _compute_gas_metrics
+from ._gas._gas import _compute_gas_metrics, _gas_from_embeddings
 from ._las._las import _compute_las_metrics
 from ._nas._nas import _compute_nas_metrics
 from ._vcs._vcs import _compute_vcs_metrics
 
 __all__ = [
     "_compute_gas_metrics",
+    "_gas_from_embeddings",
     "_compute_las_metrics",
     "_compute_nas_metrics",
     "_compute_vcs_metrics",
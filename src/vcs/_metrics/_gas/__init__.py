@@ -1,5 +1,6 @@
-from ._gas import _compute_gas_metrics
+from ._gas import _compute_gas_metrics, _gas_from_embeddings
 
 __all__ = [
-    "_compute_gas_metrics"
+    "_compute_gas_metrics",
+    "_gas_from_embeddings",
 ]
\ No newline at end of file
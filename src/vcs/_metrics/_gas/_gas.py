@@ -1,19 +1,32 @@
 import torch
 import torch.nn.functional as F
-from typing import Callable
+from typing import Callable, Optional
+
+from ..._segmenting import _prepare_embeddings, _embed_unique
 
 def _compute_gas_metrics(
     reference_text: str, 
     generated_text: str, 
-    embedding_fn: Callable
+    embedding_fn: Callable,
+    normalize: bool = False,
+    dtype: Optional[torch.dtype] = None
 ) -> float:
 
-    emb_all = embedding_fn([reference_text, generated_text])
+    emb_all = _embed_unique(embedding_fn, [reference_text, generated_text])
     if len(emb_all) < 2:
         return 0.0
     
-    ref_vec = emb_all[0].unsqueeze(0)
-    gen_vec = emb_all[1].unsqueeze(0)
-    sim = F.cosine_similarity(ref_vec, gen_vec, dim=1)
-    
+    if normalize or dtype is not None:
+        emb_all = _prepare_embeddings(emb_all, normalize, dtype)
+    return _gas_from_embeddings(emb_all[0], emb_all[1], normalized=normalize)
+
+def _gas_from_embeddings(
+    ref_vec: torch.Tensor,
+    gen_vec: torch.Tensor,
+    normalized: bool = False
+) -> float:
+    # Normalized vectors get the dot product LAS uses for chunks.
+    if normalized:
+        return torch.dot(ref_vec.reshape(-1), gen_vec.reshape(-1)).item()
+    sim = F.cosine_similarity(ref_vec.unsqueeze(0), gen_vec.unsqueeze(0), dim=1)
     return sim.item()
\ No newline at end of file
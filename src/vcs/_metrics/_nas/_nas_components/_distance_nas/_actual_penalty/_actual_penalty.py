@@ -25,7 +25,8 @@ def calculate_actual_penalty(
     direction: str,
     lct: int = 0,
     ref_len: int = None,
-    gen_len: int = None
+    gen_len: int = None,
+    workspace=None
 ) -> Tuple[np.ndarray, Dict[str, Any]]:
 
     if direction == "precision":
@@ -40,13 +41,22 @@ def calculate_actual_penalty(
     valid_indices = best_indices >= 0
     valid_mask = valid_indices
     
-    in_window = np.zeros_like(best_indices, dtype=bool)
+    # With a workspace the arrays are reused scratch, so only the copies in
+    # ``internals`` outlive the next call.
+    shape = np.shape(best_indices)
+    if workspace is None:
+        in_window = np.zeros(shape, dtype=bool)
+        penalties = np.zeros(shape, dtype=float)
+        in_lct_zone = np.zeros(shape, dtype=bool)
+    else:
+        in_window = workspace.full("nas_in_window", shape, False, bool)
+        penalties = workspace.full("nas_penalties", shape, 0.0, float)
+        in_lct_zone = workspace.full("nas_in_lct_zone", shape, False, bool)
     for i, idx in enumerate(best_indices):
         if idx >= 0:
             start, end = mapping_windows[i]
             in_window[i] = start <= idx < end
     
-    penalties = np.zeros(len(best_indices), dtype=float)
     for i, (idx, is_valid, is_in_window) in enumerate(zip(best_indices, valid_mask, in_window)):
         if not is_valid:
             continue
@@ -58,7 +68,6 @@ def calculate_actual_penalty(
         dist = 0 if dist <= lct*lct_window else dist
         penalties[i] = dist / float(length) if length else 0
     
-    in_lct_zone = np.zeros_like(best_indices, dtype=bool)
     for i, idx in enumerate(best_indices):
         if idx >= 0:
             start, end = mapping_windows[i]
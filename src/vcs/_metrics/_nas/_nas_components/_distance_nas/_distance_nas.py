@@ -11,11 +11,12 @@ def _calculate_distance_based_nas(
     direction: str,
     ref_len: int = None,
     gen_len: int = None,
-    lct: int = 0
+    lct: int = 0,
+    workspace=None
 ) -> Tuple[float, Dict[str, Any]]:
 
     penalties, internals = calculate_actual_penalty(
-        best_indices, mapping_windows, length, direction, lct, ref_len, gen_len
+        best_indices, mapping_windows, length, direction, lct, ref_len, gen_len, workspace
     )
     
     max_total_penalty = calculate_max_penalty(mapping_windows, length)
@@ -5,7 +5,8 @@ from typing import List, Tuple, Dict, Any
 def _compute_ideal_narrative_line_band(
     mapping_windows: List[Tuple[int, int]], 
     source_len: int, 
-    target_len: int
+    target_len: int,
+    workspace=None
 ) -> Tuple[float, float, List[Tuple[int, int]], List[Tuple[int, int]]]:
 
     n_windows = len(mapping_windows)
@@ -14,25 +15,18 @@ def _compute_ideal_narrative_line_band(
     
     max_window_height = max(end - start for start, end in mapping_windows)
     
-    dp_min_list = []
-    dp_max_list = []
-    pred_min_list = []
-    pred_max_list = []
-    
-    for i in range(n_windows):
-        start, end = mapping_windows[i]
-        window_height = end - start
-        
-        dp_min_window = np.full(window_height, np.inf)
-        dp_max_window = np.full(window_height, -np.inf)
-        
-        pred_min_window = np.full(window_height, -1, dtype=int)
-        pred_max_window = np.full(window_height, -1, dtype=int)
-        
-        dp_min_list.append(dp_min_window)
-        dp_max_list.append(dp_max_window)
-        pred_min_list.append(pred_min_window)
-        pred_max_list.append(pred_max_window)
+    # One row per window, padded to the tallest; the padding is never read.
+    shape = (n_windows, max_window_height)
+    if workspace is None:
+        dp_min_list = np.full(shape, np.inf)
+        dp_max_list = np.full(shape, -np.inf)
+        pred_min_list = np.full(shape, -1, dtype=int)
+        pred_max_list = np.full(shape, -1, dtype=int)
+    else:
+        dp_min_list = workspace.full("line_nas_dp_min", shape, np.inf, float)
+        dp_max_list = workspace.full("line_nas_dp_max", shape, -np.inf, float)
+        pred_min_list = workspace.full("line_nas_pred_min", shape, -1, int)
+        pred_max_list = workspace.full("line_nas_pred_max", shape, -1, int)
     
     start0, end0 = mapping_windows[0]
     for y in range(end0 - start0):
@@ -10,7 +10,8 @@ def _calculate_line_based_nas(
     ref_len: int, 
     gen_len: int, 
     swap: bool = False,
-    lct: int = 0
+    lct: int = 0,
+    workspace=None
 ) -> Tuple[float, Dict[str, Any]]:
     if not aligned:
         return 0.0, {"message": "No aligned segments"}
@@ -30,7 +31,7 @@ def _calculate_line_based_nas(
     sx = np.array([point[sx_idx] for point in sorted_aligned])
     sy = np.array([point[sy_idx] for point in sorted_aligned])
 
-    floor_ideal_line_length, ceil_ideal_line_length, floor_path, ceil_path = _compute_ideal_narrative_line_band(mapping_windows, source_len, target_len)
+    floor_ideal_line_length, ceil_ideal_line_length, floor_path, ceil_path = _compute_ideal_narrative_line_band(mapping_windows, source_len, target_len, workspace)
 
     floor_path_dy_map = {}
     if len(floor_path) > 1:
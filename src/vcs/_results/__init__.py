@@ -0,0 +1,21 @@
+"""
+Compact and columnar representations of scoring results.
+"""
+
+from ._compact import VCSScores, results_to_array, METRIC_KEYS, METRICS_DTYPE
+from ._columnar import ColumnarResultWriter, write_results_columnar
+from ._internals import save_internals, load_internals
+from ._jsonl import JsonLinesResultWriter, write_results_jsonl
+
+__all__ = [
+    "VCSScores",
+    "results_to_array",
+    "ColumnarResultWriter",
+    "write_results_columnar",
+    "JsonLinesResultWriter",
+    "write_results_jsonl",
+    "save_internals",
+    "load_internals",
+    "METRIC_KEYS",
+    "METRICS_DTYPE",
+]
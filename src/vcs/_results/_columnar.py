@@ -0,0 +1,234 @@
+import json
+import math
+import os
+import shutil
+import tempfile
+import zipfile
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .._utils import _json_default
+from ._compact import METRIC_KEYS
+
+_NAN = math.nan
+
+
+def _as_text(value: Any) -> str:
+    return value if isinstance(value, str) else json.dumps(value, default=_json_default)
+
+
+class _ParquetSink:
+    def __init__(self, path: str, config: Dict[str, Any]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "Writing Parquet needs pyarrow (pip install pyarrow); "
+                "use a .npz path for the numpy fallback."
+            ) from None
+        self._pa = pa
+        self._config = config
+        fields = [pa.field("id", pa.string()), pa.field("error", pa.string())]
+        fields += [pa.field(key, pa.float64()) for key in METRIC_KEYS.values()]
+        self._config_fields = [pa.field(name, pa.array([value]).type) for name, value in config.items()]
+        fields += self._config_fields
+        self._schema = pa.schema(
+            fields, metadata={"vcs.config": json.dumps(config, default=_json_default)}
+        )
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write_group(self, ids: List[str], errors: List[Optional[str]],
+                    metrics: Dict[str, np.ndarray]) -> None:
+        pa = self._pa
+        columns = [pa.array(ids, pa.string()), pa.array(errors, pa.string())]
+        columns += [pa.array(metrics[key]) for key in METRIC_KEYS.values()]
+        columns += [
+            pa.repeat(pa.scalar(value, field.type), len(ids))
+            for field, value in zip(self._config_fields, self._config.values())
+        ]
+        self._writer.write_table(pa.Table.from_arrays(columns, schema=self._schema))
+
+    def close(self, rows: int) -> None:
+        self._writer.close()
+
+
+class _NpzSink:
+    """Spools each column to a scratch file, then assembles the ``.npz`` on close."""
+
+    def __init__(self, path: str, config: Dict[str, Any]):
+        self.path = path
+        self._config = config
+        self._scratch = tempfile.mkdtemp(prefix=".vcs-columns-", dir=os.path.dirname(os.path.abspath(path)))
+        self._metric_files = {
+            key: open(os.path.join(self._scratch, f"metric-{i}"), "wb")
+            for i, key in enumerate(METRIC_KEYS.values())
+        }
+        self._text_file = open(os.path.join(self._scratch, "text"), "w+", encoding="utf-8")
+        self._text_width = {"id": 1, "error": 1}
+
+    def write_group(self, ids: List[str], errors: List[Optional[str]],
+                    metrics: Dict[str, np.ndarray]) -> None:
+        errors = [error or "" for error in errors]
+        self._text_width["id"] = max(self._text_width["id"], max(map(len, ids)))
+        self._text_width["error"] = max(self._text_width["error"], max(map(len, errors)))
+        self._text_file.write(json.dumps([ids, errors]) + "\n")
+        for key, fh in self._metric_files.items():
+            fh.write(metrics[key].tobytes())
+
+    def _write_header(self, fh: Any, dtype: np.dtype, rows: int) -> None:
+        np.lib.format.write_array_header_1_0(fh, {
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": False,
+            "shape": (rows,),
+        })
+
+    def close(self, rows: int) -> None:
+        try:
+            with zipfile.ZipFile(self.path, "w", allowZip64=True) as archive:
+                for position, name in enumerate(("id", "error")):
+                    dtype = np.dtype(f"U{self._text_width[name]}")
+                    with archive.open(f"{name}.npy", "w", force_zip64=True) as fh:
+                        self._write_header(fh, dtype, rows)
+                        self._text_file.seek(0)
+                        for line in self._text_file:
+                            fh.write(np.array(json.loads(line)[position], dtype=dtype).tobytes())
+                for key, scratch in self._metric_files.items():
+                    scratch.close()
+                    with archive.open(f"{key}.npy", "w", force_zip64=True) as fh:
+                        self._write_header(fh, np.dtype(np.float64), rows)
+                        with open(scratch.name, "rb") as source:
+                            shutil.copyfileobj(source, fh, 1 << 20)
+                for name, value in self._config.items():
+                    with archive.open(f"config.{name}.npy", "w") as fh:
+                        np.lib.format.write_array(fh, np.asarray(value))
+        finally:
+            self._text_file.close()
+            for scratch in self._metric_files.values():
+                scratch.close()
+            shutil.rmtree(self._scratch, ignore_errors=True)
+
+
+class ColumnarResultWriter:
+    """Stream result dicts into a columnar file, one row group at a time.
+
+    The format follows the file suffix:
+
+    * ``.parquet`` (needs the optional ``pyarrow`` package): columns ``id``,
+      ``error``, one float64 column per ``return_all_metrics`` metric under
+      its result key (``'VCS'``, ``'Precision NAS-D'``, ...) and one column
+      per config entry; every ``row_group_size`` rows become a Parquet row
+      group. The config is also stored as JSON in the schema metadata
+      (``vcs.config``).
+    * ``.npz``: the numpy fallback, readable with :func:`numpy.load`. The same
+      columns as ``.npy`` members, with the config as 0-d ``config.<name>``
+      members. Row groups are spooled to scratch files next to ``path`` and
+      assembled when the writer is closed.
+
+    Only one row group is held in memory, whatever the corpus size. Metrics a
+    result lacks (minimal results, failed pairs) are NaN; ids that are not
+    strings are stored as JSON (``7`` becomes ``'7'``).
+
+    Parameters
+    ----------
+    path : str
+        Output file ending in ``.parquet`` or ``.npz``.
+    config : dict, optional
+        Scoring configuration to store with the results, e.g.
+        ``{'chunk_size': 1, 'lct': 0, ...}``.
+    row_group_size : int, default=10000
+        Rows buffered before they are written out.
+
+    Examples
+    --------
+    >>> with ColumnarResultWriter("results.parquet", config={"lct": 1}) as writer:
+    ...     for result in compute_vcs_corpus(pairs, segmenter, embedder, lct=1,
+    ...                                      return_all_metrics=True):
+    ...         writer.write(result)
+    >>> import pyarrow.parquet as pq
+    >>> table = pq.read_table("results.parquet")
+    """
+
+    def __init__(self, path: str, config: Optional[Dict[str, Any]] = None, row_group_size: int = 10_000):
+        suffix = os.path.splitext(path)[1].lower()
+        if suffix not in (".parquet", ".npz"):
+            raise ValueError(f"Columnar output must end in .parquet or .npz, got {path!r}.")
+        self.path = path
+        self.row_group_size = max(int(row_group_size), 1)
+        self.rows = 0
+        config = dict(config or {})
+        self._sink = _ParquetSink(path, config) if suffix == ".parquet" else _NpzSink(path, config)
+        self._ids: List[str] = []
+        self._errors: List[Optional[str]] = []
+        self._metrics: Dict[str, List[float]] = {key: [] for key in METRIC_KEYS.values()}
+        self._closed = False
+
+    def write(self, result: Dict[str, Any]) -> None:
+        """Add one result dict (as yielded by :func:`compute_vcs_corpus`)."""
+        self._ids.append(_as_text(result.get("id", self.rows)))
+        self._errors.append(result.get("error"))
+        for key, column in self._metrics.items():
+            column.append(result.get(key, _NAN))
+        self.rows += 1
+        if len(self._ids) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._ids:
+            return
+        self._sink.write_group(
+            self._ids, self._errors,
+            {key: np.asarray(column, dtype=np.float64) for key, column in self._metrics.items()},
+        )
+        self._ids, self._errors = [], []
+        self._metrics = {key: [] for key in METRIC_KEYS.values()}
+
+    def close(self) -> None:
+        """Write the remaining rows and finish the file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._flush()
+        self._sink.close(self.rows)
+
+    def __enter__(self) -> "ColumnarResultWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def write_results_columnar(
+    results: Iterable[Dict[str, Any]],
+    path: str,
+    config: Optional[Dict[str, Any]] = None,
+    row_group_size: int = 10_000,
+) -> int:
+    """Write a stream of result dicts to a Parquet or ``.npz`` file.
+
+    Parameters
+    ----------
+    results : iterable of dict
+        Results, e.g. the generator returned by :func:`compute_vcs_corpus`
+        (with ``return_all_metrics=True`` to fill every metric column).
+    path : str
+        Output file ending in ``.parquet`` (needs ``pyarrow``) or ``.npz``.
+    config : dict, optional
+        Scoring configuration stored with the results.
+    row_group_size : int, default=10000
+        Rows per row group; memory use is bounded by one group.
+
+    Returns
+    -------
+    int
+        Number of rows written.
+
+    See Also
+    --------
+    ColumnarResultWriter : Column layout and incremental writing
+    """
+    with ColumnarResultWriter(path, config, row_group_size) as writer:
+        for result in results:
+            writer.write(result)
+    return writer.rows
@@ -0,0 +1,129 @@
+import math
+from typing import Any, Dict, Iterable, NamedTuple
+
+import numpy as np
+
+# Field name -> key in the ``return_all_metrics`` dict
+METRIC_KEYS: Dict[str, str] = {
+    "vcs": "VCS",
+    "gas": "GAS",
+    "gas_las_scaled": "GAS-LAS-Scaled",
+    "las": "LAS",
+    "precision_las": "Precision LAS",
+    "recall_las": "Recall LAS",
+    "nas": "NAS",
+    "nas_f1": "NAS-F1",
+    "nas_d": "NAS-D",
+    "precision_nas_d": "Precision NAS-D",
+    "recall_nas_d": "Recall NAS-D",
+    "nas_l": "NAS-L",
+    "precision_nas_l": "Precision NAS-L",
+    "recall_nas_l": "Recall NAS-L",
+    "window_regularizer": "Window-Regularizer",
+}
+
+METRICS_DTYPE = np.dtype([(field, np.float64) for field in METRIC_KEYS])
+
+_NAN = math.nan
+
+
+class VCSScores(NamedTuple):
+    """Compact, immutable form of a ``return_all_metrics`` result.
+
+    A tuple of 15 floats with attribute access, instead of a dict with 15
+    string keys: several times smaller per pair and cheap to aggregate.
+    Metrics missing from the source result (e.g. a minimal ``{'VCS': ...}``
+    result) are NaN.
+
+    Examples
+    --------
+    >>> scores = VCSScores.from_result(
+    ...     compute_vcs_score(ref_text, gen_text, segmenter, embedder,
+    ...                       return_all_metrics=True))
+    >>> scores.vcs, scores.nas_d
+    >>> scores.to_dict()['Precision NAS-D']
+    """
+    vcs: float = _NAN
+    gas: float = _NAN
+    gas_las_scaled: float = _NAN
+    las: float = _NAN
+    precision_las: float = _NAN
+    recall_las: float = _NAN
+    nas: float = _NAN
+    nas_f1: float = _NAN
+    nas_d: float = _NAN
+    precision_nas_d: float = _NAN
+    recall_nas_d: float = _NAN
+    nas_l: float = _NAN
+    precision_nas_l: float = _NAN
+    recall_nas_l: float = _NAN
+    window_regularizer: float = _NAN
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> "VCSScores":
+        """Build from a ``compute_vcs_score``/``compute_vcs_corpus`` result dict."""
+        return cls(*(float(result.get(key, _NAN)) for key in METRIC_KEYS.values()))
+
+    def to_dict(self) -> Dict[str, float]:
+        """The metrics under their ``return_all_metrics`` keys (``'VCS'``, ``'NAS-D'``, ...)."""
+        return {key: value for key, value in zip(METRIC_KEYS.values(), self)}
+
+
+def results_to_array(
+    results: Iterable[Dict[str, Any]],
+    id_dtype: Any = None,
+    capacity: int = 1024,
+) -> np.ndarray:
+    """Collect result dicts into one columnar numpy structured array.
+
+    Results are consumed one at a time and written straight into the array,
+    which grows geometrically; no per-pair object outlives its row. Pass the
+    generator returned by :func:`compute_vcs_corpus` to score a corpus into
+    an array.
+
+    Parameters
+    ----------
+    results : iterable of dict
+        Result dicts, typically with ``return_all_metrics=True``. Metrics a
+        result lacks (including failed pairs) are stored as NaN.
+    id_dtype : numpy dtype, optional
+        Adds an ``'id'`` field of this dtype holding each result's ``'id'``,
+        e.g. ``np.int64`` or ``'U32'`` (longer strings are truncated).
+        Without it, rows are identified by their position.
+    capacity : int, default=1024
+        Initial number of rows; a good guess of the corpus size avoids
+        reallocations.
+
+    Returns
+    -------
+    numpy.ndarray
+        Structured array with one row per result and one float64 field per
+        metric: ``vcs``, ``gas``, ``gas_las_scaled``, ``las``,
+        ``precision_las``, ``recall_las``, ``nas``, ``nas_f1``, ``nas_d``,
+        ``precision_nas_d``, ``recall_nas_d``, ``nas_l``,
+        ``precision_nas_l``, ``recall_nas_l``, ``window_regularizer``
+        (see :class:`VCSScores` for the mapping to result keys).
+
+    Examples
+    --------
+    >>> scores = results_to_array(
+    ...     compute_vcs_corpus(pairs, segmenter, embedder, return_all_metrics=True),
+    ...     id_dtype="U64")
+    >>> scores["vcs"].mean()
+    >>> scores[scores["las"] < 0.5]["id"]
+    """
+    dtype = METRICS_DTYPE
+    if id_dtype is not None:
+        dtype = np.dtype([("id", id_dtype)] + [(field, np.float64) for field in METRIC_KEYS])
+    keys = tuple(METRIC_KEYS.values())
+    array = np.empty(max(int(capacity), 1), dtype=dtype)
+    count = 0
+    for result in results:
+        if count == len(array):
+            grown = np.empty(2 * len(array), dtype=dtype)
+            grown[:count] = array
+            array = grown
+        row = tuple(result.get(key, _NAN) for key in keys)
+        array[count] = (result["id"],) + row if id_dtype is not None else row
+        count += 1
+    return array[:count].copy() if count < len(array) else array
@@ -0,0 +1,201 @@
+import json
+import os
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+import numpy as np
+
+from .._matching import _BestMatchDetails
+from .._utils import _atomic_write, _atomic_write_bytes, _json_default
+
+INTERNALS_FORMAT_VERSION = 1
+HEADER_FILE = "header.json"
+_HEADER_MEMBER = "__header__"
+_ARRAY_REF = "__vcs_array__"
+_BEST_MATCH = "__vcs_best_match__"
+
+
+def _leaf_kind(value: Any) -> str:
+    if isinstance(value, (bool, np.bool_)):
+        return "b"
+    if isinstance(value, (int, np.integer)):
+        return "i"
+    if isinstance(value, (float, np.floating)):
+        return "f"
+    return ""
+
+
+def _as_array(value: Any) -> Any:
+    """``value`` as a numeric ndarray if it is a homogeneous rectangular sequence, else None."""
+    if isinstance(value, np.ndarray):
+        return value if value.dtype.kind in "biuf" and value.ndim > 0 else None
+    if not isinstance(value, (list, tuple)) or not value:
+        return None
+    # Producers build every row the same way, so the first innermost row
+    # tells whether ints and floats are mixed (e.g. (i, j, similarity)).
+    row = value
+    while isinstance(row[0], (list, tuple)):
+        if not row[0]:
+            return None
+        row = row[0]
+    kinds = {_leaf_kind(item) for item in row}
+    if len(kinds) != 1 or "" in kinds:
+        return None
+    try:
+        array = np.asarray(value)
+    except ValueError:
+        return None
+    return array if array.dtype.kind in "biuf" else None
+
+
+def _split(node: Any, path: Tuple[str, ...], arrays: Dict[str, np.ndarray]) -> Any:
+    # Only values reached through dicts become arrays; items of lists (e.g.
+    # per-segment records) stay in the header, so the number of arrays does
+    # not grow with the text length.
+    if isinstance(node, _BestMatchDetails):
+        columns = {}
+        for name, value in node.columns().items():
+            if isinstance(value, np.ndarray):
+                arrays[".".join(path + (name,))] = value
+                value = {_ARRAY_REF: ".".join(path + (name,)), "list": False}
+            columns[name] = value
+        return {_BEST_MATCH: columns}
+    if isinstance(node, Mapping):
+        return {str(key): _split(value, path + (str(key),), arrays) for key, value in node.items()}
+    array = _as_array(node)
+    if array is None:
+        return node
+    name = ".".join(path)
+    arrays[name] = np.ascontiguousarray(array)
+    return {_ARRAY_REF: name, "list": not isinstance(node, np.ndarray)}
+
+
+class _LazyInternals(Mapping):
+    """Read-only view of saved internals that loads each array on first access."""
+
+    def __init__(self, raw: Dict[str, Any], load_array: Callable[[str], np.ndarray]):
+        self._raw = raw
+        self._load_array = load_array
+        self._resolved: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._resolved:
+            return self._resolved[key]
+        value = self._raw[key]
+        if isinstance(value, dict):
+            if _ARRAY_REF in value:
+                value = self._load_array(value[_ARRAY_REF])
+            elif _BEST_MATCH in value:
+                columns = _LazyInternals(value[_BEST_MATCH], self._load_array)
+                value = _BestMatchDetails(**{name: columns[name] for name in columns})
+            else:
+                value = _LazyInternals(value, self._load_array)
+            self._resolved[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __repr__(self) -> str:
+        return f"<lazy internals: {', '.join(self._raw)}>"
+
+
+def save_internals(internals: Dict[str, Any], path: str, compress: bool = True) -> None:
+    """Save ``internals`` in a compact binary format.
+
+    Numeric arrays (the similarity matrix, match indices and similarities,
+    NAS penalties, ...) are stored as ``.npy`` arrays and everything else
+    (texts, scalars, per-segment records) in a small JSON header, instead of
+    one large JSON document.
+
+    Parameters
+    ----------
+    internals : dict
+        The ``'internals'`` entry of a ``compute_vcs_score(...,
+        return_internals=True)`` result.
+    path : str
+        A path ending in ``.npz`` writes a single (compressed) archive. Any
+        other path is used as a directory holding ``header.json`` and one
+        ``.npy`` file per array, which :func:`load_internals` memory-maps.
+    compress : bool, default=True
+        Deflate the ``.npz`` archive. Ignored for directories.
+
+    See Also
+    --------
+    load_internals : Load saved internals lazily
+
+    Examples
+    --------
+    >>> result = compute_vcs_score(ref_text, gen_text, segmenter, embedder,
+    ...                            return_internals=True)
+    >>> save_internals(result['internals'], 'clip-42.npz')
+    >>> visualize_similarity_matrix(load_internals('clip-42.npz'))
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    header = {
+        "format": "vcs-internals",
+        "version": INTERNALS_FORMAT_VERSION,
+        "internals": _split(internals, (), arrays),
+    }
+    header_bytes = json.dumps(header, default=_json_default).encode("utf-8")
+    if path.endswith(".npz"):
+        save = np.savez_compressed if compress else np.savez
+        # Written to a temporary file and renamed, so an interrupted save
+        # never leaves a truncated archive under ``path``.
+        _atomic_write(
+            path, lambda fh: save(fh, **{_HEADER_MEMBER: np.frombuffer(header_bytes, dtype=np.uint8)}, **arrays)
+        )
+        return
+    os.makedirs(path, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(path, name + ".npy"), array)
+    # The header goes last: a directory without one is an incomplete save.
+    _atomic_write_bytes(os.path.join(path, HEADER_FILE), header_bytes)
+
+
+def load_internals(path: str, mmap: bool = True) -> Mapping:
+    """Load internals saved with :func:`save_internals`, lazily.
+
+    Only the JSON header is read up front; each array is read the first time
+    it is accessed, so a visualizer touches only the arrays it uses. The
+    returned mapping can be passed to every ``visualize_*`` function and to
+    :func:`create_vcs_pdf_report`.
+
+    Parameters
+    ----------
+    path : str
+        ``.npz`` archive or directory written by :func:`save_internals`.
+    mmap : bool, default=True
+        Memory-map the arrays of a directory save (read-only) instead of
+        reading them into memory. ``.npz`` members are always read.
+
+    Returns
+    -------
+    Mapping
+        Read-only, dict-like internals. Numeric values (numpy arrays and
+        numeric lists such as the similarity matrix or the match indices)
+        come back as (possibly memory-mapped) numpy arrays, other tuples as
+        lists.
+    """
+    if os.path.isdir(path):
+        with open(os.path.join(path, HEADER_FILE), "rb") as fh:
+            header = json.loads(fh.read())
+        mmap_mode = "r" if mmap else None
+
+        def load_array(name: str) -> np.ndarray:
+            return np.load(os.path.join(path, name + ".npy"), mmap_mode=mmap_mode)
+    else:
+        with np.load(path, allow_pickle=False) as archive:
+            header = json.loads(archive[_HEADER_MEMBER].tobytes())
+
+        # The archive is opened per array rather than kept open for as long
+        # as the returned mapping lives.
+        def load_array(name: str) -> np.ndarray:
+            with np.load(path, allow_pickle=False) as archive:
+                return archive[name]
+    if header.get("format") != "vcs-internals" or header.get("version") != INTERNALS_FORMAT_VERSION:
+        raise ValueError(f"{path!r} is not a VCS internals file (version {INTERNALS_FORMAT_VERSION}).")
+    return _LazyInternals(header["internals"], load_array)
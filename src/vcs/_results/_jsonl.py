@@ -0,0 +1,198 @@
+import gzip
+import json
+import sys
+from collections.abc import Mapping
+from typing import IO, Any, Callable, Dict, Iterable, Optional, Sequence
+
+from .._utils import _json_default
+
+_COMPRESSION_SUFFIXES = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+
+
+def _json_encoder() -> Callable[[Any], bytes]:
+    try:
+        import orjson
+    except ImportError:
+        return lambda obj: json.dumps(obj, default=_json_default).encode("utf-8")
+    # numpy values go through _json_default as with json, so both encoders
+    # write the same numbers.
+    return lambda obj: orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _compression_for(path: str) -> Optional[str]:
+    for suffix, codec in _COMPRESSION_SUFFIXES.items():
+        if path.endswith(suffix):
+            return codec
+    return None
+
+
+def _open_compressed(path: str, compression: Optional[str], level: Optional[int]) -> IO[bytes]:
+    if compression is None:
+        return open(path, "wb")
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=9 if level is None else level)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(
+                "zstd compression needs the zstandard package (pip install zstandard); "
+                "use gzip instead."
+            ) from None
+        compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+        return compressor.stream_writer(open(path, "wb"), closefd=True)
+    raise ValueError(f"Unknown compression {compression!r}; use None, 'gzip' or 'zstd'.")
+
+
+def _get_path(node: Any, parts: Sequence[str]) -> Any:
+    for part in parts:
+        if not isinstance(node, Mapping) or part not in node:
+            raise KeyError(part)
+        node = node[part]
+    return node
+
+
+def _select_fields(
+    internals: Mapping,
+    fields: Optional[Sequence[str]],
+    drop_fields: Sequence[str],
+) -> Dict[str, Any]:
+    if fields is None:
+        selected = dict(internals)
+    else:
+        selected = {}
+        for field in fields:
+            parts = field.split(".")
+            try:
+                value = _get_path(internals, parts)
+            except KeyError:
+                continue
+            target = selected
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = value
+    for field in drop_fields:
+        *parents, leaf = field.split(".")
+        # Copy each mapping on the way down; the caller's internals stay intact.
+        target = selected
+        for part in parents:
+            if not isinstance(target.get(part), Mapping):
+                break
+            target[part] = dict(target[part])
+            target = target[part]
+        else:
+            target.pop(leaf, None)
+    return selected
+
+
+class JsonLinesResultWriter:
+    """Stream result dicts to a (compressed) JSON-lines file as they arrive.
+
+    Each :meth:`write` encodes one result and, by default, flushes it, so a
+    killed run loses nothing already written and no results pile up in
+    memory. numpy scalars and arrays and lazy internals views are encoded
+    directly; when ``orjson`` is installed it is used for speed (it writes
+    NaN as ``null`` where :mod:`json` writes ``NaN``).
+
+    Parameters
+    ----------
+    path : str
+        Output file, or ``"-"`` for stdout. ``.gz`` and ``.zst`` suffixes
+        select compression unless ``compression`` is given.
+    compression : {None, 'gzip', 'zstd'}, optional
+        Compression of the stream; ``'zstd'`` needs the ``zstandard`` package.
+        Defaults to the one implied by the suffix.
+    compression_level : int, optional
+        Codec level (gzip default 9, zstd default 3).
+    internals_fields : sequence of str, optional
+        Dotted paths of the ``'internals'`` entries to keep, e.g.
+        ``["metrics", "alignment.precision.indices", "config"]``. All are kept
+        by default.
+    drop_internals_fields : sequence of str, optional
+        Dotted paths to remove from ``'internals'``, e.g.
+        ``["similarity.matrix", "best_match"]``.
+    flush : bool, default=True
+        Flush after every result. Disable for slightly better throughput and
+        compression when durability per pair does not matter.
+
+    Examples
+    --------
+    >>> with JsonLinesResultWriter("results.jsonl.gz",
+    ...                            drop_internals_fields=["similarity.matrix"]) as sink:
+    ...     for result in compute_vcs_corpus(pairs, segmenter, embedder,
+    ...                                      return_internals=True):
+    ...         sink.write(result)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        internals_fields: Optional[Sequence[str]] = None,
+        drop_internals_fields: Sequence[str] = (),
+        flush: bool = True,
+    ):
+        self.path = path
+        self.internals_fields = list(internals_fields) if internals_fields is not None else None
+        self.drop_internals_fields = list(drop_internals_fields)
+        self.flush = flush
+        self.rows = 0
+        self._encode = _json_encoder()
+        if compression is None and path != "-":
+            compression = _compression_for(path)
+        if path == "-":
+            if compression is not None:
+                raise ValueError("Compressed output cannot go to stdout.")
+            self._fh: IO[bytes] = sys.stdout.buffer
+        else:
+            self._fh = _open_compressed(path, compression, compression_level)
+
+    def write(self, result: Dict[str, Any]) -> None:
+        """Encode ``result`` as one line, trimming its internals as configured."""
+        internals = result.get("internals")
+        if internals is not None and (self.internals_fields is not None or self.drop_internals_fields):
+            result = {
+                **result,
+                "internals": _select_fields(internals, self.internals_fields, self.drop_internals_fields),
+            }
+        self._fh.write(self._encode(result) + b"\n")
+        self.rows += 1
+        if self.flush:
+            self._fh.flush()
+
+    def close(self) -> None:
+        if self._fh is sys.stdout.buffer:
+            self._fh.flush()
+        elif not self._fh.closed:
+            self._fh.close()
+
+    def __enter__(self) -> "JsonLinesResultWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def write_results_jsonl(results: Iterable[Dict[str, Any]], path: str, **options: Any) -> int:
+    """Write a stream of result dicts to a JSON-lines file, one flushed line each.
+
+    Parameters
+    ----------
+    results : iterable of dict
+        Results, e.g. the generator returned by :func:`compute_vcs_corpus`.
+    path : str
+        Output file (``.gz``/``.zst`` for compression) or ``"-"`` for stdout.
+    **options
+        Passed to :class:`JsonLinesResultWriter` (``compression``,
+        ``internals_fields``, ``drop_internals_fields``, ...).
+
+    Returns
+    -------
+    int
+        Number of results written.
+    """
+    with JsonLinesResultWriter(path, **options) as writer:
+        for result in results:
+            writer.write(result)
+    return writer.rows
@@ -1,7 +1,14 @@
-from ._segmenting import _segment_and_chunk_texts, _group_segments, _build_similarity_matrix
+from ._segmenting import _segment_and_chunk_texts, _group_segments, _build_similarity_matrix, _similarity_from_embeddings, _similarity_top_k, _as_embedding_tensor
+from ._segmenting import _prepare_embeddings, _resolve_embedding_dtype, _embed_unique
 
 __all__ = [
     "_segment_and_chunk_texts",
     "_group_segments",
-    "_build_similarity_matrix"
+    "_build_similarity_matrix",
+    "_similarity_from_embeddings",
+    "_similarity_top_k",
+    "_as_embedding_tensor",
+    "_prepare_embeddings",
+    "_resolve_embedding_dtype",
+    "_embed_unique",
 ]
\ No newline at end of file
@@ -1,6 +1,10 @@
+import warnings
+
 import numpy as np
 import torch
-from typing import List, Tuple, Callable
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_EMBEDDING_DTYPES = {"float32": torch.float32, "float16": torch.float16}
 
 def _segment_and_chunk_texts(
     reference_text: str, 
@@ -23,10 +27,121 @@ def _group_segments(segments: List[str], chunk_size: int) -> List[str]:
 def _build_similarity_matrix(
     ref_chunks: List[str],
     gen_chunks: List[str],
-    embedding_fn: Callable
+    embedding_fn: Callable,
+    normalize: bool = False,
+    dtype: Optional[torch.dtype] = None
 ) -> Tuple[np.ndarray, int, int]:
     
-    ref_tensor = embedding_fn(ref_chunks)
-    gen_tensor = embedding_fn(gen_chunks)
-    sim_matrix = torch.matmul(ref_tensor, gen_tensor.T).cpu().numpy()
-    return sim_matrix, len(ref_chunks), len(gen_chunks)
\ No newline at end of file
+    embeddings = _embed_unique(embedding_fn, ref_chunks + gen_chunks)
+    ref_tensor, gen_tensor = embeddings[:len(ref_chunks)], embeddings[len(ref_chunks):]
+    sim_matrix = _similarity_from_embeddings(ref_tensor, gen_tensor, normalize, dtype)
+    return sim_matrix, len(ref_chunks), len(gen_chunks)
+
+def _embed_unique(embedding_fn: Callable, texts: List[str]) -> Any:
+    # Narratives repeat sentences verbatim; each distinct text is embedded
+    # once and its row repeated at every position it occurs.
+    positions: Dict[str, int] = {}
+    inverse = [positions.setdefault(text, len(positions)) for text in texts]
+    if len(positions) == len(texts):
+        return embedding_fn(texts)
+    rows = embedding_fn(list(positions))
+    if isinstance(rows, torch.Tensor):
+        return rows.index_select(0, torch.tensor(inverse, device=rows.device))
+    return rows[np.asarray(inverse)]
+
+def _as_embedding_tensor(embeddings: Any) -> torch.Tensor:
+    # Shares memory with numpy arrays and DLPack producers (CuPy, JAX, ...);
+    # only plain sequences are copied.
+    if isinstance(embeddings, torch.Tensor):
+        return embeddings
+    if isinstance(embeddings, np.ndarray):
+        with warnings.catch_warnings():
+            # Read-only arrays (e.g. memory maps) are fine: they are never written.
+            warnings.simplefilter("ignore", UserWarning)
+            return torch.from_numpy(embeddings)
+    if hasattr(embeddings, "__dlpack__"):
+        return torch.from_dlpack(embeddings)
+    return torch.from_numpy(np.asarray(embeddings))
+
+def _resolve_embedding_dtype(dtype: Any) -> Optional[torch.dtype]:
+    if dtype is None:
+        return None
+    try:
+        name = str(dtype).replace("torch.", "") if isinstance(dtype, torch.dtype) else np.dtype(dtype).name
+    except TypeError:
+        name = str(dtype)
+    if name not in _EMBEDDING_DTYPES:
+        raise ValueError(f"dtype must be None, 'float32' or 'float16', got {dtype!r}.")
+    return _EMBEDDING_DTYPES[name]
+
+def _prepare_embeddings(
+    tensor: torch.Tensor,
+    normalize: bool,
+    dtype: Optional[torch.dtype]
+) -> torch.Tensor:
+    # At most one new tensor per batch: a dtype conversion is normalized in
+    # place; without one, the caller's (possibly cached) embeddings are not
+    # modified. Norms are taken in the input precision.
+    norms = None
+    if normalize:
+        norms = torch.linalg.vector_norm(tensor, dim=-1, keepdim=True).clamp_min_(1e-12)
+    if dtype is not None and tensor.dtype != dtype:
+        tensor = tensor.to(dtype)
+        if norms is not None:
+            tensor.div_(norms.to(dtype))
+    elif norms is not None:
+        tensor = tensor / norms
+    return tensor
+
+def _similarity_from_embeddings(
+    ref_tensor: torch.Tensor,
+    gen_tensor: torch.Tensor,
+    normalize: bool = False,
+    dtype: Optional[torch.dtype] = None,
+    workspace=None
+) -> np.ndarray:
+    ref_tensor = _prepare_embeddings(ref_tensor, normalize, dtype)
+    gen_tensor = _prepare_embeddings(gen_tensor, normalize, dtype)
+    if workspace is not None and _can_matmul_into(ref_tensor, gen_tensor):
+        # Written into the workspace buffer; the returned array is a view of
+        # it and only valid until the next pair scored with this workspace.
+        out = workspace.tensor(
+            "similarity", (ref_tensor.shape[0], gen_tensor.shape[0]), ref_tensor.dtype, ref_tensor.device
+        )
+        return torch.matmul(ref_tensor, gen_tensor.T, out=out).numpy()
+    return torch.matmul(ref_tensor, gen_tensor.T).cpu().numpy()
+
+def _can_matmul_into(ref_tensor: torch.Tensor, gen_tensor: torch.Tensor) -> bool:
+    # out= needs matching 2-D operands without autograd; only CPU results can
+    # be viewed as numpy arrays without a copy.
+    return (
+        ref_tensor.dim() == 2 and gen_tensor.dim() == 2
+        and ref_tensor.device.type == "cpu" and gen_tensor.device == ref_tensor.device
+        and ref_tensor.dtype == gen_tensor.dtype
+        and not (ref_tensor.requires_grad or gen_tensor.requires_grad)
+    )
+
+def _similarity_top_k(sim_matrix: np.ndarray, k: int) -> Dict[str, Any]:
+    ref_len, gen_len = sim_matrix.shape
+    return {
+        "k": k,
+        "shape": [ref_len, gen_len],
+        "reference": _top_k_rows(sim_matrix, k),
+        "generated": _top_k_rows(sim_matrix.T, k),
+    }
+
+def _top_k_rows(scores: np.ndarray, k: int) -> Dict[str, np.ndarray]:
+    # Partial sort: only the k best of each row are ordered, highest first and
+    # equal values by index. Which of several values tied at the cut-off are
+    # kept is up to argpartition.
+    n, m = scores.shape
+    k = min(k, m)
+    if k == 0:
+        return {"indices": np.zeros((n, 0), dtype=np.int64), "values": np.zeros((n, 0), dtype=scores.dtype)}
+    indices = np.argpartition(-scores, k - 1, axis=1)[:, :k] if k < m else np.tile(np.arange(m), (n, 1))
+    values = np.take_along_axis(scores, indices, axis=1)
+    order = np.lexsort((indices, -values), axis=1)
+    return {
+        "indices": np.take_along_axis(indices, order, axis=1).astype(np.int64),
+        "values": np.take_along_axis(values, order, axis=1),
+    }
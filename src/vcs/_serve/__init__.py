@@ -0,0 +1,12 @@
+"""
+Local HTTP scoring server with dynamic embedding batching (``vcs serve``).
+"""
+
+from ._batching import _EmbeddingBatcher
+from ._server import ScoringServer, create_scoring_server
+
+__all__ = [
+    "ScoringServer",
+    "create_scoring_server",
+    "_EmbeddingBatcher",
+]
@@ -0,0 +1,106 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+from .._segmenting import _embed_unique
+
+
+class _PendingEmbedding:
+    __slots__ = ("texts", "done", "result", "error")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _EmbeddingBatcher:
+    """Coalesces concurrent embedding calls into shared batches.
+
+    Calling the batcher from any thread enqueues the texts and blocks. A single
+    worker thread takes the first waiting call, keeps collecting calls for up
+    to ``max_wait`` seconds or until ``max_batch_size`` texts are gathered,
+    embeds every distinct text with one ``embedding_fn`` call and hands each
+    caller its own rows. A call larger than ``max_batch_size`` is embedded on its own.
+    If a shared call fails, each caller's texts are embedded again on their
+    own, so an error only reaches the caller whose texts caused it.
+    """
+
+    def __init__(
+        self,
+        embedding_fn: Callable[[List[str]], Any],
+        max_batch_size: int = 256,
+        max_wait: float = 0.005,
+    ):
+        self.embedding_fn = embedding_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.texts = 0
+        self._queue: "queue.Queue[Optional[_PendingEmbedding]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="vcs-embedding-batcher", daemon=True)
+        self._thread.start()
+
+    def __call__(self, texts: List[str]) -> Any:
+        pending = _PendingEmbedding(list(texts))
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            count = len(first.texts)
+            deadline = time.monotonic() + self.max_wait
+            while count < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+                count += len(item.texts)
+            self._embed(batch)
+
+    def _embed(self, batch: List[_PendingEmbedding]) -> None:
+        try:
+            # Concurrent requests often share texts; each is embedded once.
+            embeddings = _embed_unique(self.embedding_fn, [text for pending in batch for text in pending.texts])
+        except BaseException as exc:
+            if len(batch) == 1:
+                batch[0].error = exc
+                batch[0].done.set()
+                return
+            # One bad request must not fail the others it was batched with:
+            # embed each request on its own so only the offending one errors.
+            for pending in batch:
+                self._embed([pending])
+            return
+        offset = 0
+        for pending in batch:
+            pending.result = embeddings[offset:offset + len(pending.texts)]
+            offset += len(pending.texts)
+            pending.done.set()
+        self.batches += 1
+        self.texts += offset
@@ -0,0 +1,275 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import torch
+
+from .._config import (
+    DEFAULT_CONTEXT_CUTOFF_VALUE,
+    DEFAULT_CONTEXT_WINDOW_CONTROL,
+    DEFAULT_LCT,
+    DEFAULT_CHUNK_SIZE,
+)
+from .._corpus import _normalize_pair
+from .._instrumentation import MetricsRegistry, enable_metrics
+from .._utils import _json_default
+from ..scorer import Scorer
+from ._batching import _EmbeddingBatcher
+
+
+class _Overloaded(Exception):
+    pass
+
+
+class _BadRequest(Exception):
+    pass
+
+
+class _ScoringService:
+    """Shared state of a scoring server: warm embedders, batchers and admission control.
+
+    At most ``max_in_flight`` requests are scored at once. Up to
+    ``max_queued`` more wait for a slot, each for at most ``queue_timeout``
+    seconds; anything beyond that is rejected immediately so clients can back
+    off instead of piling up.
+    """
+
+    def __init__(
+        self,
+        segmenter_fn: Callable[[str], List[str]],
+        embedding_fn_las: Callable[[List[str]], torch.Tensor],
+        embedding_fn_gas: Optional[Callable[[List[str]], torch.Tensor]],
+        config: Dict[str, Any],
+        max_batch_size: int,
+        max_wait: float,
+        max_in_flight: int,
+        max_queued: int,
+        queue_timeout: float,
+        metrics: Optional[MetricsRegistry],
+    ):
+        self.segmenter_fn = segmenter_fn
+        self.config = config
+        self.batcher_las = _EmbeddingBatcher(embedding_fn_las, max_batch_size, max_wait)
+        self.batcher_gas = (
+            _EmbeddingBatcher(embedding_fn_gas, max_batch_size, max_wait)
+            if embedding_fn_gas is not None else None
+        )
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.metrics = metrics
+        self.in_flight = 0
+        self.queued = 0
+        self.rejected = 0
+        self._slots = threading.Semaphore(max_in_flight)
+        self._lock = threading.Lock()
+        # One scorer, and so one set of reusable buffers, per in-flight slot
+        self._scorers = [
+            Scorer(segmenter_fn, self.batcher_las, self.batcher_gas, **config)
+            for _ in range(max_in_flight)
+        ]
+
+    def _acquire(self) -> None:
+        if self._slots.acquire(blocking=False):
+            with self._lock:
+                self.in_flight += 1
+            return
+        with self._lock:
+            if self.queued >= self.max_queued:
+                self.rejected += 1
+                raise _Overloaded()
+            self.queued += 1
+        acquired = self._slots.acquire(timeout=self.queue_timeout)
+        with self._lock:
+            self.queued -= 1
+            if acquired:
+                self.in_flight += 1
+            else:
+                self.rejected += 1
+        if not acquired:
+            raise _Overloaded()
+
+    def _release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def score(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        # Only a malformed request is the client's fault (400); anything the
+        # embedders or the scoring raise afterwards is a server error (500).
+        try:
+            pair_id, reference_text, generated_text = _normalize_pair(payload, "in request")
+        except KeyError as exc:
+            raise _BadRequest(exc.args[0]) from exc
+        except (ValueError, TypeError) as exc:
+            raise _BadRequest(str(exc)) from exc
+        if not isinstance(reference_text, str) or not isinstance(generated_text, str):
+            raise _BadRequest("'reference' and 'generated' must be strings.")
+        self._acquire()
+        with self._lock:
+            scorer = self._scorers.pop()
+        try:
+            scores = scorer.score(
+                reference_text, generated_text,
+                return_all_metrics=bool(payload.get("return_all_metrics", False)),
+            )
+        finally:
+            with self._lock:
+                self._scorers.append(scorer)
+            self._release()
+        return {"id": pair_id, **scores} if "id" in payload else scores
+
+    def health(self) -> Dict[str, Any]:
+        batchers = [b for b in (self.batcher_las, self.batcher_gas) if b is not None]
+        batches = sum(b.batches for b in batchers)
+        texts = sum(b.texts for b in batchers)
+        return {
+            "status": "ok",
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "max_in_flight": self.max_in_flight,
+            "embedding_queue_depth": sum(b.queue_depth for b in batchers),
+            "embedding_batches": batches,
+            "embedded_texts": texts,
+            "mean_embedding_batch_size": texts / batches if batches else 0.0,
+            "config": self.config,
+        }
+
+    def close(self) -> None:
+        for batcher in (self.batcher_las, self.batcher_gas):
+            if batcher is not None:
+                batcher.close()
+
+
+class _ScoringRequestHandler(BaseHTTPRequestHandler):
+    server: "ScoringServer"
+
+    def _send_json(self, status: int, body: Dict[str, Any], headers: Tuple[Tuple[str, str], ...] = ()) -> None:
+        data = json.dumps(body, default=_json_default).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        service = self.server.service
+        path = self.path.split("?")[0]
+        if path == "/health":
+            self._send_json(200, service.health())
+        elif path == "/metrics" and service.metrics is not None:
+            data = service.metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        else:
+            self._send_json(404, {"error": f"Unknown path {path!r}."})
+
+    def do_POST(self) -> None:
+        if self.path.split("?")[0] != "/score":
+            self._send_json(404, {"error": f"Unknown path {self.path!r}."})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > self.server.max_body_bytes:
+            self._send_json(413, {"error": f"Request body exceeds {self.server.max_body_bytes} bytes."})
+            return
+        try:
+            try:
+                payload = json.loads(self.rfile.read(length))
+            except ValueError as exc:
+                raise _BadRequest(f"Request body is not valid JSON: {exc}") from exc
+            if not isinstance(payload, dict):
+                raise _BadRequest("Request body must be a JSON object.")
+            scores = self.server.service.score(payload)
+        except _Overloaded:
+            self._send_json(503, {"error": "Server is at capacity, retry later."},
+                            headers=(("Retry-After", "1"),))
+        except _BadRequest as exc:
+            self._send_json(400, {"error": str(exc)})
+        except Exception as exc:
+            self._send_json(500, {"error": f"{type(exc).__name__}: {exc}"})
+        else:
+            self._send_json(200, scores)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ScoringServer(ThreadingHTTPServer):
+    """HTTP server exposing ``POST /score``, ``GET /health`` and, with metrics, ``GET /metrics``."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: _ScoringService,
+                 max_body_bytes: int, verbose: bool):
+        super().__init__(address, _ScoringRequestHandler)
+        self.service = service
+        self.max_body_bytes = max_body_bytes
+        self.verbose = verbose
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.service.close()
+
+
+def create_scoring_server(
+    segmenter_fn: Callable[[str], List[str]],
+    embedding_fn_las: Callable[[List[str]], torch.Tensor],
+    embedding_fn_gas: Optional[Callable[[List[str]], torch.Tensor]] = None,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    context_cutoff_value: float = DEFAULT_CONTEXT_CUTOFF_VALUE,
+    context_window_control: float = DEFAULT_CONTEXT_WINDOW_CONTROL,
+    lct: int = DEFAULT_LCT,
+    max_batch_size: int = 256,
+    max_wait: float = 0.005,
+    max_in_flight: int = 8,
+    max_queued: int = 64,
+    queue_timeout: float = 5.0,
+    max_body_bytes: int = 16 * 2**20,
+    metrics: Optional[MetricsRegistry] = None,
+    warmup: bool = True,
+    verbose: bool = False,
+) -> ScoringServer:
+    """Build a local scoring server; call ``serve_forever()`` to run it.
+
+    Every request is scored in its own thread, by one of ``max_in_flight``
+    :class:`Scorer` objects whose buffers are reused across requests, but the
+    embedding calls of concurrent requests are coalesced into shared
+    batches of up to ``max_batch_size`` texts, waiting at most ``max_wait``
+    seconds for company. The embedders are called once on start-up
+    (``warmup``) so the first request does not pay for lazy model loading.
+
+    ``POST /score`` takes ``{"reference": ..., "generated": ..., "id": ...,
+    "return_all_metrics": false}`` and returns the scores. When the server is
+    at capacity it answers ``503`` with ``Retry-After``.
+
+    With ``metrics``, the registry is enabled for this process (see
+    :func:`enable_metrics`), so every scoring call updates it, and it is
+    served at ``GET /metrics``. It replaces any registry enabled before.
+    """
+    if metrics is not None:
+        enable_metrics(metrics)
+    if warmup:
+        embedding_fn_las(["warm-up"])
+        if embedding_fn_gas is not None and embedding_fn_gas is not embedding_fn_las:
+            embedding_fn_gas(["warm-up"])
+    service = _ScoringService(
+        segmenter_fn, embedding_fn_las, embedding_fn_gas,
+        {
+            "chunk_size": chunk_size,
+            "context_cutoff_value": context_cutoff_value,
+            "context_window_control": context_window_control,
+            "lct": lct,
+        },
+        max_batch_size, max_wait, max_in_flight, max_queued, queue_timeout, metrics,
+    )
+    return ScoringServer((host, port), service, max_body_bytes, verbose)
@@ -3,10 +3,24 @@ Generic utilities for VCS calculations.
 """
 
 from ._utils import _calculate_f1, _compute_gas_las_scaled, _compute_vcs_scaled, _validate_seg_embed_functions
+from ._hashing import _text_sha256
+from ._loading import _load_object
+from ._json import _json_default
+from ._atomic import _atomic_write, _atomic_write_bytes, _fsync_directory
+from ._fingerprint import _pipeline_fingerprint, _config_sha256, _pair_key
 
 __all__ = [
     "_calculate_f1",
     "_compute_gas_las_scaled",
     "_compute_vcs_scaled",
-    "_validate_seg_embed_functions"
+    "_validate_seg_embed_functions",
+    "_text_sha256",
+    "_load_object",
+    "_json_default",
+    "_atomic_write",
+    "_atomic_write_bytes",
+    "_fsync_directory",
+    "_pipeline_fingerprint",
+    "_config_sha256",
+    "_pair_key",
 ]
\ No newline at end of file
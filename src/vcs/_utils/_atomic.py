@@ -0,0 +1,45 @@
+import os
+import tempfile
+from typing import BinaryIO, Callable
+
+
+def _fsync_directory(directory: str) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _atomic_write(path: str, write: Callable[[BinaryIO], None]) -> None:
+    """Replace ``path`` with what ``write`` writes so readers see either the old or the new file.
+
+    ``write`` receives a temporary file in the same directory, which is
+    fsynced and then renamed over ``path``; a crash or an exception at any
+    point leaves no partial file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            write(fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+def _atomic_write_bytes(path: str, data: bytes) -> None:
+    """Replace ``path`` with ``data``, as :func:`_atomic_write`."""
+    _atomic_write(path, lambda fh: fh.write(data))
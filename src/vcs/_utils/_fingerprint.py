@@ -0,0 +1,64 @@
+import hashlib
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import torch
+
+_PROBE_TEXTS = [
+    "A man walks into the kitchen and opens the fridge.",
+    "Later, two children play football in a park at sunset.",
+    "The camera pans across a crowded street market.",
+]
+_PROBE_DOCUMENT = " ".join(_PROBE_TEXTS)
+
+# Probe embeddings are rounded before hashing so that bit-level run-to-run
+# noise (e.g. non-deterministic GPU kernels) does not change the fingerprint.
+_PROBE_DECIMALS = 4
+
+
+def _embedding_fingerprint(embedding_fn: Callable[[List[str]], torch.Tensor]) -> str:
+    """Hash of the embeddings ``embedding_fn`` gives a fixed set of probe texts."""
+    output = embedding_fn(list(_PROBE_TEXTS))
+    if isinstance(output, torch.Tensor):
+        output = output.detach().cpu().numpy()
+    values = np.round(np.asarray(output, dtype=np.float64), _PROBE_DECIMALS) + 0.0
+    digest = hashlib.sha256(str(values.shape).encode("ascii"))
+    digest.update(values.tobytes())
+    return digest.hexdigest()
+
+
+def _segmenter_fingerprint(segmenter_fn: Callable[[str], List[str]]) -> str:
+    """Hash of the segments ``segmenter_fn`` produces for a fixed probe document."""
+    segments = [str(segment) for segment in segmenter_fn(_PROBE_DOCUMENT)]
+    return hashlib.sha256(json.dumps(segments).encode("utf-8")).hexdigest()
+
+
+def _pipeline_fingerprint(
+    segmenter_fn: Callable[[str], List[str]],
+    embedding_fn_las: Callable[[List[str]], torch.Tensor],
+    embedding_fn_gas: Optional[Callable[[List[str]], torch.Tensor]] = None,
+) -> str:
+    """Identify a segmenter/embedder combination by its behaviour on probe inputs.
+
+    Two pipelines that segment and embed the probes identically get the same
+    fingerprint, whatever their function names; updating model weights
+    changes it.
+    """
+    parts = [
+        _segmenter_fingerprint(segmenter_fn),
+        _embedding_fingerprint(embedding_fn_las),
+        _embedding_fingerprint(embedding_fn_gas) if embedding_fn_gas is not None else "",
+    ]
+    return hashlib.sha256("|".join(parts).encode("ascii")).hexdigest()
+
+
+def _config_sha256(config: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _pair_key(reference_sha256: str, generated_sha256: str, config_sha256: str, fingerprint: str) -> str:
+    """Content key of one scored pair: texts, scoring config and model identity."""
+    return hashlib.sha256("|".join((
+        reference_sha256, generated_sha256, config_sha256, fingerprint
+    )).encode("ascii")).hexdigest()
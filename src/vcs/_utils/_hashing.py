@@ -0,0 +1,5 @@
+import hashlib
+
+
+def _text_sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
@@ -0,0 +1,17 @@
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import numpy as np
+
+
+def _json_default(obj: Any) -> Any:
+    """``json.dumps`` fallback for numpy scalars and arrays and lazy internals views."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, Sequence) and not isinstance(obj, (str, bytes)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
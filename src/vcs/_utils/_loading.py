@@ -0,0 +1,19 @@
+import importlib
+from typing import Any
+
+
+def _load_object(spec: str) -> Any:
+    """Import ``'package.module:attribute'`` (dots allowed in the attribute)."""
+    module_name, sep, attribute = spec.partition(":")
+    if not sep or not module_name or not attribute:
+        raise ValueError(f"Expected 'module:attribute', got {spec!r}.")
+    try:
+        obj = importlib.import_module(module_name)
+    except ImportError as exc:
+        raise ValueError(f"Cannot import module {module_name!r} from {spec!r}: {exc}") from exc
+    for name in attribute.split("."):
+        try:
+            obj = getattr(obj, name)
+        except AttributeError:
+            raise ValueError(f"{module_name!r} has no attribute {attribute!r}.") from None
+    return obj
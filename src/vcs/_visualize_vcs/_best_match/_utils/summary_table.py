@@ -55,7 +55,7 @@ def _create_precision_matches_table(precision_matches: List, precision_sim_value
     )
     
     # Add rows for each precision match
-    if precision_matches:
+    if len(precision_matches) > 0:
         for g_idx, r_idx in precision_matches:
             # Get similarity value
             sim_value = precision_sim_values[g_idx] if g_idx < len(precision_sim_values) else 0.0
@@ -83,7 +83,7 @@ def _create_recall_matches_table(recall_matches: List, recall_sim_values: List,
     )
     
     # Add rows for each recall match
-    if recall_matches:
+    if len(recall_matches) > 0:
         for g_idx, r_idx in recall_matches:
             # Get similarity value
             sim_value = recall_sim_values[r_idx] if r_idx < len(recall_sim_values) else 0.0
@@ -4,7 +4,7 @@ from typing import List, Tuple, Any, Dict
 def plot_actual_path(ax: plt.Axes, aligned_segments: List[Tuple], color: str = 'b', 
                     label: str = 'Actual Line', swap_coords: bool = False) -> None:
     """Plot the actual alignment path."""
-    if not aligned_segments:
+    if len(aligned_segments) == 0:
         return
         
     if swap_coords:
@@ -21,7 +21,7 @@ def plot_actual_path(ax: plt.Axes, aligned_segments: List[Tuple], color: str = '
 def plot_floor_path(ax: plt.Axes, floor_path: List[Tuple], 
                    label: str = 'Floor Ideal (Shortest Path)', swap_coords: bool = False) -> None:
     """Plot the floor (shortest) ideal path."""
-    if not floor_path:
+    if len(floor_path) == 0:
         return
         
     if swap_coords:
@@ -38,7 +38,7 @@ def plot_floor_path(ax: plt.Axes, floor_path: List[Tuple],
 def plot_ceiling_path(ax: plt.Axes, ceil_path: List[Tuple], 
                      label: str = 'Ceiling Ideal (Longest Path)', swap_coords: bool = False) -> None:
     """Plot the ceiling (longest) ideal path."""
-    if not ceil_path:
+    if len(ceil_path) == 0:
         return
         
     if swap_coords:
@@ -29,12 +29,12 @@ def draw_recall_content(ax: plt.Axes, internals: Dict[str, Any],
         
         # Plot floor path if it exists
         floor_path = recall_line_data.get('floor_path', [])
-        if floor_path:
+        if len(floor_path) > 0:
             plot_floor_path(ax, floor_path, swap_coords=True)
         
         # Plot ceiling path if it exists
         ceil_path = recall_line_data.get('ceil_path', [])
-        if ceil_path:
+        if len(ceil_path) > 0:
             plot_ceiling_path(ax, ceil_path, swap_coords=True)
         
         # Add metrics text box
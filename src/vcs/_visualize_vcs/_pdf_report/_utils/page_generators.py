@@ -250,7 +250,7 @@ def _generate_precision_summary_pages(text_data: Dict[str, Any], pdf: PdfPages,
     """Generate precision summary pages with proper figure management."""
     precision_matches = text_data['precision_matches']
     
-    if precision_matches:
+    if len(precision_matches) > 0:
         return _generate_match_summary_pages(
             precision_matches,
             text_data['ref_chunks'],
@@ -279,7 +279,7 @@ def _generate_recall_summary_pages(text_data: Dict[str, Any], pdf: PdfPages, sta
     """Generate recall summary pages with proper figure management."""
     recall_matches = text_data['recall_matches']
     
-    if recall_matches:
+    if len(recall_matches) > 0:
         return _generate_match_summary_pages(
             recall_matches,
             text_data['ref_chunks'],
@@ -158,8 +158,8 @@ def estimate_best_match_pages(internals: Dict[str, Any]) -> int:
     # Estimate pages (4 segments per detail page, 25 matches per summary page)
     precision_detail_pages = max(1, (len(precision_segments) + 3) // 4) if precision_segments else 0
     recall_detail_pages = max(1, (len(recall_segments) + 3) // 4) if recall_segments else 0
-    precision_match_pages = max(1, (len(precision_matches) + 24) // 25) if precision_matches else 1
-    recall_match_pages = max(1, (len(recall_matches) + 24) // 25) if recall_matches else 1
+    precision_match_pages = max(1, (len(precision_matches) + 24) // 25) if len(precision_matches) > 0 else 1
+    recall_match_pages = max(1, (len(recall_matches) + 24) // 25) if len(recall_matches) > 0 else 1
     
     return precision_detail_pages + recall_detail_pages + precision_match_pages + recall_match_pages
 
@@ -3,6 +3,7 @@ from .matrix_scaling import (
     setup_axis_ticks
 )
 from .annotation_handler import create_similarity_heatmap
+from .sketch_handling import similarity_matrix_from_internals
 from .match_highlighting import (
     should_show_matches, highlight_precision_matches, highlight_recall_matches,
     create_matrix_title, highlight_all_matches
@@ -18,6 +19,9 @@ __all__ = [
     # Annotation handling
     "create_similarity_heatmap",
     
+    # Top-k sketches
+    "similarity_matrix_from_internals",
+    
     # Match highlighting
     "should_show_matches",
     "highlight_precision_matches",
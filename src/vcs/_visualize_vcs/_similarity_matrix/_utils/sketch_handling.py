@@ -0,0 +1,22 @@
+import numpy as np
+from typing import Any, Dict, Optional, Tuple
+
+def similarity_matrix_from_internals(similarity: Dict[str, Any]) -> Tuple[np.ndarray, Optional[int]]:
+    """Return the similarity matrix and, for a top-k sketch, its ``k``.
+
+    A sketch is expanded to a full-size matrix holding the stored top-k cells
+    of both directions; all other cells are NaN and drawn blank.
+    """
+    if 'matrix' in similarity:
+        return np.array(similarity['matrix']), None
+
+    top_k = similarity['top_k']
+    ref_len, gen_len = top_k['shape']
+    sim_matrix = np.full((ref_len, gen_len), np.nan)
+    ref_indices = np.asarray(top_k['reference']['indices'], dtype=np.int64).reshape(ref_len, -1)
+    ref_values = np.asarray(top_k['reference']['values'], dtype=np.float64).reshape(ref_len, -1)
+    sim_matrix[np.arange(ref_len)[:, None], ref_indices] = ref_values
+    gen_indices = np.asarray(top_k['generated']['indices'], dtype=np.int64).reshape(gen_len, -1)
+    gen_values = np.asarray(top_k['generated']['values'], dtype=np.float64).reshape(gen_len, -1)
+    sim_matrix[gen_indices, np.arange(gen_len)[:, None]] = gen_values
+    return sim_matrix, top_k['k']
@@ -1,9 +1,9 @@
 import matplotlib.pyplot as plt
-import numpy as np
 from typing import Dict, Any
 from ._utils import (
     determine_matrix_size, calculate_figure_size, calculate_tick_steps, setup_axis_ticks,
-    create_similarity_heatmap, should_show_matches, highlight_all_matches, create_matrix_title
+    create_similarity_heatmap, should_show_matches, highlight_all_matches, create_matrix_title,
+    similarity_matrix_from_internals
 )
 
 def visualize_similarity_matrix(internals: Dict[str, Any]) -> plt.Figure:
@@ -48,6 +48,8 @@ def visualize_similarity_matrix(internals: Dict[str, Any]) -> plt.Figure:
     * Blue boxes highlight recall matches (reference → generated)  
     * For very large matrices (>100x100), matches may not be shown for clarity
     * Values range from 0.0 (no similarity) to 1.0 (identical)
+    * Internals computed with ``similarity_top_k`` only hold each chunk's top-k
+      similarities; those cells are drawn and the others left blank
     
     See Also
     --------
@@ -56,7 +58,7 @@ def visualize_similarity_matrix(internals: Dict[str, Any]) -> plt.Figure:
     visualize_mapping_windows : See alignment constraints applied
     """
     # Extract data
-    sim_matrix = np.array(internals['similarity']['matrix'])
+    sim_matrix, top_k = similarity_matrix_from_internals(internals['similarity'])
     ref_len = internals['texts']['reference_length']
     gen_len = internals['texts']['generated_length']
     precision_matches = internals['alignment']['precision']['matches']
@@ -85,6 +87,8 @@ def visualize_similarity_matrix(internals: Dict[str, Any]) -> plt.Figure:
     ax.set_ylabel('Reference Text Segments')
     
     title = create_matrix_title(ref_len, gen_len, precision_matches, recall_matches, show_matches)
+    if top_k is not None:
+        title += f'\nTop-{top_k} sketch: cells outside each chunk\'s top {top_k} are blank'
     ax.set_title(title)
     
     # Apply layout
@@ -0,0 +1,9 @@
+"""
+Scratch buffers reused across scoring calls.
+"""
+
+from ._workspace import _Workspace
+
+__all__ = [
+    "_Workspace",
+]
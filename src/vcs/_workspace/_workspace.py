@@ -0,0 +1,72 @@
+import math
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import torch
+
+# A buffer that has to grow is grown by at least this factor, so pairs of
+# slowly increasing size do not reallocate on every call.
+_GROWTH = 1.5
+
+
+class _Workspace:
+    """Named scratch buffers reused across scoring calls.
+
+    Each name owns one flat buffer; a request returns a view of its first
+    ``prod(shape)`` elements, reallocating only when the buffer is too small
+    or of another dtype. A view is only valid until the next request for the
+    same name, so nothing handed back to callers may alias one. Buffers larger
+    than ``max_bytes`` are allocated per request and not kept.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.allocations = 0
+        self._buffers: Dict[str, Union[np.ndarray, torch.Tensor]] = {}
+
+    def array(self, name: str, shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        size = math.prod(shape)
+        buffer = self._buffers.get(name)
+        same_kind = isinstance(buffer, np.ndarray) and buffer.dtype == dtype
+        if not (same_kind and buffer.size >= size):
+            self.allocations += 1
+            if self.max_bytes is not None and size * dtype.itemsize > self.max_bytes:
+                return np.empty(shape, dtype=dtype)
+            capacity = max(size, int(_GROWTH * buffer.size) if same_kind else 0)
+            if self.max_bytes is not None and capacity * dtype.itemsize > self.max_bytes:
+                capacity = size
+            buffer = np.empty(capacity, dtype=dtype)
+            self._buffers[name] = buffer
+        return buffer[:size].reshape(shape)
+
+    def full(self, name: str, shape: Tuple[int, ...], fill_value: float, dtype: np.dtype) -> np.ndarray:
+        out = self.array(name, shape, dtype)
+        out.fill(fill_value)
+        return out
+
+    def tensor(self, name: str, shape: Tuple[int, ...], dtype: torch.dtype, device: torch.device) -> torch.Tensor:
+        size = math.prod(shape)
+        buffer = self._buffers.get(name)
+        same_kind = isinstance(buffer, torch.Tensor) and buffer.dtype == dtype and buffer.device == device
+        if not (same_kind and buffer.numel() >= size):
+            self.allocations += 1
+            itemsize = torch.empty((), dtype=dtype).element_size()
+            if self.max_bytes is not None and size * itemsize > self.max_bytes:
+                return torch.empty(shape, dtype=dtype, device=device)
+            capacity = max(size, int(_GROWTH * buffer.numel()) if same_kind else 0)
+            if self.max_bytes is not None and capacity * itemsize > self.max_bytes:
+                capacity = size
+            buffer = torch.empty(capacity, dtype=dtype, device=device)
+            self._buffers[name] = buffer
+        return buffer[:size].view(shape)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            buffer.numel() * buffer.element_size() if isinstance(buffer, torch.Tensor) else buffer.nbytes
+            for buffer in self._buffers.values()
+        )
+
+    def clear(self) -> None:
+        self._buffers.clear()
@@ -3,7 +3,8 @@ from typing import List, Callable, Dict, Any
 import numpy as np
 import torch
 
-from typing import List, Callable, Dict, Any
+import threading
+from typing import List, Callable, Dict, Any, Optional, Tuple
 import numpy as np
 import torch
 
@@ -14,12 +15,19 @@ from ._config import (
     DEFAULT_CHUNK_SIZE,
 )
 from ._utils import _validate_seg_embed_functions
-from ._segmenting import _segment_and_chunk_texts, _build_similarity_matrix
+from ._segmenting import (
+    _segment_and_chunk_texts, _similarity_from_embeddings, _similarity_top_k, _as_embedding_tensor,
+    _resolve_embedding_dtype, _prepare_embeddings, _embed_unique,
+)
+from ._instrumentation import _Instrument, _NULL_INSTRUMENT, _MemoryTracker, _active_hooks
+from ._caching import ResultCache
 from ._mapping_windows import _get_mapping_windows
 from ._matching import _calculate_row_col_matches_context
+from ._workspace import _Workspace
 
 from ._metrics import (
     _compute_gas_metrics,
+    _gas_from_embeddings,
     _compute_las_metrics,
     _compute_nas_metrics,
     _compute_vcs_metrics,
@@ -37,6 +45,13 @@ def compute_vcs_score(
     lct: int = DEFAULT_LCT,
     return_all_metrics: bool = False,
     return_internals: bool = False,
+    return_timings: bool = False,
+    return_memory: bool = False,
+    memory_sample_rss: bool = False,
+    result_cache: ResultCache | None = None,
+    similarity_top_k: int | None = None,
+    normalize: bool = False,
+    dtype: str | torch.dtype | None = None,
 ) -> Dict[str, Any]:
     """Compute Video Comprehension Score (VCS) between reference and generated text.
     
@@ -109,6 +124,45 @@ def compute_vcs_score(
     return_internals : bool, default=False
         If True, includes detailed internal calculations and intermediate results.
         Required for generating visualizations and detailed analysis reports.
+    return_timings : bool, default=False
+        If True, includes wall-clock and CPU time for every pipeline stage and
+        the sizes of the matrices involved. Useful for finding out whether a slow
+        pair is dominated by the segmenter, the embedder, matching or NAS. When
+        False, no timers are started.
+    return_memory : bool, default=False
+        If True, profiles memory per pipeline stage with ``tracemalloc``: the peak
+        allocation reached during the stage and the allocation it leaves behind.
+        Tracing slows scoring down noticeably, so enable it for diagnosis only.
+        ``tracemalloc`` sees Python and NumPy allocations but not PyTorch tensor
+        storage; use ``memory_sample_rss`` to cover that.
+    memory_sample_rss : bool, default=False
+        With ``return_memory=True``, also samples the process resident set size
+        from a background thread and reports it per stage. Needs Linux
+        ``/proc`` or ``psutil``; silently skipped otherwise.
+    result_cache : ResultCache, optional
+        Persistent cache of results keyed by the texts, the configuration and
+        a fingerprint of the segmenter and embedders. A hit skips segmentation,
+        embedding and matching entirely. Consulted only when no internals,
+        timings or memory profile are requested; a miss is scored with all
+        metrics and stored, so a later call with either ``return_all_metrics``
+        setting hits.
+    similarity_top_k : int, optional
+        With ``return_internals=True``, store only the ``k`` highest
+        similarities of each reference and each generated chunk (found by
+        partial sorting) instead of the full ``ref_len x gen_len`` matrix.
+        Stored internals then grow linearly rather than quadratically with
+        text length; ``visualize_similarity_matrix`` draws the cells it has
+        and leaves the rest blank.
+    normalize : bool, default=False
+        L2-normalize every embedding batch (the two documents for GAS, each
+        text's chunks for LAS) once before use, so both scores are cosine
+        similarities whatever the embedder returns. By default LAS takes dot
+        products, assuming the LAS embedder already returns unit vectors,
+        while GAS always takes the cosine.
+    dtype : {None, 'float32', 'float16'}, default=None
+        Precision of the embeddings and of the similarity matrix built from
+        them, for GAS and LAS alike. ``None`` keeps the embedder's dtype.
+        ``'float16'`` halves the matrix's memory at some precision cost.
     
     Returns
     -------
@@ -144,12 +198,54 @@ def compute_vcs_score(
             Detailed calculation data for visualization and analysis, containing:
             
             - ``'texts'``: Original and processed text data
-            - ``'similarity'``: Similarity matrix and related data  
+            - ``'similarity'``: ``'matrix'``, the full similarity matrix, or
+              with ``similarity_top_k`` a ``'top_k'`` sketch: ``{'k', 'shape',
+              'reference': {'indices', 'values'}, 'generated': {'indices',
+              'values'}}``, where row ``i`` of ``'reference'`` holds the best
+              generated chunks for reference chunk ``i`` (highest first) and
+              vice versa
             - ``'mapping_windows'``: Alignment window information
             - ``'alignment'``: Detailed alignment results
             - ``'metrics'``: Breakdown of all metric calculations
             - ``'config'``: Configuration parameters used
-            - ``'best_match'``: Detailed matching information
+            - ``'best_match'``: Detailed matching information. Per direction
+              (``'precision'``, ``'recall'``) a mapping with ``'direction'``
+              and ``'segments'``, whose per-segment dicts are built on
+              access; the underlying flat arrays (candidate ``offsets``,
+              ``candidate_index``, ``candidate_similarity``,
+              ``candidate_in_window``, ``candidate_distance``, ...) are
+              attributes of the mapping
+        
+        **With return_timings=True:**
+        
+        * ``'timings'`` : dict
+            Per-stage timing breakdown, containing:
+            
+            - ``'stages'``: List of ``{'stage', 'wall', 'cpu'}`` records in
+              execution order (seconds; ``cpu`` is process CPU time, so it can
+              exceed ``wall`` for multi-threaded embedders). Stages are
+              ``'embedding_gas'``, ``'segmentation'``, ``'embedding_las'``
+              (one call for the distinct chunks of both texts),
+              ``'similarity'``, ``'mapping_windows'``, ``'precision_matching'``,
+              ``'recall_matching'``, ``'las'``, ``'distance_nas'``,
+              ``'line_nas'``, ``'regularizer'`` and, with
+              ``return_internals=True``, ``'internals'``. Records also carry
+              the stage's input ``'sizes'`` (e.g. ``{'items': n}`` for embedding
+              calls).
+            - ``'sizes'``: Chunk counts and similarity matrix shape, dtype and bytes
+            - ``'total'``: Wall and CPU time of the whole call
+        
+        **With return_memory=True:**
+        
+        * ``'memory'`` : dict
+            Per-stage memory profile, containing:
+            
+            - ``'stages'``: List of ``{'stage', 'peak_bytes', 'retained_bytes'}``
+              records in execution order (stage names as for timings). Peaks are
+              relative to the allocation at stage entry. With
+              ``memory_sample_rss=True`` records also have ``'rss_start_bytes'``,
+              ``'rss_end_bytes'`` and ``'rss_peak_bytes'``.
+            - ``'total'``: The same figures for the whole call
     
     Raises
     ------
@@ -239,6 +335,8 @@ def compute_vcs_score(
     visualize_similarity_matrix : Visualize the similarity matrix between segments
     visualize_mapping_windows : Show alignment windows used for matching
     create_vcs_pdf_report : Generate comprehensive PDF analysis report
+    stage_hooks : Observe every pipeline stage (e.g. as tracing spans)
+    compute_vcs_from_similarity : Score a precomputed similarity matrix
     
     Notes
     -----
@@ -274,40 +372,545 @@ def compute_vcs_score(
         raise ValueError("Provide at least one embedding function (LAS or GAS).")
 
     _validate_seg_embed_functions(segmenter_fn, embedding_fn_las, embedding_fn_gas)
+    dtype = _resolve_embedding_dtype(dtype)
     
-    gas_val = _compute_gas_metrics(reference_text, generated_text, embedding_fn_gas)
+    config = {
+        "chunk_size": chunk_size,
+        "context_cutoff_value": context_cutoff_value,
+        "context_window_control": context_window_control,
+        "lct": lct,
+    }
+    # Only recorded when set, so result cache keys of default runs are unchanged.
+    if normalize:
+        config["normalize"] = True
+    if dtype is not None:
+        config["dtype"] = str(dtype).replace("torch.", "")
+    cache_entry = cached = None
+    if result_cache is not None and not (return_internals or return_timings or return_memory):
+        fingerprint = result_cache.pipeline_fingerprint(segmenter_fn, embedding_fn_las, embedding_fn_gas)
+        cache_entry = (*result_cache.key(reference_text, generated_text, config, fingerprint), fingerprint)
+    
+    hooks = _active_hooks()
+    memory = _MemoryTracker(sample_rss=memory_sample_rss) if return_memory else None
+    if return_timings or hooks or memory is not None:
+        instrument = _Instrument(return_timings, hooks, config, memory)
+    else:
+        instrument = _NULL_INSTRUMENT
+    
+    if memory is not None:
+        memory.start()
+    try:
+        with instrument.stage(
+            "compute_vcs_score",
+            reference_chars=len(reference_text), generated_chars=len(generated_text)
+        ):
+            # Looked up inside the stage so hooks (and the pair counters of
+            # enable_metrics) see cached results too.
+            if cache_entry is not None:
+                cached = result_cache.get(cache_entry[0])
+            if cached is not None:
+                output = cached
+            else:
+                output = _compute_vcs_score(
+                    reference_text, generated_text, segmenter_fn,
+                    embedding_fn_las, embedding_fn_gas,
+                    chunk_size, context_cutoff_value, context_window_control, lct,
+                    return_all_metrics or cache_entry is not None, return_internals, instrument,
+                    similarity_top_k=similarity_top_k, normalize=normalize, dtype=dtype,
+                )
+    finally:
+        if memory is not None:
+            memory.stop()
+    
+    if cache_entry is not None:
+        if cached is None:
+            result_cache.put(*cache_entry, output)
+        if not return_all_metrics:
+            output = {"VCS": output["VCS"]}
+    
+    if return_timings:
+        output["timings"] = instrument.timings()
+    if memory is not None:
+        output["memory"] = memory.report()
+    
+    return output
 
-    ref_chunks, gen_chunks = _segment_and_chunk_texts(
-        reference_text, generated_text, chunk_size, segmenter_fn
+
+def compute_vcs_score_from_embeddings(
+    ref_chunk_emb: Any,
+    gen_chunk_emb: Any,
+    ref_doc_emb: Any,
+    gen_doc_emb: Any,
+    context_cutoff_value: float = DEFAULT_CONTEXT_CUTOFF_VALUE,
+    context_window_control: float = DEFAULT_CONTEXT_WINDOW_CONTROL,
+    lct: int = DEFAULT_LCT,
+    return_all_metrics: bool = False,
+    return_internals: bool = False,
+    return_timings: bool = False,
+    reference_chunks: Optional[List[str]] = None,
+    generated_chunks: Optional[List[str]] = None,
+    similarity_top_k: int | None = None,
+    normalize: bool = False,
+    dtype: str | torch.dtype | None = None,
+) -> Dict[str, Any]:
+    """Compute VCS from precomputed chunk and document embeddings.
+    
+    Skips segmentation and embedding: the chunk embeddings are the LAS inputs
+    (one row per chunk, in text order, L2-normalized like the output of a
+    LAS embedding function, or pass ``normalize=True``) and the document
+    embeddings the GAS inputs.
+    numpy arrays, torch tensors and DLPack-capable arrays (CuPy, JAX, ...)
+    are used in place, without copies; GPU inputs are multiplied on their
+    device.
+    
+    Parameters
+    ----------
+    ref_chunk_emb, gen_chunk_emb : array-like
+        Embeddings of the reference and generated chunks, shape
+        ``(n_chunks, dim)``.
+    ref_doc_emb, gen_doc_emb : array-like
+        Embeddings of the full reference and generated texts, shape ``(dim,)``
+        or ``(1, dim)``.
+    context_cutoff_value, context_window_control, lct
+        As for :func:`compute_vcs_score`.
+    return_all_metrics, return_internals, return_timings : bool, default=False
+        As for :func:`compute_vcs_score`. Timings have a ``'gas'`` stage in
+        place of the segmentation and embedding stages.
+    reference_chunks, generated_chunks : list of str, optional
+        Chunk texts, only used in the internals (text and alignment
+        visualizations). Default to placeholders like ``'[reference 1]'``.
+    similarity_top_k, normalize, dtype
+        As for :func:`compute_vcs_score`. Inputs are never modified:
+        normalization and dtype conversion write to new tensors.
+    
+    Returns
+    -------
+    dict
+        Same keys as :func:`compute_vcs_score`. ``internals['config']``
+        reports a chunk size of 1, each embedding row being one chunk.
+    
+    Raises
+    ------
+    ValueError
+        If the embeddings do not have the shapes above, their widths differ,
+        or the chunk texts do not match the number of rows.
+    
+    Examples
+    --------
+    >>> store = np.load('caption-embeddings.npz')
+    >>> result = compute_vcs_score_from_embeddings(
+    ...     store['ref_chunks'], store['gen_chunks'],
+    ...     store['ref_doc'], store['gen_doc'],
+    ...     return_all_metrics=True)
+    """
+    ref_tensor = _as_embedding_tensor(ref_chunk_emb)
+    gen_tensor = _as_embedding_tensor(gen_chunk_emb)
+    ref_doc = _as_embedding_tensor(ref_doc_emb).reshape(-1)
+    gen_doc = _as_embedding_tensor(gen_doc_emb).reshape(-1)
+    if ref_tensor.ndim != 2 or gen_tensor.ndim != 2:
+        raise ValueError(
+            "Chunk embeddings must have shape (n_chunks, dim), got "
+            f"{tuple(ref_tensor.shape)} and {tuple(gen_tensor.shape)}."
+        )
+    if ref_tensor.shape[1] != gen_tensor.shape[1] or ref_doc.shape != gen_doc.shape:
+        raise ValueError("Reference and generated embeddings must have the same width.")
+    ref_len, gen_len = ref_tensor.shape[0], gen_tensor.shape[0]
+    reference_chunks, generated_chunks = _precomputed_chunks(
+        reference_chunks, generated_chunks, ref_len, gen_len, similarity_top_k
     )
+    dtype = _resolve_embedding_dtype(dtype)
+    if dtype is None and ref_tensor.dtype != gen_tensor.dtype:
+        common = torch.promote_types(ref_tensor.dtype, gen_tensor.dtype)
+        ref_tensor, gen_tensor = ref_tensor.to(common), gen_tensor.to(common)
+    if dtype is None and ref_doc.dtype != gen_doc.dtype:
+        common = torch.promote_types(ref_doc.dtype, gen_doc.dtype)
+        ref_doc, gen_doc = ref_doc.to(common), gen_doc.to(common)
+    
+    config = {
+        "chunk_size": DEFAULT_CHUNK_SIZE,
+        "context_cutoff_value": context_cutoff_value,
+        "context_window_control": context_window_control,
+        "lct": lct,
+    }
+    hooks = _active_hooks()
+    if return_timings or hooks:
+        instrument = _Instrument(return_timings, hooks, config)
+    else:
+        instrument = _NULL_INSTRUMENT
+    
+    with instrument.stage("compute_vcs_score", reference_chunks=ref_len, generated_chunks=gen_len):
+        with instrument.stage("gas", items=2):
+            gas_val = _gas_from_embeddings(
+                _prepare_embeddings(ref_doc, normalize, dtype),
+                _prepare_embeddings(gen_doc, normalize, dtype),
+                normalized=normalize,
+            )
+        with instrument.stage("similarity", reference_chunks=ref_len, generated_chunks=gen_len):
+            sim_matrix = _similarity_from_embeddings(ref_tensor, gen_tensor, normalize, dtype)
+        output = _compute_vcs_from_similarity(
+            sim_matrix, gas_val, reference_chunks, generated_chunks,
+            DEFAULT_CHUNK_SIZE, context_cutoff_value, context_window_control, lct,
+            return_all_metrics, return_internals, instrument, similarity_top_k,
+        )
+    
+    if return_timings:
+        output["timings"] = instrument.timings()
+    return output
 
-    sim_matrix, ref_len, gen_len = _build_similarity_matrix(
-        ref_chunks, gen_chunks, embedding_fn_las
+
+def compute_vcs_from_similarity(
+    sim_matrix: Any,
+    gas: float,
+    context_cutoff_value: float = DEFAULT_CONTEXT_CUTOFF_VALUE,
+    context_window_control: float = DEFAULT_CONTEXT_WINDOW_CONTROL,
+    lct: int = DEFAULT_LCT,
+    return_all_metrics: bool = False,
+    return_internals: bool = False,
+    return_timings: bool = False,
+    reference_chunks: Optional[List[str]] = None,
+    generated_chunks: Optional[List[str]] = None,
+    similarity_top_k: int | None = None,
+) -> Dict[str, Any]:
+    """Compute VCS from a chunk similarity matrix and a GAS value.
+    
+    Runs the part of :func:`compute_vcs_score` that follows the similarity
+    matrix (mapping windows, context-aware best match, LAS, NAS-D, NAS-L and
+    the window regularizer) on a matrix computed in any way, e.g. by a
+    cross-encoder or a custom kernel. :func:`compute_vcs_score` and
+    :func:`compute_vcs_score_from_embeddings` run the same code.
+    
+    The matrix is read in place: float32 (or float64) arrays, read-only
+    memory maps (``np.load(..., mmap_mode='r')``, ``np.memmap``) and CPU
+    tensors are not copied or converted. Only ``return_internals=True`` without
+    ``similarity_top_k`` materializes it, as a nested list.
+    
+    Parameters
+    ----------
+    sim_matrix : array-like
+        Similarities of shape ``(n_reference_chunks, n_generated_chunks)``,
+        higher meaning more similar, on the scale of cosine similarity
+        (the context window and match thresholds assume values up to 1).
+    gas : float
+        Global Alignment Score, e.g. the cosine similarity of the two
+        documents' embeddings.
+    context_cutoff_value, context_window_control, lct
+        As for :func:`compute_vcs_score`.
+    return_all_metrics, return_internals, return_timings : bool, default=False
+        As for :func:`compute_vcs_score`. Timings only cover the stages from
+        ``'mapping_windows'`` on.
+    reference_chunks, generated_chunks : list of str, optional
+        Chunk texts for the internals. Default to placeholders like
+        ``'[reference 1]'``.
+    similarity_top_k : int, optional
+        As for :func:`compute_vcs_score`.
+    
+    Returns
+    -------
+    dict
+        Same keys as :func:`compute_vcs_score`.
+    
+    Raises
+    ------
+    ValueError
+        If ``sim_matrix`` is not a 2-D floating-point matrix or the chunk texts do
+        not match its shape.
+    
+    Examples
+    --------
+    >>> sim = np.load('cross-encoder-scores.npy', mmap_mode='r')
+    >>> result = compute_vcs_from_similarity(sim, gas=0.87, return_all_metrics=True)
+    """
+    sim_matrix = np.asarray(sim_matrix)
+    if sim_matrix.ndim != 2 or sim_matrix.dtype.kind != "f":
+        raise ValueError(
+            f"sim_matrix must be a 2-D floating-point matrix, got shape {sim_matrix.shape} "
+            f"and dtype {sim_matrix.dtype}."
+        )
+    ref_len, gen_len = sim_matrix.shape
+    reference_chunks, generated_chunks = _precomputed_chunks(
+        reference_chunks, generated_chunks, ref_len, gen_len, similarity_top_k
     )
+    
+    config = {
+        "chunk_size": DEFAULT_CHUNK_SIZE,
+        "context_cutoff_value": context_cutoff_value,
+        "context_window_control": context_window_control,
+        "lct": lct,
+    }
+    hooks = _active_hooks()
+    if return_timings or hooks:
+        instrument = _Instrument(return_timings, hooks, config)
+    else:
+        instrument = _NULL_INSTRUMENT
+    
+    with instrument.stage("compute_vcs_score", reference_chunks=ref_len, generated_chunks=gen_len):
+        output = _compute_vcs_from_similarity(
+            sim_matrix, float(gas), reference_chunks, generated_chunks,
+            DEFAULT_CHUNK_SIZE, context_cutoff_value, context_window_control, lct,
+            return_all_metrics, return_internals, instrument, similarity_top_k,
+        )
+    
+    if return_timings:
+        output["timings"] = instrument.timings()
+    return output
+
 
-    prec_map_windows, rec_map_windows = _get_mapping_windows(ref_len, gen_len)
+class Scorer:
+    """Score many pairs with one pipeline, reusing scratch buffers between calls.
+    
+    Equivalent to calling :func:`compute_vcs_score` with the same functions
+    and configuration for every pair, but the similarity matrix, the matching
+    blocks and the NAS work arrays are written into buffers the scorer keeps
+    and grows to the largest pair seen, instead of being allocated per pair.
+    A worker scoring a steady stream of similarly sized pairs then stops
+    allocating (and page-faulting) ``O(n * m)`` memory per request. Results
+    are identical to :func:`compute_vcs_score` and never share memory with
+    the buffers.
+    
+    A scorer is not thread-safe: use one per thread or worker. Scoring from a
+    second thread while a call is running raises ``RuntimeError``.
+    
+    Parameters
+    ----------
+    segmenter_fn, embedding_fn_las, embedding_fn_gas
+        As for :func:`compute_vcs_score`.
+    chunk_size, context_cutoff_value, context_window_control, lct
+        As for :func:`compute_vcs_score`.
+    normalize, dtype
+        As for :func:`compute_vcs_score`.
+    max_workspace_bytes : int, optional
+        Buffers larger than this are allocated per call and not kept, so one
+        outsized pair does not pin its memory for the lifetime of the scorer.
+        Unlimited by default.
+    
+    See Also
+    --------
+    compute_vcs_score : Score a single pair
+    
+    Examples
+    --------
+    >>> scorer = Scorer(segmenter, embedder, lct=1)
+    >>> for ref, gen in pairs:
+    ...     print(scorer.score(ref, gen)['VCS'])
+    """
+    
+    def __init__(
+        self,
+        segmenter_fn: Callable[[str], List[str]],
+        embedding_fn_las: Callable[[List[str]], torch.Tensor],
+        embedding_fn_gas: Callable[[List[str]], torch.Tensor] | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        context_cutoff_value: float = DEFAULT_CONTEXT_CUTOFF_VALUE,
+        context_window_control: float = DEFAULT_CONTEXT_WINDOW_CONTROL,
+        lct: int = DEFAULT_LCT,
+        normalize: bool = False,
+        dtype: str | torch.dtype | None = None,
+        max_workspace_bytes: int | None = None,
+    ):
+        if embedding_fn_las is None and embedding_fn_gas is not None:
+            embedding_fn_las = embedding_fn_gas
+        elif embedding_fn_gas is None and embedding_fn_las is not None:
+            embedding_fn_gas = embedding_fn_las
+        if embedding_fn_las is None or embedding_fn_gas is None:
+            raise ValueError("Provide at least one embedding function (LAS or GAS).")
+        _validate_seg_embed_functions(segmenter_fn, embedding_fn_las, embedding_fn_gas)
+        
+        self.segmenter_fn = segmenter_fn
+        self.embedding_fn_las = embedding_fn_las
+        self.embedding_fn_gas = embedding_fn_gas
+        self.normalize = normalize
+        self.dtype = _resolve_embedding_dtype(dtype)
+        self.config: Dict[str, Any] = {
+            "chunk_size": chunk_size,
+            "context_cutoff_value": context_cutoff_value,
+            "context_window_control": context_window_control,
+            "lct": lct,
+        }
+        if normalize:
+            self.config["normalize"] = True
+        if self.dtype is not None:
+            self.config["dtype"] = str(self.dtype).replace("torch.", "")
+        self._workspace = _Workspace(max_workspace_bytes)
+        self._busy = threading.Lock()
+    
+    def score(
+        self,
+        reference_text: str,
+        generated_text: str,
+        return_all_metrics: bool = False,
+        return_internals: bool = False,
+        return_timings: bool = False,
+        similarity_top_k: int | None = None,
+    ) -> Dict[str, Any]:
+        """Score one pair; options as for :func:`compute_vcs_score`."""
+        if not self._busy.acquire(blocking=False):
+            raise RuntimeError("Scorer is already scoring in another thread; use one Scorer per thread.")
+        try:
+            hooks = _active_hooks()
+            if return_timings or hooks:
+                instrument = _Instrument(return_timings, hooks, self.config)
+            else:
+                instrument = _NULL_INSTRUMENT
+            with instrument.stage(
+                "compute_vcs_score",
+                reference_chars=len(reference_text), generated_chars=len(generated_text)
+            ):
+                output = _compute_vcs_score(
+                    reference_text, generated_text, self.segmenter_fn,
+                    self.embedding_fn_las, self.embedding_fn_gas,
+                    self.config["chunk_size"], self.config["context_cutoff_value"],
+                    self.config["context_window_control"], self.config["lct"],
+                    return_all_metrics, return_internals, instrument,
+                    similarity_top_k=similarity_top_k, normalize=self.normalize, dtype=self.dtype,
+                    workspace=self._workspace,
+                )
+        finally:
+            self._busy.release()
+        
+        if return_timings:
+            output["timings"] = instrument.timings()
+        return output
+    
+    @property
+    def workspace_bytes(self) -> int:
+        """Bytes currently held in reusable buffers."""
+        return self._workspace.nbytes
+    
+    def release_workspace(self) -> None:
+        """Free the reusable buffers; they are reallocated on the next call."""
+        with self._busy:
+            self._workspace.clear()
 
-    precision_matches, precision_indices, precision_sim_values, precision_match_details = (
-        _calculate_row_col_matches_context(
-            sim_matrix, prec_map_windows, "precision",
-            context_cutoff_value, context_window_control
+
+def _precomputed_chunks(
+    reference_chunks: Optional[List[str]],
+    generated_chunks: Optional[List[str]],
+    ref_len: int,
+    gen_len: int,
+    similarity_top_k: int | None,
+) -> Tuple[List[str], List[str]]:
+    if reference_chunks is None:
+        reference_chunks = [f"[reference {i + 1}]" for i in range(ref_len)]
+    if generated_chunks is None:
+        generated_chunks = [f"[generated {i + 1}]" for i in range(gen_len)]
+    if len(reference_chunks) != ref_len or len(generated_chunks) != gen_len:
+        raise ValueError(
+            f"reference_chunks and generated_chunks must have {ref_len} and {gen_len} "
+            f"entries, got {len(reference_chunks)} and {len(generated_chunks)}."
         )
+    return reference_chunks, generated_chunks
+
+
+def _validate_similarity_top_k(similarity_top_k: int | None) -> None:
+    if similarity_top_k is not None and similarity_top_k < 1:
+        raise ValueError(f"similarity_top_k must be at least 1, got {similarity_top_k}.")
+
+
+def _compute_vcs_score(
+    reference_text: str,
+    generated_text: str,
+    segmenter_fn: Callable[[str], List[str]],
+    embedding_fn_las: Callable[[List[str]], torch.Tensor],
+    embedding_fn_gas: Callable[[List[str]], torch.Tensor],
+    chunk_size: int,
+    context_cutoff_value: float,
+    context_window_control: float,
+    lct: int,
+    return_all_metrics: bool,
+    return_internals: bool,
+    instrument=_NULL_INSTRUMENT,
+    similarity_top_k: int | None = None,
+    normalize: bool = False,
+    dtype: torch.dtype | None = None,
+    workspace: _Workspace | None = None,
+) -> Dict[str, Any]:
+    gas_val = _compute_gas_metrics(
+        reference_text, generated_text,
+        instrument.wrap_embedding("embedding_gas", embedding_fn_gas),
+        normalize, dtype
     )
-    recall_matches, recall_indices, recall_sim_values, recall_match_details = (
-        _calculate_row_col_matches_context(
-            sim_matrix, rec_map_windows, "recall",
-            context_cutoff_value, context_window_control
+
+    with instrument.stage(
+        "segmentation",
+        reference_chars=len(reference_text), generated_chars=len(generated_text)
+    ):
+        ref_chunks, gen_chunks = _segment_and_chunk_texts(
+            reference_text, generated_text, chunk_size, segmenter_fn
         )
+
+    ref_len, gen_len = len(ref_chunks), len(gen_chunks)
+    # One call for both texts, each distinct chunk once; the stage reports
+    # the number of texts actually embedded.
+    embeddings = _embed_unique(
+        instrument.wrap_embedding("embedding_las", embedding_fn_las), ref_chunks + gen_chunks
+    )
+    ref_tensor, gen_tensor = embeddings[:ref_len], embeddings[ref_len:]
+    with instrument.stage("similarity", reference_chunks=ref_len, generated_chunks=gen_len):
+        sim_matrix = _similarity_from_embeddings(ref_tensor, gen_tensor, normalize, dtype, workspace)
+
+    return _compute_vcs_from_similarity(
+        sim_matrix, gas_val, ref_chunks, gen_chunks,
+        chunk_size, context_cutoff_value, context_window_control, lct,
+        return_all_metrics, return_internals, instrument, similarity_top_k, workspace,
+    )
+
+
+def _compute_vcs_from_similarity(
+    sim_matrix: np.ndarray,
+    gas_val: float,
+    ref_chunks: List[str],
+    gen_chunks: List[str],
+    chunk_size: int,
+    context_cutoff_value: float,
+    context_window_control: float,
+    lct: int,
+    return_all_metrics: bool,
+    return_internals: bool,
+    instrument=_NULL_INSTRUMENT,
+    similarity_top_k: int | None = None,
+    workspace: _Workspace | None = None,
+) -> Dict[str, Any]:
+    # With a workspace, sim_matrix and the matching and NAS scratch arrays are
+    # reused buffers: everything in the output must be a copy.
+    _validate_similarity_top_k(similarity_top_k)
+    ref_len, gen_len = len(ref_chunks), len(gen_chunks)
+    instrument.note_sizes(
+        reference_chunks=ref_len,
+        generated_chunks=gen_len,
+        similarity_matrix_shape=list(sim_matrix.shape),
+        similarity_matrix_dtype=str(sim_matrix.dtype),
+        similarity_matrix_bytes=int(sim_matrix.nbytes),
     )
 
-    las_metrics = _compute_las_metrics(precision_sim_values, recall_sim_values)
+    with instrument.stage("mapping_windows", reference_chunks=ref_len, generated_chunks=gen_len):
+        prec_map_windows, rec_map_windows = _get_mapping_windows(ref_len, gen_len)
+
+    with instrument.stage("precision_matching", reference_chunks=ref_len, generated_chunks=gen_len):
+        precision_matches, precision_indices, precision_sim_values, precision_match_details = (
+            _calculate_row_col_matches_context(
+                sim_matrix, prec_map_windows, "precision",
+                context_cutoff_value, context_window_control, workspace
+            )
+        )
+    with instrument.stage("recall_matching", reference_chunks=ref_len, generated_chunks=gen_len):
+        recall_matches, recall_indices, recall_sim_values, recall_match_details = (
+            _calculate_row_col_matches_context(
+                sim_matrix, rec_map_windows, "recall",
+                context_cutoff_value, context_window_control, workspace
+            )
+        )
+
+    with instrument.stage("las", reference_chunks=ref_len, generated_chunks=gen_len):
+        las_metrics = _compute_las_metrics(precision_sim_values, recall_sim_values)
     nas_metrics, nas_internals = _compute_nas_metrics(
         sim_matrix, ref_len, gen_len,
         precision_matches, precision_indices, precision_sim_values,
         recall_matches, recall_indices, recall_sim_values,
         prec_map_windows, rec_map_windows,
         ref_chunks, gen_chunks,
-        lct=lct
+        lct=lct,
+        instrument=instrument,
+        workspace=workspace
     )
     combined = _compute_vcs_metrics(
         gas_val, nas_metrics["NAS"], las_metrics["LAS"]
@@ -321,115 +924,118 @@ def compute_vcs_score(
         }
     
     if return_internals:
-        internals = {
-            "texts": {
-                "reference_chunks": ref_chunks,
-                "generated_chunks": gen_chunks,
-                "reference_length": ref_len,
-                "generated_length": gen_len,
-            },
-            "similarity": {
-                "matrix": sim_matrix.tolist() if isinstance(sim_matrix, np.ndarray) else sim_matrix,
-            },
-            "mapping_windows": {
-                "precision": prec_map_windows,
-                "recall": rec_map_windows,
-            },
-            "alignment": {
-                "precision": {
-                    "matches": precision_matches,
-                    "indices": precision_indices.tolist() if isinstance(precision_indices, np.ndarray) else precision_indices,
-                    "similarity_values": precision_sim_values.tolist() if isinstance(precision_sim_values, np.ndarray) else precision_sim_values,
-                    "aligned_segments": nas_internals["aligned_precision"] if "aligned_precision" in nas_internals else [],
+        with instrument.stage("internals", reference_chunks=ref_len, generated_chunks=gen_len):
+            internals = {
+                "texts": {
+                    "reference_chunks": ref_chunks,
+                    "generated_chunks": gen_chunks,
+                    "reference_length": ref_len,
+                    "generated_length": gen_len,
                 },
-                "recall": {
-                    "matches": recall_matches,
-                    "indices": recall_indices.tolist() if isinstance(recall_indices, np.ndarray) else recall_indices,
-                    "similarity_values": recall_sim_values.tolist() if isinstance(recall_sim_values, np.ndarray) else recall_sim_values,
-                    "aligned_segments": nas_internals["aligned_recall"] if "aligned_recall" in nas_internals else [],
-                }
-            },
-            "metrics": {
-                "gas": {
-                    "value": gas_val,
+                "similarity": (
+                    {"matrix": sim_matrix.tolist() if isinstance(sim_matrix, np.ndarray) else sim_matrix}
+                    if similarity_top_k is None else
+                    {"top_k": _similarity_top_k(sim_matrix, similarity_top_k)}
+                ),
+                "mapping_windows": {
+                    "precision": prec_map_windows,
+                    "recall": rec_map_windows,
                 },
-                "las": {
-                    "precision": las_metrics["Precision LAS"],
-                    "recall": las_metrics["Recall LAS"],
-                    "f1": las_metrics["LAS"],
+                "alignment": {
+                    "precision": {
+                        "matches": precision_matches,
+                        "indices": precision_indices.tolist() if isinstance(precision_indices, np.ndarray) else precision_indices,
+                        "similarity_values": precision_sim_values.tolist() if isinstance(precision_sim_values, np.ndarray) else precision_sim_values,
+                        "aligned_segments": nas_internals["aligned_precision"] if "aligned_precision" in nas_internals else [],
+                    },
+                    "recall": {
+                        "matches": recall_matches,
+                        "indices": recall_indices.tolist() if isinstance(recall_indices, np.ndarray) else recall_indices,
+                        "similarity_values": recall_sim_values.tolist() if isinstance(recall_sim_values, np.ndarray) else recall_sim_values,
+                        "aligned_segments": nas_internals["aligned_recall"] if "aligned_recall" in nas_internals else [],
+                    }
                 },
-                "nas": {
-                    "nas_d": {
-                        "precision": {
-                            "value": nas_metrics["Precision NAS-D"],
-                            "mapping_window_height": nas_internals["precision_nas_internals"]["mapping_window_height"],
-                            "max_penalty": nas_internals["precision_nas_internals"]["max_penalty"],
-                            "total_penalty": nas_internals["precision_nas_internals"]["total_penalty"],
-                            "penalties": nas_internals["precision_nas_internals"]["penalties"],
-                            "in_window": nas_internals["precision_nas_internals"]["in_window"],
-                            "in_lct_zone": nas_internals["precision_nas_internals"]["in_lct_zone"],
-                        },
-                        "recall": {
-                            "value": nas_metrics["Recall NAS-D"],
-                            "mapping_window_height": nas_internals["recall_nas_internals"]["mapping_window_height"],
-                            "max_penalty": nas_internals["recall_nas_internals"]["max_penalty"],
-                            "total_penalty": nas_internals["recall_nas_internals"]["total_penalty"],
-                            "penalties": nas_internals["recall_nas_internals"]["penalties"],
-                            "in_window": nas_internals["recall_nas_internals"]["in_window"],
-                            "in_lct_zone": nas_internals["recall_nas_internals"]["in_lct_zone"],
-                        },
-                        "f1": nas_metrics["NAS-D"],
+                "metrics": {
+                    "gas": {
+                        "value": gas_val,
+                    },
+                    "las": {
+                        "precision": las_metrics["Precision LAS"],
+                        "recall": las_metrics["Recall LAS"],
+                        "f1": las_metrics["LAS"],
                     },
-                    "nas_l": {
-                        "precision": {
-                            "value": nas_metrics["Precision NAS-L"],
-                            "actual_line_length": nas_internals["precision_line_internals"]["actual_line_length"],
-                            "floor_ideal_line_length": nas_internals["precision_line_internals"]["floor_ideal_line_length"],
-                            "ceil_ideal_line_length": nas_internals["precision_line_internals"]["ceil_ideal_line_length"],
-                            "average_ideal_line_length": nas_internals["precision_line_internals"]["average_ideal_line_length"],
-                            "segments": nas_internals["precision_line_internals"]["segments"],
-                            "floor_path": nas_internals["precision_line_internals"]["floor_path"],
-                            "ceil_path": nas_internals["precision_line_internals"]["ceil_path"],
-                            "actual_path": nas_internals["precision_line_internals"]["actual_path"]
+                    "nas": {
+                        "nas_d": {
+                            "precision": {
+                                "value": nas_metrics["Precision NAS-D"],
+                                "mapping_window_height": nas_internals["precision_nas_internals"]["mapping_window_height"],
+                                "max_penalty": nas_internals["precision_nas_internals"]["max_penalty"],
+                                "total_penalty": nas_internals["precision_nas_internals"]["total_penalty"],
+                                "penalties": nas_internals["precision_nas_internals"]["penalties"],
+                                "in_window": nas_internals["precision_nas_internals"]["in_window"],
+                                "in_lct_zone": nas_internals["precision_nas_internals"]["in_lct_zone"],
+                            },
+                            "recall": {
+                                "value": nas_metrics["Recall NAS-D"],
+                                "mapping_window_height": nas_internals["recall_nas_internals"]["mapping_window_height"],
+                                "max_penalty": nas_internals["recall_nas_internals"]["max_penalty"],
+                                "total_penalty": nas_internals["recall_nas_internals"]["total_penalty"],
+                                "penalties": nas_internals["recall_nas_internals"]["penalties"],
+                                "in_window": nas_internals["recall_nas_internals"]["in_window"],
+                                "in_lct_zone": nas_internals["recall_nas_internals"]["in_lct_zone"],
+                            },
+                            "f1": nas_metrics["NAS-D"],
                         },
-                        "recall": {
-                            "value": nas_metrics["Recall NAS-L"],
-                            "actual_line_length": nas_internals["recall_line_internals"]["actual_line_length"],
-                            "floor_ideal_line_length": nas_internals["recall_line_internals"]["floor_ideal_line_length"],
-                            "ceil_ideal_line_length": nas_internals["recall_line_internals"]["ceil_ideal_line_length"],
-                            "average_ideal_line_length": nas_internals["recall_line_internals"]["average_ideal_line_length"],
-                            "segments": nas_internals["recall_line_internals"]["segments"],
-                            "floor_path": nas_internals["recall_line_internals"]["floor_path"],
-                            "ceil_path": nas_internals["recall_line_internals"]["ceil_path"],
-                            "actual_path": nas_internals["recall_line_internals"]["actual_path"]
+                        "nas_l": {
+                            "precision": {
+                                "value": nas_metrics["Precision NAS-L"],
+                                "actual_line_length": nas_internals["precision_line_internals"]["actual_line_length"],
+                                "floor_ideal_line_length": nas_internals["precision_line_internals"]["floor_ideal_line_length"],
+                                "ceil_ideal_line_length": nas_internals["precision_line_internals"]["ceil_ideal_line_length"],
+                                "average_ideal_line_length": nas_internals["precision_line_internals"]["average_ideal_line_length"],
+                                "segments": nas_internals["precision_line_internals"]["segments"],
+                                "floor_path": nas_internals["precision_line_internals"]["floor_path"],
+                                "ceil_path": nas_internals["precision_line_internals"]["ceil_path"],
+                                "actual_path": nas_internals["precision_line_internals"]["actual_path"]
+                            },
+                            "recall": {
+                                "value": nas_metrics["Recall NAS-L"],
+                                "actual_line_length": nas_internals["recall_line_internals"]["actual_line_length"],
+                                "floor_ideal_line_length": nas_internals["recall_line_internals"]["floor_ideal_line_length"],
+                                "ceil_ideal_line_length": nas_internals["recall_line_internals"]["ceil_ideal_line_length"],
+                                "average_ideal_line_length": nas_internals["recall_line_internals"]["average_ideal_line_length"],
+                                "segments": nas_internals["recall_line_internals"]["segments"],
+                                "floor_path": nas_internals["recall_line_internals"]["floor_path"],
+                                "ceil_path": nas_internals["recall_line_internals"]["ceil_path"],
+                                "actual_path": nas_internals["recall_line_internals"]["actual_path"]
+                            },
+                            "f1": nas_metrics["NAS-L"],
                         },
-                        "f1": nas_metrics["NAS-L"],
+                        "regularizer": {
+                            "value": nas_metrics["Window-Regularizer"],
+                            "total_mapping_window_area": nas_internals["regularizer_internals"]["total_mapping_window_area"],
+                            "timeline_area": nas_internals["regularizer_internals"]["timeline_area"],
+                            "min_area": nas_internals["regularizer_internals"]["min_area"],
+                        },
+                        "nas_f1": nas_metrics["NAS-F1"],
+                        "regularized_nas": nas_metrics["NAS"],
                     },
-                    "regularizer": {
-                        "value": nas_metrics["Window-Regularizer"],
-                        "total_mapping_window_area": nas_internals["regularizer_internals"]["total_mapping_window_area"],
-                        "timeline_area": nas_internals["regularizer_internals"]["timeline_area"],
-                        "min_area": nas_internals["regularizer_internals"]["min_area"],
+                    "vcs": {
+                        "value": combined["VCS"],
+                        "gas_las_scaled": combined["GAS-LAS-Scaled"],
                     },
-                    "nas_f1": nas_metrics["NAS-F1"],
-                    "regularized_nas": nas_metrics["NAS"],
                 },
-                "vcs": {
-                    "value": combined["VCS"],
-                    "gas_las_scaled": combined["GAS-LAS-Scaled"],
+                "config": {
+                    "chunk_size": chunk_size,
+                    "context_cutoff_value": context_cutoff_value,
+                    "context_window_control": context_window_control,
+                    "lct": lct,
                 },
-            },
-            "config": {
-                "chunk_size": chunk_size,
-                "context_cutoff_value": context_cutoff_value,
-                "context_window_control": context_window_control,
-                "lct": lct,
-            },
-            "best_match": {
-                "precision": precision_match_details,
-                "recall": recall_match_details
+                "best_match": {
+                    "precision": precision_match_details,
+                    "recall": recall_match_details
+                }
             }
-        }
-        output["internals"] = internals
+            output["internals"] = internals
     
     return output
\ No newline at end of file
@@ -0,0 +1,82 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from vcs._bench import make_synthetic_pair, synthetic_segmenter
+from vcs._serve import create_scoring_server
+
+PAIR = make_synthetic_pair(12, 10)
+CALLS = []
+
+
+def failing_embedder(texts):
+    CALLS.append(list(texts))
+    if any("BOOM" in text for text in texts):
+        raise RuntimeError("embedder cannot handle BOOM")
+    return PAIR.embedding_fn(texts)
+
+
+@pytest.fixture
+def server():
+    CALLS.clear()
+    # A long max_wait makes concurrent requests share embedding batches.
+    server = create_scoring_server(
+        synthetic_segmenter, failing_embedder, port=0, max_wait=0.2, max_in_flight=8
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, body):
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{server.server_address[1]}/score",
+        data=body if isinstance(body, bytes) else json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_failing_request_does_not_fail_its_batch(server):
+    bodies = [
+        {"id": i, "reference": PAIR.reference_text, "generated": PAIR.generated_text}
+        for i in range(7)
+    ]
+    bodies.insert(3, {"id": "bad", "reference": "BOOM", "generated": PAIR.generated_text})
+    responses = {}
+    start = threading.Barrier(len(bodies))
+
+    def send(body):
+        start.wait()
+        responses[body["id"]] = post(server, body)
+
+    threads = [threading.Thread(target=send, args=(body,)) for body in bodies]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    status, body = responses.pop("bad")
+    assert status == 500
+    assert "BOOM" in body["error"]
+    assert {status for status, _ in responses.values()} == {200}
+    assert len({body["VCS"] for _, body in responses.values()}) == 1
+    # The bad texts did share an embedder call with good ones.
+    assert any("BOOM" in call and PAIR.reference_text in call for call in CALLS)
+
+
+@pytest.mark.parametrize("body", [b"not json", b"[1, 2]", {"reference": "only one side"},
+                                  {"reference": 1, "generated": 2}])
+def test_malformed_requests_are_client_errors(server, body):
+    status, response = post(server, body)
+    assert status == 400
+    assert response["error"]